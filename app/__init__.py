@@ -1,4 +1,4 @@
-from flask import Flask, current_app, request, session, abort
+from flask import Flask, current_app, request, session, abort, flash, redirect, jsonify
 from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
 from flask_login import LoginManager, user_logged_in, user_logged_out, user_loaded_from_request, current_user
@@ -7,7 +7,21 @@ from app.main import main_bp, get_rank_suffix
 from app.auth import auth_bp
 from app.admin import admin_bp
 from app.utils import custom_url_for  # Import from utils
-from sqlalchemy.exc import ProgrammingError
+from app.derivatives import artwork_image, derivatives_cli
+from app.storage import artwork_cli
+from app.jobs import worker_command
+from app.cache_policy import init_cache_policy
+from app.assets import init_assets, assets_cli
+from app.sql_stats import init_sql_instrumentation
+from app.metrics import init_metrics
+from app.profiler import init_profiler
+from app.tallies import tallies_cli
+from app.indexes import indexes_cli
+from app.seed import seed_contest_command
+from app.database import init_database
+from app.cache import get_login_user
+from sqlalchemy.exc import OperationalError, ProgrammingError
+from werkzeug.exceptions import RequestEntityTooLarge
 
 import os
 import toml
@@ -17,16 +31,32 @@ config = toml.load("config.toml")
 
 csrf = CSRFProtect()
 
-def create_app():
+# Endpoints whose oversized uploads are answered by redirecting back to the form
+UPLOAD_FORM_ENDPOINTS = {"main.call_for_artists", "main.call_for_youth_artists"}
+
+def create_app(config_overrides=None):
     app = Flask(__name__, static_folder="static", static_url_path="/static")
     app.config["SQLALCHEMY_DATABASE_URI"] = config["flask"]["SQLALCHEMY_DATABASE_URI"]
     app.config["SECRET_KEY"] = config["flask"]["SECRET_KEY"]
     app.config["UPLOAD_FOLDER"] = config["submissions"]["UPLOAD_FOLDER"]
+    # Reject oversized request bodies before they are parsed (three 8 MB artworks plus form fields)
+    app.config["MAX_CONTENT_LENGTH"] = config["submissions"].get("MAX_CONTENT_LENGTH_MB", 26) * 1024 * 1024
     app.config["APPLICATION_ROOT"] = config["flask"]["APPLICATION_ROOT"]
+    app.config["DERIVATIVE_PROCESSES"] = config["submissions"].get("DERIVATIVE_PROCESSES", 2)
+    app.config["JOBS_EAGER"] = config.get("jobs", {}).get("EAGER", False)
+    app.config["JOBS_MAX_ATTEMPTS"] = config.get("jobs", {}).get("MAX_ATTEMPTS", 5)
     app.config['SESSION_COOKIE_SECURE'] = False
     app.config['SESSION_COOKIE_HTTPONLY'] = True
     app.config['SESSION_COOKIE_SAMESITE'] = 'Lax'
     app.config['SESSION_COOKIE_DOMAIN'] = False
+    # Touched whenever users change so every worker drops its cached users; must be shared by all workers
+    app.config["USER_REVOCATION_FILE"] = os.path.join(app.instance_path, "user-revocations")
+    # Settings that win over config.toml, e.g. a separate database for benchmarks
+    if config_overrides:
+        app.config.update(config_overrides)
+
+    # Pool sizing, pre-ping, recycling, statement timeouts and the optional read replica
+    init_database(app, config.get("database"))
 
     from app.models import db, User
     from werkzeug.security import generate_password_hash
@@ -51,15 +81,33 @@ def create_app():
 
     @login_manager.user_loader
     def load_user(user_id):
-        from app.models import User  # Local import to avoid circular dependency
-        return User.query.get(int(user_id))
+        # Served from a short per-worker cache; removed users are dropped via the revocation file
+        return get_login_user(int(user_id))
+
+    @app.errorhandler(RequestEntityTooLarge)
+    def handle_request_too_large(e):
+        # Only the submission forms send artwork; send their users back to the form with a message
+        if request.endpoint in UPLOAD_FORM_ENDPOINTS and request.method == "POST":
+            flash("Your upload is too large. Each artwork file must not exceed 8 MB.", "danger")
+            return redirect(request.path)
+        if request.is_json:
+            return jsonify({"error": "Request body too large."}), 413
+        return e
+
+    # Per-path, per-endpoint and per-blueprint Cache-Control rules
+    init_cache_policy(app, config.get("cache_control"))
 
-    @app.after_request
-    def add_cache_control_headers(response):
-        if 'no-store' not in response.headers.get('Cache-Control', ''):
-            response.headers['Cache-Control'] = 'no-store, no-cache, must-revalidate, post-check=0, pre-check=0, max-age=0'
-            response.headers['Pragma'] = 'no-cache'
-        return response
+    # Content-hashed static URLs (custom_url_for) and precompressed variants
+    init_assets(app, config.get("assets"))
+
+    # Opt-in per-request query counts, DB time and N+1 detection
+    init_sql_instrumentation(app, config.get("sql_instrumentation"))
+
+    # Prometheus request and domain metrics at /metrics
+    init_metrics(app, config.get("metrics"))
+
+    # Admin-triggered sampling profiles of single requests
+    init_profiler(app, config.get("profiler"))
 
     # Assign the custom_url_for to Jinja's global context
     app.jinja_env.globals['url_for'] = custom_url_for
@@ -68,6 +116,15 @@ def create_app():
     app.custom_url_for = custom_url_for
 
     app.jinja_env.globals['get_rank_suffix'] = get_rank_suffix
+    app.jinja_env.globals['artwork_image'] = artwork_image
+
+    app.cli.add_command(derivatives_cli)
+    app.cli.add_command(artwork_cli)
+    app.cli.add_command(worker_command)
+    app.cli.add_command(assets_cli)
+    app.cli.add_command(tallies_cli)
+    app.cli.add_command(indexes_cli)
+    app.cli.add_command(seed_contest_command)
 
     os.makedirs(app.config["UPLOAD_FOLDER"], exist_ok=True)
 
@@ -83,7 +140,7 @@ def create_app():
                 db.session.add(admin_user)
                 db.session.commit()
                 app.logger.info("Admin user created with username 'admin' and default password.")
-        except ProgrammingError as e:
+        except (ProgrammingError, OperationalError) as e:  # PostgreSQL and SQLite report missing tables differently
             app.logger.error("Database schema not initialized. Run 'flask db upgrade' to create the tables.")
 
     return app
\ No newline at end of file
@@ -1,8 +1,16 @@
-from flask import Blueprint, jsonify, render_template, flash, redirect, request, current_app,  send_file
+from flask import Blueprint, Response, jsonify, render_template, flash, redirect, request, current_app, stream_with_context, send_from_directory, abort
 from flask_login import login_required, current_user
 from app.forms import LogoutForm, SubmissionDatesForm
-from app.models import SubmissionPeriod, User, Badge, db, ArtistSubmission, BadgeArtwork, JudgeVote, YouthArtistSubmission
+from app.models import SubmissionPeriod, User, Badge, db, ArtistSubmission, BadgeArtwork, JudgeVote, JudgeBallot, ArtworkTally, YouthArtistSubmission, ArtworkBlob
 from app.utils import custom_url_for as url_for
+from app.derivatives import artwork_image
+from app.cache import get_submission_window, submission_window_cache, get_badge_catalog, invalidate_badge_catalog, invalidate_users
+from app.tallies import remove_votes_from_tallies
+from app.aggregation import RESULT_METHODS, rank_results
+from app.results import load_results, load_judges_status
+from app.exports import EXPORT_FORMATS, generate_zip, logged
+from app.profiler import CAPTURE_NAME, PROFILE_HEADER, PROFILE_QUERY_FLAG, list_captures, make_profile_token
+from app.database import read_replica
 from datetime import datetime, timezone
 from io import TextIOWrapper
 from sqlalchemy import func
@@ -11,7 +19,6 @@ from functools import wraps
 from zoneinfo import ZoneInfo
 
 import csv
-import io
 
 admin_bp = Blueprint('admin', __name__)
 
@@ -34,11 +41,11 @@ def admin_required(func):
 
 
 def is_submission_open():
-    """Returns True if the current time is within the submission period."""
+    """Returns True if the current time is within the (cached) submission period."""
     now = datetime.now(timezone.utc)
-    submission_period = SubmissionPeriod.query.order_by(SubmissionPeriod.id.desc()).first()
-    if submission_period:
-        return submission_period.submission_start <= now <= submission_period.submission_end
+    submission_window = get_submission_window()
+    if submission_window:
+        return submission_window.submission_start <= now <= submission_window.submission_end
     return False
 
 
@@ -81,6 +88,7 @@ def manage_judges():
                 new_judge.set_password(password)
                 db.session.add(new_judge)
                 db.session.commit()
+                invalidate_users()
                 flash(f"User '{name}' added successfully!", "success")
 
         elif action == "remove":
@@ -90,8 +98,12 @@ def manage_judges():
                 if judge_to_remove.is_admin:
                     flash("Cannot remove the admin.", "danger")
                 else:
+                    JudgeBallot.query.filter_by(user_id=judge_to_remove.id).delete()
+                    # The judge's votes are deleted with them; take them out of the tallies first
+                    remove_votes_from_tallies(JudgeVote.user_id == judge_to_remove.id)
                     db.session.delete(judge_to_remove)
                     db.session.commit()
+                    invalidate_users()
                     flash(f"User '{judge_to_remove.name}' removed successfully!", "success")
             else:
                 flash("User not found!", "danger")
@@ -118,6 +130,7 @@ def manage_badges():
                 new_badge = Badge(name=name, description=description)
                 db.session.add(new_badge)
                 db.session.commit()
+                invalidate_badge_catalog()
                 flash(f"Badge '{name}' added successfully!", "success")
 
         elif action == "edit":
@@ -130,6 +143,7 @@ def manage_badges():
                 badge.name = name
                 badge.description = description
                 db.session.commit()
+                invalidate_badge_catalog()
                 flash(f"Badge '{name}' updated successfully!", "success")
             else:
                 flash("Badge not found!", "danger")
@@ -141,6 +155,7 @@ def manage_badges():
             if badge:
                 db.session.delete(badge)
                 db.session.commit()
+                invalidate_badge_catalog()
                 flash(f"Badge '{badge.name}' deleted successfully!", "success")
             else:
                 flash("Badge not found!", "danger")
@@ -180,6 +195,7 @@ def manage_badges():
                     added_badges.append(name)
 
                 db.session.commit()
+                invalidate_badge_catalog()
                 if added_badges:
                     flash(f"Successfully added badges: {', '.join(added_badges)}.", "success")
                 else:
@@ -189,121 +205,28 @@ def manage_badges():
                 db.session.rollback()
                 flash(f"An error occurred while processing the CSV file: {e}", "danger")
 
-    badges = Badge.query.all()
+    badges = get_badge_catalog().badges
     return render_template("admin_badges.html", badges=badges)
 
 
 @admin_bp.route("/judges/results", methods=["GET"])
 @login_required
 @admin_required
+@read_replica
 def judges_results():
     current_app.logger.debug("Entered the judges_results route.")
+    method = request.args.get("method", "sum")
+    if method not in RESULT_METHODS:
+        method = "sum"
 
     try:
-        # Regular results query
-        current_app.logger.debug("Fetching regular results data.")
-        results = db.session.query(
-            ArtistSubmission.id.label("artist_id"),
-            ArtistSubmission.name.label("artist_name"),
-            Badge.name.label("badge_name"),
-            BadgeArtwork.id.label("badge_artwork_id"),
-            BadgeArtwork.artwork_file.label("artwork_file"),
-            func.coalesce(func.sum(JudgeVote.rank), 0).label("total_score")
-        ).join(
-            BadgeArtwork, BadgeArtwork.id == JudgeVote.badge_artwork_id, isouter=True
-        ).join(
-            ArtistSubmission, ArtistSubmission.id == BadgeArtwork.submission_id
-        ).join(
-            Badge, Badge.id == BadgeArtwork.badge_id
-        ).group_by(
-            BadgeArtwork.id, ArtistSubmission.id, ArtistSubmission.name, Badge.name, BadgeArtwork.artwork_file
-        ).order_by(
-            func.coalesce(func.sum(JudgeVote.rank), 0)
-        ).all()
-        current_app.logger.debug(f"Regular results fetched: {results}")
-
-        # Youth results query
-        current_app.logger.debug("Fetching youth results data.")
-        youth_results = db.session.query(
-            YouthArtistSubmission.id.label("youth_submission_id"),
-            YouthArtistSubmission.name.label("artist_name"),
-            YouthArtistSubmission.age.label("age"),
-            Badge.name.label("badge_name"),
-            BadgeArtwork.id.label("badge_artwork_id"),
-            BadgeArtwork.artwork_file.label("artwork_file"),
-            func.coalesce(func.sum(JudgeVote.rank), 0).label("total_score")
-        ).join(
-            BadgeArtwork, BadgeArtwork.youth_submission_id == YouthArtistSubmission.id, isouter=True
-        ).join(
-            JudgeVote, BadgeArtwork.id == JudgeVote.badge_artwork_id, isouter=True
-        ).join(
-            Badge, Badge.id == BadgeArtwork.badge_id
-        ).group_by(
-            BadgeArtwork.id, YouthArtistSubmission.id, YouthArtistSubmission.name, YouthArtistSubmission.age, Badge.name, BadgeArtwork.artwork_file
-        ).order_by(
-            func.coalesce(func.sum(JudgeVote.rank), 0)
-        ).all()
-        current_app.logger.debug(f"Youth results fetched: {youth_results}")
-
-        # Judge votes mapping
-        current_app.logger.debug("Fetching judge votes.")
-        judge_votes = db.session.query(
-            JudgeVote.badge_artwork_id,
-            User.name.label("judge_name"),
-            JudgeVote.rank
-        ).join(
-            User, User.id == JudgeVote.user_id
-        ).all()
-        current_app.logger.debug(f"Judge votes fetched: {judge_votes}")
-
-        youth_judge_votes = db.session.query(
-            JudgeVote.submission_id.label("youth_submission_id"),
-            User.name.label("judge_name"),
-            JudgeVote.rank
-        ).join(
-            User, User.id == JudgeVote.user_id
-        ).all()
-        current_app.logger.debug(f"Youth judge votes fetched: {youth_judge_votes}")
-
-        # Processing judge votes into dictionaries
-        current_app.logger.debug("Processing judge votes into dictionaries.")
-        judge_votes_by_artwork = {}
-        for vote in judge_votes:
-            artwork_id = vote.badge_artwork_id
-            if artwork_id not in judge_votes_by_artwork:
-                judge_votes_by_artwork[artwork_id] = []
-            judge_votes_by_artwork[artwork_id].append({
-                "judge_name": vote.judge_name,
-                "rank": vote.rank
-            })
-        current_app.logger.debug(f"Judge votes by artwork: {judge_votes_by_artwork}")
-
-        judge_votes_by_youth_submission = {}
-        for vote in youth_judge_votes:
-            submission_id = vote.youth_submission_id
-            if submission_id not in judge_votes_by_youth_submission:
-                judge_votes_by_youth_submission[submission_id] = []
-            judge_votes_by_youth_submission[submission_id].append({
-                "judge_name": vote.judge_name,
-                "rank": vote.rank
-            })
-        current_app.logger.debug(f"Judge votes by youth submission: {judge_votes_by_youth_submission}")
-
-        # Judges voting status
-        current_app.logger.debug("Calculating judges voting status.")
-        voted_judges = db.session.query(User.name).join(JudgeVote).distinct().all()
-        voted_judges = [judge[0] for judge in voted_judges]
-        current_app.logger.debug(f"Voted judges: {voted_judges}")
-
-        all_judges = db.session.query(User.name).all()
-        all_judge_names = [judge[0] for judge in all_judges]
-        current_app.logger.debug(f"All judges: {all_judge_names}")
-
-        judges_status = {
-            "voted": voted_judges,
-            "not_voted": [name for name in all_judge_names if name not in voted_judges],
-        }
-        current_app.logger.debug(f"Judges status calculated: {judges_status}")
+        # Scores come from the maintained ArtworkTally rows (app.tallies), not from summing votes
+        results, youth_results, judge_votes_by_artwork = load_results()
+        if method != "sum":
+            results = rank_results(results, "artist", method)
+            youth_results = rank_results(youth_results, "youth", method)
+
+        judges_status = load_judges_status()
 
         # Rendering the results template
         current_app.logger.debug("Rendering results page template.")
@@ -312,8 +235,9 @@ def judges_results():
             results=results,
             youth_results=youth_results,
             judge_votes_by_artwork=judge_votes_by_artwork,
-            judge_votes_by_youth_submission=judge_votes_by_youth_submission,
-            judges_status=judges_status
+            judges_status=judges_status,
+            method=method,
+            methods=RESULT_METHODS
         )
 
     except Exception as e:
@@ -324,8 +248,9 @@ def judges_results():
             results=[],
             youth_results=[],
             judge_votes_by_artwork={},
-            judge_votes_by_youth_submission={},
-            judges_status={}
+            judges_status={},
+            method=method,
+            methods=RESULT_METHODS
         ), 500
 
 
@@ -337,6 +262,8 @@ def clear_votes():
     try:
         # Delete all JudgeVote records for all judges (both artist and youth)
         db.session.query(JudgeVote).delete()
+        db.session.query(JudgeBallot).delete()
+        db.session.query(ArtworkTally).delete()
         db.session.commit()
         return jsonify({"success": True})
     except Exception as e:
@@ -390,6 +317,7 @@ def update_submission_dates():
                 db.session.add(new_period)
 
             db.session.commit()
+            submission_window_cache.invalidate()
             flash("Submission dates updated successfully!", "success")
             return redirect(url_for("admin.update_submission_dates"))
         except Exception as e:
@@ -403,6 +331,7 @@ def update_submission_dates():
 
 @admin_bp.route("/api/artwork-detail/<submission_type>/<int:submission_id>", methods=["GET"])
 @login_required
+@read_replica
 def api_artwork_detail(submission_type, submission_id):
     # Initialize variables
     submission = None
@@ -439,11 +368,14 @@ def api_artwork_detail(submission_type, submission_id):
                 "badge_artworks": []
             }
             if badge_artwork:
+                image = artwork_image(badge_artwork.artwork_file, badge_artwork.width, badge_artwork.height, _external=True)
                 artwork_details["badge_artworks"].append({
                     "badge_id": badge_artwork.badge_id,
-                    "artwork_file": url_for('static',
-                                              filename=f"submissions/{badge_artwork.artwork_file}",
-                                              _external=True)
+                    "artwork_file": image["original"],
+                    "modal_url": image["modal"],
+                    "srcset": image["srcset"],
+                    "width": badge_artwork.width,
+                    "height": badge_artwork.height
                 })
             return jsonify(artwork_details)
 
@@ -474,11 +406,14 @@ def api_artwork_detail(submission_type, submission_id):
                 "badge_artworks": []
             }
             if badge_artwork:
+                image = artwork_image(badge_artwork.artwork_file, badge_artwork.width, badge_artwork.height, _external=True)
                 artwork_details["badge_artworks"].append({
                     "badge_id": badge_artwork.badge_id,
-                    "artwork_file": url_for('static',
-                                              filename=f"submissions/{badge_artwork.artwork_file}",
-                                              _external=True)
+                    "artwork_file": image["original"],
+                    "modal_url": image["modal"],
+                    "srcset": image["srcset"],
+                    "width": badge_artwork.width,
+                    "height": badge_artwork.height
                 })
             return jsonify(artwork_details)
 
@@ -512,42 +447,78 @@ def delete_submission(submission_type, submission_id):
 @admin_bp.route("/admin/download-html", methods=["GET"])
 @login_required
 @admin_required
+@read_replica
 def download_html():
     """
-    Generate an HTML file containing all submissions with complete details and associated artwork images.
-    The images will have absolute URLs pointing to https://questbycycle.org.
-    The HTML file is returned as a downloadable file.
+    Stream every submission with its badge artworks as a download, in the
+    format given by ?format=html (default), csv or jsonl. Submissions are read
+    in batches and written as they are read, so memory stays flat however large
+    the contest is. HTML images use absolute URLs pointing to https://questbycycle.org.
     """
-    try:
-        # Query all submissions
-        artist_submissions = ArtistSubmission.query.order_by(ArtistSubmission.created_at).all()
-        youth_submissions = YouthArtistSubmission.query.order_by(YouthArtistSubmission.created_at).all()
-
-        # Render the HTML content using the template
-        html_content = render_template(
-            "download_submissions.html",
-            artist_submissions=artist_submissions,
-            youth_submissions=youth_submissions
-        )
+    export_format = request.args.get("format", "html")
+    if export_format not in EXPORT_FORMATS:
+        return f"Unknown export format '{export_format}'.", 400
+    mimetype, download_name, generate = EXPORT_FORMATS[export_format]
 
-        # Write the HTML content to a BytesIO buffer
-        buffer = io.BytesIO()
-        buffer.write(html_content.encode("utf-8"))
-        buffer.seek(0)
-
-        # Return the buffer as a downloadable file
-        return send_file(
-            buffer,
-            as_attachment=True,
-            download_name="submissions.html",
-            mimetype="text/html"
-        )
+    try:
+        chunks = generate()
     except Exception as e:
-        current_app.logger.error(f"Error generating HTML file: {e}", exc_info=True)
-        return "An error occurred while generating the HTML file.", 500
+        current_app.logger.error(f"Error generating {export_format} export: {e}", exc_info=True)
+        return f"An error occurred while generating the {export_format.upper()} file.", 500
+
+    response = Response(stream_with_context(logged(chunks, export_format)), mimetype=mimetype)
+    response.headers["Content-Disposition"] = f"attachment; filename={download_name}"
+    return response
 
 
-    
+@admin_bp.route("/admin/download-artworks", methods=["GET"])
+@login_required
+@admin_required
+def download_artworks():
+    """
+    Stream a ZIP of every artwork file, named category/badge/artist-submission-instance,
+    with a manifest.csv. Optional filters: ?category=adult|youth and one or more ?badge=<id>.
+    """
+    category = request.args.get("category") or None
+    if category not in (None, "adult", "youth"):
+        return f"Unknown category '{category}'.", 400
+    try:
+        badge_ids = [int(badge_id) for badge_id in request.args.getlist("badge")]
+    except ValueError:
+        return "Badge filters must be badge IDs.", 400
+
+    download_name = "artworks.zip" if not category else f"artworks-{category}.zip"
+    response = Response(stream_with_context(logged(generate_zip(category, badge_ids), "zip")), mimetype="application/zip")
+    response.headers["Content-Disposition"] = f"attachment; filename={download_name}"
+    return response
+
+
+@admin_bp.route("/admin/profiles", methods=["GET"])
+@login_required
+@admin_required
+def admin_profiles():
+    """Recent request profiles, grouped by endpoint, and a token for profiling from scripts."""
+    captures_by_endpoint = {}
+    for capture in list_captures():
+        captures_by_endpoint.setdefault(capture.endpoint, []).append(capture)
+    return render_template(
+        "admin_profiles.html",
+        captures_by_endpoint=dict(sorted(captures_by_endpoint.items())),
+        profile_token=make_profile_token(),
+        token_max_age=current_app.config["PROFILER_TOKEN_MAX_AGE"],
+        profile_header=PROFILE_HEADER,
+        profile_query_flag=PROFILE_QUERY_FLAG
+    )
+
+
+@admin_bp.route("/admin/profiles/<name>", methods=["GET"])
+@login_required
+@admin_required
+def download_profile(name):
+    if not CAPTURE_NAME.match(name):
+        abort(404)
+    return send_from_directory(current_app.config["PROFILER_DIR"], name, as_attachment=True, mimetype="text/plain")
+
 
 @admin_bp.route("/judges/ballot/delete_all", methods=["POST"])
 @login_required
@@ -559,12 +530,15 @@ def delete_all_submissions():
     try:
         # Delete all JudgeVote records (if not handled by cascading deletes)
         JudgeVote.query.delete()
+        ArtworkTally.query.delete()
         # Delete all BadgeArtwork records
         BadgeArtwork.query.delete()
         # Delete all Artist Submissions
         ArtistSubmission.query.delete()
         # Delete all Youth Submissions
         YouthArtistSubmission.query.delete()
+        # Bulk deletes skip the BadgeArtwork listeners, so release every stored file explicitly
+        ArtworkBlob.query.update({ArtworkBlob.ref_count: 0})
         db.session.commit()
         return jsonify({"success": "All submissions deleted successfully."}), 200
     except Exception as e:
@@ -0,0 +1,177 @@
+from collections import namedtuple
+from app.models import JudgeVote, db
+
+import time
+import logging
+import warnings
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Candidates (by Borda score) that Schulze and Kemeny-Young order exactly; the rest keep their Borda order.
+# Both work on a K x K pairwise matrix, which stays cheap for a few hundred candidates.
+DEFAULT_TOP_K = 200
+KEMENY_MAX_PASSES = 500
+
+ResultMethod = namedtuple("ResultMethod", ["label", "lower_is_better"])
+
+RESULT_METHODS = {
+    "sum": ResultMethod("Rank sum", True),
+    "borda": ResultMethod("Borda count", False),
+    "mean": ResultMethod("Mean rank", True),
+    "median": ResultMethod("Median rank", True),
+    "schulze": ResultMethod("Schulze (wins)", False),
+    "kemeny": ResultMethod("Kemeny-Young (pairwise support)", False),
+}
+
+# Judge x artwork matrix of positions; NaN where a judge did not rank an artwork (partial ballots)
+RankMatrix = namedtuple("RankMatrix", ["artwork_ids", "judge_ids", "ranks"])
+
+
+def load_rank_matrix(ballot_type, artwork_ids):
+    """Read every vote of one ballot type once and arrange it as a RankMatrix over ``artwork_ids``."""
+    column = JudgeVote.youth_submission_id if ballot_type == "youth" else JudgeVote.submission_id
+    votes = np.array(
+        db.session.query(JudgeVote.user_id, JudgeVote.badge_artwork_id, JudgeVote.rank)
+        .filter(column.isnot(None))
+        .all(),
+        dtype=np.int64,
+    ).reshape(-1, 3)
+
+    artwork_ids = np.asarray(sorted(artwork_ids), dtype=np.int64)
+    judge_ids, judge_index = np.unique(votes[:, 0], return_inverse=True)
+    ranks = np.full((len(judge_ids), len(artwork_ids)), np.nan)
+    if len(artwork_ids):
+        artwork_index = np.minimum(np.searchsorted(artwork_ids, votes[:, 1]), len(artwork_ids) - 1)
+        known = artwork_ids[artwork_index] == votes[:, 1]  # Ignore votes for artworks not listed
+        ranks[judge_index[known], artwork_index[known]] = votes[known, 2]
+    return RankMatrix(artwork_ids, judge_ids, _dense_positions(ranks))
+
+
+def _dense_positions(ranks):
+    """Renumber each judge's ranks 1..k in order, closing gaps left by deleted submissions."""
+    ranked = ~np.isnan(ranks)
+    order = np.argsort(np.where(ranked, ranks, np.inf), axis=1, kind="stable")
+    positions = np.empty_like(ranks)
+    np.put_along_axis(positions, order, np.broadcast_to(np.arange(1, ranks.shape[1] + 1, dtype=float), ranks.shape), axis=1)
+    return np.where(ranked, positions, np.nan)
+
+
+def borda_scores(ranks):
+    """k - position points per judge, where k is how many artworks that judge ranked; unranked get 0."""
+    ranked = ~np.isnan(ranks)
+    ballot_sizes = ranked.sum(axis=1, keepdims=True)
+    return np.where(ranked, ballot_sizes - np.nan_to_num(ranks), 0).sum(axis=0)
+
+
+def pairwise_preferences(ranks):
+    """
+    d[a, b] = number of judges preferring a to b. A ranked artwork beats an
+    unranked one; two unranked artworks express no preference.
+    """
+    filled = np.where(np.isnan(ranks), np.inf, ranks)
+    return (filled[:, :, None] < filled[:, None, :]).sum(axis=0)
+
+
+def schulze_wins(d):
+    """Number of candidates each candidate beats by strongest path (Schulze method)."""
+    strength = np.where(d > d.T, d, 0)
+    for k in range(len(d)):
+        strength = np.maximum(strength, np.minimum(strength[:, k:k + 1], strength[k:k + 1, :]))
+    np.fill_diagonal(strength, 0)
+    return (strength > strength.T).sum(axis=1)
+
+
+def kemeny_order(d, order):
+    """
+    Approximate Kemeny-Young: starting from ``order``, swap adjacent candidates
+    whenever more judges prefer the later one, in alternating odd/even passes
+    (each pass is one vectorized step), until no swap helps.
+    """
+    order = np.array(order)
+    for _ in range(KEMENY_MAX_PASSES):
+        swapped = False
+        for parity in (0, 1):
+            first = order[parity:len(order) - 1:2]
+            second = order[parity + 1::2]
+            swap = d[second, first] > d[first, second]
+            if swap.any():
+                swapped = True
+                pairs = order[parity:parity + 2 * len(first)].reshape(-1, 2)
+                pairs[swap] = pairs[swap][:, ::-1]
+                order[parity:parity + 2 * len(first)] = pairs.ravel()
+        if not swapped:
+            break
+    return order
+
+
+def aggregate(matrix, method, top_k=DEFAULT_TOP_K):
+    """
+    Rank the artworks of a RankMatrix with one of RESULT_METHODS (other than
+    "sum", which the results page reads from the maintained tallies).
+    Returns [(badge_artwork_id, score)] best first; score is None for artworks
+    outside the top K of Schulze and Kemeny-Young.
+    """
+    started = time.perf_counter()
+    ranks = matrix.ranks
+    count = len(matrix.artwork_ids)
+    ids = np.arange(count)
+    borda = borda_scores(ranks) if count else np.zeros(0)
+
+    if method == "borda":
+        scores = borda
+        order = np.lexsort((ids, -scores))
+    elif method in ("mean", "median"):
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", category=RuntimeWarning)  # "Mean of empty slice" for unranked artworks
+            scores = np.nanmean(ranks, axis=0) if method == "mean" else np.nanmedian(ranks, axis=0)
+        # Artworks nobody ranked go last
+        order = np.lexsort((ids, np.where(np.isnan(scores), np.inf, scores)))
+    elif method in ("schulze", "kemeny"):
+        base = np.lexsort((ids, -borda))
+        top = base[:top_k]
+        d = pairwise_preferences(ranks[:, top])
+        scores = np.full(count, np.nan)
+        if method == "schulze":
+            wins = schulze_wins(d)
+            top_order = np.lexsort((np.arange(len(top)), -wins))
+            scores[top] = wins
+        else:
+            top_order = kemeny_order(d, np.arange(len(top)))
+            # Pairwise support: judges agreeing with each placement above a later candidate
+            position = np.empty(len(top), dtype=int)
+            position[top_order] = np.arange(len(top))
+            placed_before = position[:, None] < position[None, :]
+            scores[top] = np.where(placed_before, d, 0).sum(axis=1)
+        order = np.concatenate([top[top_order], base[top_k:]])
+    else:
+        raise ValueError(f"Unknown results method '{method}'")
+
+    logger.debug(
+        f"Aggregated {count} artworks from {len(matrix.judge_ids)} judges with {method} "
+        f"in {(time.perf_counter() - started) * 1000:.1f} ms."
+    )
+    return [
+        (int(matrix.artwork_ids[i]), None if np.isnan(scores[i]) else round(float(scores[i]), 2))
+        for i in order
+    ]
+
+
+def rank_results(rows, ballot_type, method, top_k=DEFAULT_TOP_K):
+    """
+    Reorder results-page rows (dicts from app.results.load_results) by ``method``,
+    replacing their total_score and placement with the method's; equal scores share a place.
+    """
+    by_artwork = {row["badge_artwork_id"]: dict(row) for row in rows}
+    matrix = load_rank_matrix(ballot_type, list(by_artwork))
+    ranked = []
+    previous = placement = None
+    for position, (artwork_id, score) in enumerate(aggregate(matrix, method, top_k), start=1):
+        row = by_artwork[artwork_id]
+        if score is None or score != previous:
+            placement = position
+        previous = score
+        row["total_score"] = "—" if score is None else score
+        row["placement"] = placement
+        ranked.append(row)
+    return ranked
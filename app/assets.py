@@ -0,0 +1,145 @@
+from flask import current_app, request, send_from_directory
+from flask.cli import AppGroup
+from app.cache_policy import set_cache_policy
+
+import os
+import gzip
+import click
+import hashlib
+import logging
+import mimetypes
+
+try:
+    import brotli  # Optional: only needed to build .br files
+except ImportError:
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+FINGERPRINT_LENGTH = 12
+IMMUTABLE_POLICY = "public, max-age=31536000, immutable"
+
+# Precompressed siblings, in order of preference: Accept-Encoding token -> file suffix
+PRECOMPRESSED_ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+COMPRESSIBLE_EXTENSIONS = {".css", ".js", ".map", ".svg", ".json", ".txt", ".html", ".ico"}
+SKIPPED_EXTENSIONS = {".gz", ".br"}
+
+
+class AssetManifest:
+    """Maps static filenames to content-fingerprinted names and back."""
+
+    def __init__(self, static_folder, exclude=()):
+        self.static_folder = static_folder
+        self.exclude = [os.path.abspath(path) for path in exclude]
+        self.fingerprinted = {}  # "js/rankings.js" -> "js/rankings.0123456789ab.js"
+        self.originals = {}  # reverse of fingerprinted
+
+    def _excluded(self, path):
+        path = os.path.abspath(path)
+        return any(path == root or path.startswith(root + os.sep) for root in self.exclude)
+
+    def iter_files(self):
+        """Yield (relative filename, absolute path) for every fingerprintable static file."""
+        for root, dirs, files in os.walk(self.static_folder):
+            dirs[:] = sorted(d for d in dirs if not self._excluded(os.path.join(root, d)))
+            for name in sorted(files):
+                path = os.path.join(root, name)
+                if os.path.splitext(name)[1] in SKIPPED_EXTENSIONS or self._excluded(path):
+                    continue
+                yield os.path.relpath(path, self.static_folder).replace(os.sep, "/"), path
+
+    def build(self):
+        self.fingerprinted.clear()
+        self.originals.clear()
+        for filename, path in self.iter_files():
+            digest = hashlib.sha256()
+            with open(path, "rb") as f:
+                for chunk in iter(lambda: f.read(64 * 1024), b""):
+                    digest.update(chunk)
+            stem, ext = os.path.splitext(filename)
+            hashed = f"{stem}.{digest.hexdigest()[:FINGERPRINT_LENGTH]}{ext}"
+            self.fingerprinted[filename] = hashed
+            self.originals[hashed] = filename
+        logger.debug(f"Asset manifest built with {len(self.fingerprinted)} files.")
+        return self
+
+
+def get_manifest():
+    return current_app.extensions.get("asset_manifest")
+
+
+def _precompressed(path):
+    """Pick a precompressed sibling the client accepts and that is not older than the original."""
+    for encoding, suffix in PRECOMPRESSED_ENCODINGS:
+        if not request.accept_encodings[encoding]:
+            continue
+        candidate = path + suffix
+        if os.path.exists(candidate) and os.path.getmtime(candidate) >= os.path.getmtime(path):
+            return encoding, suffix
+    return None, None
+
+
+def serve_static(filename):
+    """
+    Replacement for Flask's static view. Fingerprinted names are resolved to the
+    real file and cached as immutable; precompressed .br/.gz siblings are served
+    when the client accepts them.
+    """
+    manifest = get_manifest()
+    static_folder = current_app.static_folder
+    original = manifest.originals.get(filename) if manifest else None
+    if original:
+        set_cache_policy(IMMUTABLE_POLICY)
+        filename = original
+
+    path = os.path.join(static_folder, filename)
+    has_variants = os.path.splitext(filename)[1] in COMPRESSIBLE_EXTENSIONS
+    encoding, suffix = _precompressed(path) if has_variants and os.path.isfile(path) else (None, None)
+    if encoding:
+        mimetype = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+        response = send_from_directory(static_folder, filename + suffix, mimetype=mimetype)
+        response.headers["Content-Encoding"] = encoding
+    else:
+        response = current_app.send_static_file(filename)
+    if has_variants:
+        response.vary.add("Accept-Encoding")
+    return response
+
+
+def init_assets(app, section=None):
+    """Build the manifest at startup and route the static endpoint through serve_static."""
+    section = section or {}
+    if not section.get("FINGERPRINT", True):
+        return None
+    manifest = AssetManifest(app.static_folder, exclude=[app.config["UPLOAD_FOLDER"]]).build()
+    app.extensions["asset_manifest"] = manifest
+    app.view_functions["static"] = serve_static
+    return manifest
+
+
+assets_cli = AppGroup("assets", help="Build static asset variants.")
+
+
+@assets_cli.command("build")
+@click.option("--level", default=9, show_default=True, help="gzip compression level.")
+def build_assets(level):
+    """Write precompressed .gz (and .br when brotli is installed) siblings of text assets."""
+    manifest = get_manifest() or AssetManifest(
+        current_app.static_folder, exclude=[current_app.config["UPLOAD_FOLDER"]]
+    ).build()
+    written = 0
+    for filename, path in manifest.iter_files():
+        if os.path.splitext(filename)[1] not in COMPRESSIBLE_EXTENSIONS:
+            continue
+        with open(path, "rb") as f:
+            data = f.read()
+        with open(path + ".gz", "wb") as f:
+            f.write(gzip.compress(data, compresslevel=level, mtime=0))
+        written += 1
+        if brotli is not None:
+            with open(path + ".br", "wb") as f:
+                f.write(brotli.compress(data, quality=11))
+            written += 1
+    if brotli is None:
+        click.echo("brotli is not installed; only .gz files were written.")
+    click.echo(f"{written} precompressed files written for {len(manifest.fingerprinted)} static assets.")
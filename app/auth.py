@@ -3,6 +3,7 @@ from flask_login import login_user, logout_user, login_required, current_user
 from app.utils import custom_url_for as url_for
 from app.forms import LoginForm, LogoutForm
 from app.models import User, db
+from app.metrics import LOGINS
 auth_bp = Blueprint('auth', __name__)
 
 
@@ -10,14 +11,17 @@ def login_judge(name, password, remember=False):
     judge = User.query.filter_by(name=name).first()
 
     if not judge:
+        LOGINS.labels(result="failure").inc()
         flash("Invalid username or password.", "danger")
         return None
 
     if not judge.check_password(password):
+        LOGINS.labels(result="failure").inc()
         flash("Invalid username or password.", "danger")
         return None
 
     login_user(judge, remember=remember, fresh=True)
+    LOGINS.labels(result="success").inc()
 
     return url_for("admin.admin_page") if judge.is_admin else url_for("main.judges_ballot")
 
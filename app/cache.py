@@ -0,0 +1,171 @@
+from flask import current_app
+from flask_login import UserMixin
+from app.database import use_primary
+from collections import namedtuple
+from datetime import timezone
+
+import os
+import json
+import time
+import hashlib
+import threading
+
+# Seconds a cached value is trusted before it is re-read. Other gunicorn workers
+# do not see local invalidations, so this bounds how stale they can be.
+DEFAULT_TTL = 30
+
+
+class TTLCache:
+    """A single cached value per key, reloaded after ``ttl`` seconds or on invalidate()."""
+
+    def __init__(self, loader, ttl=DEFAULT_TTL):
+        self._loader = loader
+        self._ttl = ttl
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, key=None):
+        now = time.monotonic()
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > now:
+            return entry[1]
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                return entry[1]
+            # Shared with views that read the primary, so never filled from a lagging replica
+            with use_primary():
+                value = self._loader() if key is None else self._loader(key)
+            self._entries[key] = (now + self._ttl, value)
+            return value
+
+    def invalidate(self, key=None):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+# Detached copy of the latest SubmissionPeriod; attribute names match the model so templates work unchanged
+SubmissionWindow = namedtuple("SubmissionWindow", ["submission_start", "submission_end", "id"])
+
+
+def _as_utc(value):
+    # SQLite drops the timezone of DateTime(timezone=True) columns; stored values are always UTC
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+
+def _load_submission_window():
+    from app.models import SubmissionPeriod
+
+    submission_period = SubmissionPeriod.query.order_by(SubmissionPeriod.id.desc()).first()
+    if submission_period is None:
+        return None
+    return SubmissionWindow(
+        submission_start=_as_utc(submission_period.submission_start),
+        submission_end=_as_utc(submission_period.submission_end),
+        id=submission_period.id,
+    )
+
+
+submission_window_cache = TTLCache(_load_submission_window)
+
+
+def get_submission_window():
+    """Return the active SubmissionWindow, or None if no period has been configured."""
+    return submission_window_cache.get()
+
+
+# Badge list shared by the public pages, the submission forms and /api/badges
+BadgeCatalog = namedtuple("BadgeCatalog", ["badges", "etag", "artist_choices", "youth_choices"])
+
+
+def _load_badge_catalog():
+    from app.models import Badge
+
+    badges = tuple(
+        {"id": badge.id, "name": badge.name, "description": badge.description}
+        for badge in Badge.query.order_by(Badge.id).all()
+    )
+    # Derived from the content, so every worker hands out the same ETag for the same list
+    etag = hashlib.sha1(json.dumps(badges, sort_keys=True).encode("utf-8")).hexdigest()
+    return BadgeCatalog(
+        badges=badges,
+        etag=etag,
+        artist_choices=tuple((str(badge["id"]), badge["name"]) for badge in badges),
+        youth_choices=((0, "Select a Badge"),) + tuple((badge["id"], badge["name"]) for badge in badges),
+    )
+
+
+badge_catalog_cache = TTLCache(_load_badge_catalog)
+
+
+def get_badge_catalog():
+    """Return the cached BadgeCatalog."""
+    return badge_catalog_cache.get()
+
+
+def invalidate_badge_catalog():
+    """
+    Call after committing any Badge change so this worker's next read rebuilds
+    the catalog. Other workers keep their copy, and its ETag, for up to the TTL.
+    """
+    badge_catalog_cache.invalidate()
+
+
+
+class CachedUser(UserMixin):
+    """Detached copy of the User fields current_user is read for; returned by the user_loader."""
+
+    def __init__(self, id, name, is_admin):
+        self.id = id
+        self.name = name
+        self.is_admin = bool(is_admin)
+
+    def __repr__(self):
+        return f"<User name={self.name}, is_admin={self.is_admin}>"
+
+
+def _load_user(user_id):
+    from app.models import User, db
+
+    row = db.session.query(User.id, User.name, User.is_admin).filter(User.id == user_id).first()
+    return CachedUser(*row) if row else None
+
+
+user_cache = TTLCache(_load_user)
+
+_seen_user_revocation = None  # Revocation file mtime this worker's user cache was last checked against
+
+
+def _user_revocation_mtime():
+    try:
+        return os.stat(current_app.config["USER_REVOCATION_FILE"]).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+def get_login_user(user_id):
+    """
+    Return the cached CachedUser for ``user_id``, or None if there is no such user.
+    Costs one stat() per call: the cache is dropped as soon as another worker
+    touches the revocation file, so removed judges are locked out everywhere at once.
+    """
+    global _seen_user_revocation
+    mtime = _user_revocation_mtime()
+    if mtime != _seen_user_revocation:
+        user_cache.clear()
+        _seen_user_revocation = mtime
+    return user_cache.get(user_id)
+
+
+def invalidate_users():
+    """Call after committing any User change (added, removed, admin rights) to reload users in every worker."""
+    user_cache.clear()
+    path = current_app.config["USER_REVOCATION_FILE"]
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "a"):
+        pass
+    os.utime(path, ns=(time.time_ns(), time.time_ns()))
@@ -0,0 +1,114 @@
+from flask import g, request
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Built-in rules; config.toml [cache_control] entries are layered on top of these.
+DEFAULT_CACHE_CONTROL = {
+    # Used when no other rule matches
+    "DEFAULT": "private, no-cache",
+    # Request path prefix -> policy (longest prefix wins)
+    "paths": {
+        # Artwork files are named by their content hash and never change
+        "/static/submissions/": "public, max-age=31536000, immutable",
+    },
+    # Endpoint -> policy
+    "endpoints": {
+        # Plain static URLs are not versioned, so they are only cached for a day
+        "static": "public, max-age=86400",
+        "main.api_badges": "public, no-cache",
+        "main.call_for_artists": "no-store",
+        "main.call_for_youth_artists": "no-store",
+        "auth.judges": "no-store",
+        "main.judges_ballot": "private, no-cache",
+        "admin.judges_results": "private, no-cache",
+    },
+    # Blueprint -> policy
+    "blueprints": {
+        "admin": "no-store",
+    },
+}
+
+ERROR_POLICY = "no-store"
+COOKIE_POLICY = "private, no-cache"  # Replaces a public policy on responses that set a cookie
+
+
+class CachePolicy:
+    """Resolves the Cache-Control value for a response from path, endpoint and blueprint rules."""
+
+    def __init__(self, default, paths=None, endpoints=None, blueprints=None):
+        self.default = default
+        self.paths = sorted((paths or {}).items(), key=lambda item: len(item[0]), reverse=True)
+        self.endpoints = dict(endpoints or {})
+        self.blueprints = dict(blueprints or {})
+
+    @classmethod
+    def from_config(cls, section=None):
+        section = section or {}
+        return cls(
+            default=section.get("DEFAULT", DEFAULT_CACHE_CONTROL["DEFAULT"]),
+            paths={**DEFAULT_CACHE_CONTROL["paths"], **section.get("paths", {})},
+            endpoints={**DEFAULT_CACHE_CONTROL["endpoints"], **section.get("endpoints", {})},
+            blueprints={**DEFAULT_CACHE_CONTROL["blueprints"], **section.get("blueprints", {})},
+        )
+
+    def resolve(self, path, endpoint, blueprint):
+        for prefix, policy in self.paths:
+            if path.startswith(prefix):
+                return policy
+        if endpoint in self.endpoints:
+            return self.endpoints[endpoint]
+        if blueprint in self.blueprints:
+            return self.blueprints[blueprint]
+        return self.default
+
+
+class CookieCacheGuard:
+    """
+    WSGI middleware that downgrades a public Cache-Control on responses setting
+    a cookie. It sees the final headers, including the session cookie Flask
+    saves and the remember cookie Flask-Login sets after the after_request hooks.
+    """
+
+    def __init__(self, wsgi_app):
+        self.wsgi_app = wsgi_app
+
+    def __call__(self, environ, start_response):
+        def guarded_start_response(status, headers, exc_info=None):
+            if any(name.lower() == "set-cookie" for name, _ in headers):
+                headers = [
+                    (name, COOKIE_POLICY) if name.lower() == "cache-control" and "public" in value else (name, value)
+                    for name, value in headers
+                ]
+            return start_response(status, headers, exc_info)
+
+        return self.wsgi_app(environ, guarded_start_response)
+
+
+def set_cache_policy(value):
+    """Override the configured policy for the current response from inside a view."""
+    g.cache_policy = value
+
+
+def init_cache_policy(app, section=None):
+    policy = CachePolicy.from_config(section)
+    app.extensions["cache_policy"] = policy
+
+    @app.after_request
+    def apply_cache_policy(response):
+        if response.status_code >= 400:
+            value = ERROR_POLICY
+        else:
+            value = g.get("cache_policy") or policy.resolve(request.path, request.endpoint, request.blueprint)
+
+        response.headers["Cache-Control"] = value
+        if "no-store" in value:
+            response.headers["Pragma"] = "no-cache"
+        else:
+            response.headers.pop("Pragma", None)
+        return response
+
+    # The session and remember cookies are only added after every after_request hook has run
+    app.wsgi_app = CookieCacheGuard(app.wsgi_app)
+    return policy
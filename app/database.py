@@ -0,0 +1,99 @@
+from flask import g, has_app_context
+from flask_sqlalchemy.session import Session
+from sqlalchemy.engine import make_url
+from contextlib import contextmanager
+from functools import wraps
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+REPLICA_BIND = "replica"  # SQLALCHEMY_BINDS key of the read replica
+
+DEFAULT_POOL_SIZE = 10
+DEFAULT_MAX_OVERFLOW = 20
+DEFAULT_POOL_TIMEOUT = 30
+DEFAULT_POOL_RECYCLE = 1800
+
+
+class RoutingSession(Session):
+    """
+    Sends the plain SELECTs of views marked with @read_replica to the replica
+    bind. Flushes, locking reads and every other statement stay on the primary.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if (
+            bind is None
+            and not self._flushing
+            and getattr(clause, "is_select", False)
+            and getattr(clause, "_for_update_arg", None) is None
+            and has_app_context()
+            and g.get("use_replica")
+            and REPLICA_BIND in self._db.engines
+        ):
+            return self._db.engines[REPLICA_BIND]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def read_replica(view):
+    """
+    Read the rest of the request, including streamed bodies, from the replica.
+    Apply below @login_required so the user is still loaded from the primary.
+    """
+    @wraps(view)
+    def wrapped(*args, **kwargs):
+        g.use_replica = True
+        return view(*args, **kwargs)
+    return wrapped
+
+
+@contextmanager
+def use_primary():
+    """Read from the primary inside the block, even within a @read_replica view."""
+    if not has_app_context():
+        yield
+        return
+    previous = g.pop("use_replica", None)
+    try:
+        yield
+    finally:
+        if previous is not None:
+            g.use_replica = previous
+
+
+def engine_options(section, uri, read_only=False):
+    """SQLAlchemy create_engine options for ``uri`` from the [database] section."""
+    backend = make_url(uri).get_backend_name()
+    options = {
+        "pool_pre_ping": section.get("POOL_PRE_PING", True),
+        "pool_recycle": section.get("POOL_RECYCLE", DEFAULT_POOL_RECYCLE),
+    }
+    if backend != "sqlite":  # SQLite's pools are not sized
+        options["pool_size"] = section.get("POOL_SIZE", DEFAULT_POOL_SIZE)
+        options["max_overflow"] = section.get("MAX_OVERFLOW", DEFAULT_MAX_OVERFLOW)
+        options["pool_timeout"] = section.get("POOL_TIMEOUT", DEFAULT_POOL_TIMEOUT)
+    if backend == "postgresql":
+        settings = []
+        if section.get("STATEMENT_TIMEOUT_MS"):
+            settings.append(f"-c statement_timeout={int(section['STATEMENT_TIMEOUT_MS'])}")
+        if read_only:  # A write routed to the replica by mistake fails instead of being attempted
+            settings.append("-c default_transaction_read_only=on")
+        if settings:
+            options["connect_args"] = {"options": " ".join(settings)}
+    return options
+
+
+def init_database(app, section=None):
+    """
+    Set engine options for the primary and, when [database] REPLICA_URI is set,
+    add the replica bind. Call before db.init_app; explicit config values win.
+    """
+    section = section or {}
+    uri = app.config["SQLALCHEMY_DATABASE_URI"]
+    app.config.setdefault("SQLALCHEMY_ENGINE_OPTIONS", engine_options(section, uri))
+    replica_uri = section.get("REPLICA_URI")
+    if replica_uri:
+        binds = app.config.setdefault("SQLALCHEMY_BINDS", {})
+        binds.setdefault(REPLICA_BIND, {"url": replica_uri, **engine_options(section, replica_uri, read_only=True)})
+        logger.info(f"Routing read-only views to the replica at {make_url(replica_uri).render_as_string(hide_password=True)}.")
@@ -0,0 +1,190 @@
+from flask import current_app
+from flask.cli import AppGroup
+from concurrent.futures import ProcessPoolExecutor
+from PIL import Image, ImageOps, features
+from app.utils import custom_url_for as url_for
+from app.jobs import job_handler, enqueue
+
+import os
+import click
+import logging
+
+logger = logging.getLogger(__name__)
+
+DERIVATIVES_DIRNAME = "derivatives"  # Sub-folder of UPLOAD_FOLDER holding the renditions
+
+# Rendition name -> maximum width in pixels, smallest first
+RENDITIONS = {
+    "thumb": 160,
+    "card": 400,
+    "modal": 1200,
+}
+
+# Prefer WebP; fall back to JPEG when Pillow was built without WebP support
+if features.check("webp"):
+    RENDITION_FORMAT, RENDITION_EXT = "WEBP", ".webp"
+else:
+    RENDITION_FORMAT, RENDITION_EXT = "JPEG", ".jpg"
+
+RASTER_EXTENSIONS = {".jpg", ".jpeg", ".png"}
+EXIF_ORIENTATION = 0x0112
+
+_executor = None
+
+
+def rendition_filename(artwork_file, rendition):
+    """Return the derivative filename (relative to UPLOAD_FOLDER) for an artwork."""
+    stem = os.path.splitext(artwork_file)[0]
+    return f"{DERIVATIVES_DIRNAME}/{stem}-{rendition}{RENDITION_EXT}"
+
+
+def read_image_size(path):
+    """Return (width, height) of a raster image by reading only its header, or (None, None)."""
+    if os.path.splitext(path)[1].lower() not in RASTER_EXTENSIONS:
+        return None, None
+    try:
+        with Image.open(path) as image:
+            width, height = image.size
+            # EXIF orientations 5-8 are rotated by 90 degrees; renditions are stored upright
+            if image.getexif().get(EXIF_ORIENTATION, 1) in (5, 6, 7, 8):
+                width, height = height, width
+            return width, height
+    except Exception as e:
+        logger.warning(f"Unable to read image size for {path}: {e}")
+        return None, None
+
+
+def scaled_size(width, height, max_width):
+    """Size of a rendition: scaled down to max_width, never enlarged."""
+    if not width or not height or width <= max_width:
+        return width, height
+    return max_width, max(1, round(height * max_width / width))
+
+
+def generate_derivatives(upload_folder, artwork_file, force=False):
+    """
+    Write every rendition of one artwork. Runs in a pool process, so it only
+    touches the filesystem and never the app or the database.
+    Returns the list of rendition files that were written.
+    """
+    source_path = os.path.join(upload_folder, artwork_file)
+    if os.path.splitext(artwork_file)[1].lower() not in RASTER_EXTENSIONS:
+        return []  # SVGs scale natively and are served as-is
+
+    os.makedirs(os.path.join(upload_folder, DERIVATIVES_DIRNAME), exist_ok=True)
+    written = []
+    with Image.open(source_path) as source:
+        image = ImageOps.exif_transpose(source)
+        keep_alpha = RENDITION_FORMAT == "WEBP" and ("A" in image.getbands() or "transparency" in image.info)
+        image = image.convert("RGBA" if keep_alpha else "RGB")
+
+        # Largest first, so every smaller rendition is resampled from an already reduced image
+        for rendition, max_width in sorted(RENDITIONS.items(), key=lambda item: -item[1]):
+            target = os.path.join(upload_folder, rendition_filename(artwork_file, rendition))
+            if not force and os.path.exists(target):
+                continue
+            size = scaled_size(image.width, image.height, max_width)
+            if size != image.size:
+                image = image.resize(size, Image.LANCZOS)
+            temp_target = f"{target}.part"
+            if RENDITION_FORMAT == "WEBP":
+                image.save(temp_target, RENDITION_FORMAT, quality=82, method=4)
+            else:
+                image.save(temp_target, RENDITION_FORMAT, quality=82, optimize=True, progressive=True)
+            os.replace(temp_target, target)
+            written.append(rendition_filename(artwork_file, rendition))
+    return written
+
+
+def _get_executor():
+    """Process pool used by the backfill command; live uploads go through the job queue."""
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=current_app.config.get("DERIVATIVE_PROCESSES", 2))
+    return _executor
+
+
+@job_handler("generate_derivatives")
+def generate_derivatives_job(artwork_files):
+    """Background job: write the renditions of newly submitted artworks."""
+    upload_folder = current_app.config["UPLOAD_FOLDER"]
+    for artwork_file in artwork_files:
+        written = generate_derivatives(upload_folder, artwork_file)
+        logger.debug(f"Derivatives written for {artwork_file}: {written}")
+
+
+def schedule_derivatives(artwork_files):
+    """Queue rendition generation for new BadgeArtwork files; call before the submission commit."""
+    artwork_files = [artwork_file for artwork_file in artwork_files if artwork_file]
+    if artwork_files:
+        enqueue("generate_derivatives", {"artwork_files": artwork_files})
+
+
+def artwork_image(artwork_file, width=None, height=None, _external=False):
+    """
+    Template helper describing how to display an artwork: the card rendition as
+    ``src``, a ``srcset`` over all renditions, its intrinsic size, and the modal
+    rendition for the detail view. Falls back to the original file until the
+    renditions have been generated (or for SVGs).
+    """
+    original_url = url_for("static", filename=f"submissions/{artwork_file}", _external=_external)
+    image = {
+        "src": original_url,
+        "srcset": "",
+        "width": width,
+        "height": height,
+        "modal": original_url,
+        "original": original_url,
+    }
+    upload_folder = current_app.config["UPLOAD_FOLDER"]
+    if not artwork_file or not os.path.exists(os.path.join(upload_folder, rendition_filename(artwork_file, "card"))):
+        return image
+
+    def rendition_url(rendition):
+        return url_for("static", filename=f"submissions/{rendition_filename(artwork_file, rendition)}", _external=_external)
+
+    srcset = []
+    for rendition, max_width in RENDITIONS.items():
+        rendition_width = scaled_size(width, height, max_width)[0] if width else max_width
+        srcset.append(f"{rendition_url(rendition)} {rendition_width}w")
+
+    image["src"] = rendition_url("card")
+    image["srcset"] = ", ".join(srcset)
+    image["width"], image["height"] = scaled_size(width, height, RENDITIONS["card"])
+    image["modal"] = rendition_url("modal")
+    return image
+
+
+derivatives_cli = AppGroup("derivatives", help="Manage resized artwork renditions.")
+
+
+@derivatives_cli.command("backfill")
+@click.option("--force", is_flag=True, help="Regenerate renditions that already exist.")
+def backfill_derivatives(force):
+    """Generate renditions and record image sizes for existing artworks."""
+    from app.models import BadgeArtwork, db
+
+    upload_folder = current_app.config["UPLOAD_FOLDER"]
+    artworks = BadgeArtwork.query.order_by(BadgeArtwork.id).all()
+    artwork_files = sorted({artwork.artwork_file for artwork in artworks if artwork.artwork_file})
+
+    for artwork in artworks:
+        if artwork.width is None and artwork.artwork_file:
+            artwork.width, artwork.height = read_image_size(os.path.join(upload_folder, artwork.artwork_file))
+    db.session.commit()
+
+    generated = failed = 0
+    executor = _get_executor()
+    futures = {
+        executor.submit(generate_derivatives, upload_folder, artwork_file, force): artwork_file
+        for artwork_file in artwork_files
+        if os.path.exists(os.path.join(upload_folder, artwork_file))
+    }
+    for future, artwork_file in futures.items():
+        try:
+            generated += len(future.result())
+        except Exception as e:
+            failed += 1
+            click.echo(f"Failed to process {artwork_file}: {e}", err=True)
+
+    click.echo(f"Processed {len(futures)} artwork files: {generated} renditions written, {failed} failures.")
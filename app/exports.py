@@ -0,0 +1,223 @@
+from flask import current_app, stream_template
+from sqlalchemy.orm import joinedload, selectinload
+from werkzeug.utils import secure_filename
+from app.models import ArtistSubmission, BadgeArtwork, YouthArtistSubmission
+from datetime import datetime
+
+import io
+import os
+import csv
+import json
+import logging
+import zipfile
+
+logger = logging.getLogger(__name__)
+
+# Submissions loaded per round-trip; their artworks and badges come in one extra query per batch
+EXPORT_BATCH_SIZE = 200
+
+ARTIST_FIELDS = (
+    "id", "created_at", "name", "email", "phone_number", "artist_bio", "statement",
+    "portfolio_link", "demographic_identity", "lane_county_connection", "hear_about_contest",
+    "future_engagement", "consent_to_data", "opt_in_featured_artwork",
+)
+YOUTH_FIELDS = (
+    "id", "created_at", "name", "age", "email", "parent_contact_info", "about_why_design",
+    "about_yourself", "opt_in_featured_artwork", "parent_consent",
+)
+CSV_FIELDS = ("category",) + ARTIST_FIELDS + tuple(f for f in YOUTH_FIELDS if f not in ARTIST_FIELDS) + ("badge_artworks",)
+
+# Bytes read from each artwork file per write into the ZIP stream
+ARCHIVE_CHUNK_SIZE = 1024 * 1024
+ARCHIVE_MANIFEST_FIELDS = (
+    "path", "category", "submission_id", "artist_name", "badge_id", "badge_name",
+    "instance", "artwork_file", "size", "status",
+)
+ZIP_EPOCH = (1980, 1, 1, 0, 0, 0)  # Earliest timestamp a ZIP entry can record
+
+EXPORT_CATEGORIES = (("adult", ArtistSubmission, ARTIST_FIELDS), ("youth", YouthArtistSubmission, YOUTH_FIELDS))
+
+def iter_submissions(model):
+    """Yield every submission of ``model`` oldest first, a batch at a time, with artworks and badges eager-loaded."""
+    return model.query.options(
+        selectinload(model.badge_artworks).joinedload(BadgeArtwork.badge)
+    ).order_by(model.created_at, model.id).yield_per(EXPORT_BATCH_SIZE)
+
+
+def _artwork_record(artwork):
+    return {
+        "badge_id": artwork.badge_id,
+        "badge_name": artwork.badge.name if artwork.badge else None,
+        "artwork_file": artwork.artwork_file,
+        "instance": artwork.instance,
+    }
+
+
+def _submission_record(category, submission, fields):
+    record = {"category": category}
+    for field in fields:
+        value = getattr(submission, field)
+        record[field] = value.isoformat() if field == "created_at" and value else value
+    record["badge_artworks"] = [_artwork_record(artwork) for artwork in submission.badge_artworks]
+    return record
+
+
+def _iter_records():
+    for category, model, fields in EXPORT_CATEGORIES:
+        for submission in iter_submissions(model):
+            yield _submission_record(category, submission, fields)
+
+
+def generate_jsonl():
+    for record in _iter_records():
+        yield json.dumps(record, default=str) + "\n"
+
+
+def generate_csv():
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=CSV_FIELDS)
+    writer.writeheader()
+    for record in _iter_records():
+        record["badge_artworks"] = "; ".join(
+            f"{artwork['badge_name'] or artwork['badge_id']}: {artwork['artwork_file']} (instance {artwork['instance']})"
+            for artwork in record["badge_artworks"]
+        )
+        writer.writerow(record)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def generate_html():
+    """Stream download_submissions.html, rendering each submission as it is read."""
+    return stream_template(
+        "download_submissions.html",
+        artist_count=ArtistSubmission.query.count(),
+        youth_count=YouthArtistSubmission.query.count(),
+        artist_submissions=iter_submissions(ArtistSubmission),
+        youth_submissions=iter_submissions(YouthArtistSubmission),
+    )
+
+
+EXPORT_FORMATS = {
+    # format -> (mimetype, download name, chunk generator)
+    "html": ("text/html", "submissions.html", generate_html),
+    "csv": ("text/csv", "submissions.csv", generate_csv),
+    "jsonl": ("application/x-ndjson", "submissions.jsonl", generate_jsonl),
+}
+
+
+def logged(chunks, export_format):
+    """Pass non-empty chunks through, logging failures that happen after the response has started."""
+    sent, unit = 0, "characters"
+    try:
+        for chunk in chunks:
+            if not chunk:
+                continue
+            sent += len(chunk)
+            unit = "bytes" if isinstance(chunk, bytes) else "characters"
+            yield chunk
+    except Exception as e:
+        current_app.logger.error(f"Error streaming {export_format} export after {sent} {unit}: {e}", exc_info=True)
+        raise
+    logger.debug(f"Streamed {sent} {unit} of {export_format} export.")
+
+class _StreamSink:
+    """
+    Write-only, unseekable file object for zipfile. Whatever the archive writes
+    is held only until the generator drains it into the response.
+    """
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def iter_archive_artworks(category=None, badge_ids=None):
+    """Yield the BadgeArtwork rows to archive, optionally limited to one category and some badges."""
+    query = BadgeArtwork.query.options(
+        joinedload(BadgeArtwork.badge),
+        joinedload(BadgeArtwork.submission),
+        joinedload(BadgeArtwork.youth_submission),
+    )
+    if category == "adult":
+        query = query.filter(BadgeArtwork.submission_id.isnot(None))
+    elif category == "youth":
+        query = query.filter(BadgeArtwork.youth_submission_id.isnot(None))
+    if badge_ids:
+        query = query.filter(BadgeArtwork.badge_id.in_(badge_ids))
+    return query.order_by(BadgeArtwork.id).yield_per(EXPORT_BATCH_SIZE)
+
+
+def archive_name(category, badge_name, artist_name, submission_id, instance, artwork_file):
+    """adult/<badge>/<artist>-<submission id>-<instance><ext>, with every part made filesystem-safe."""
+    ext = os.path.splitext(artwork_file)[1].lower()
+    badge = secure_filename(badge_name or "") or "badge"
+    artist = secure_filename(artist_name or "") or "artist"
+    return f"{category}/{badge}/{artist}-{submission_id}-{instance}{ext}"
+
+
+def generate_zip(category=None, badge_ids=None):
+    """
+    Stream a ZIP of the artwork files plus a manifest.csv, built as it is sent:
+    files are stored (images are already compressed) through an unseekable
+    sink, so nothing is buffered beyond one chunk and no temp file is written.
+    """
+    upload_folder = current_app.config["UPLOAD_FOLDER"]
+    exported_at = datetime.now().timetuple()[:6]  # Entry time of submissions without created_at
+    sink = _StreamSink()
+    manifest = io.StringIO()
+    manifest_writer = csv.DictWriter(manifest, fieldnames=ARCHIVE_MANIFEST_FIELDS)
+    manifest_writer.writeheader()
+
+    with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_STORED, allowZip64=True) as archive:
+        for artwork in iter_archive_artworks(category, badge_ids):
+            submission = artwork.submission or artwork.youth_submission
+            if submission is None:
+                continue
+            artwork_category = "youth" if artwork.youth_submission_id else "adult"
+            badge_name = artwork.badge.name if artwork.badge else None
+            entry = {
+                "path": archive_name(artwork_category, badge_name, submission.name, submission.id, artwork.instance, artwork.artwork_file),
+                "category": artwork_category,
+                "submission_id": submission.id,
+                "artist_name": submission.name,
+                "badge_id": artwork.badge_id,
+                "badge_name": badge_name,
+                "instance": artwork.instance,
+                "artwork_file": artwork.artwork_file,
+            }
+
+            path = os.path.join(upload_folder, artwork.artwork_file)
+            if not os.path.isfile(path):
+                logger.warning(f"Artwork file missing from archive: {artwork.artwork_file}")
+                manifest_writer.writerow({**entry, "path": "", "size": "", "status": "missing"})
+                continue
+
+            created = submission.created_at.timetuple()[:6] if submission.created_at else exported_at
+            info = zipfile.ZipInfo(entry["path"], date_time=max(created, ZIP_EPOCH))
+            info.compress_type = zipfile.ZIP_STORED
+            info.file_size = os.path.getsize(path)  # Lets zipfile decide on ZIP64 headers up front
+            with open(path, "rb") as source, archive.open(info, "w") as target:
+                for chunk in iter(lambda: source.read(ARCHIVE_CHUNK_SIZE), b""):
+                    target.write(chunk)
+                    yield sink.drain()
+            manifest_writer.writerow({**entry, "size": info.file_size, "status": "ok"})
+            yield sink.drain()
+
+        archive.writestr("manifest.csv", manifest.getvalue())
+    # Closing the archive writes the central directory
+    yield sink.drain()
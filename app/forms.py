@@ -4,14 +4,14 @@ from wtforms.validators import Regexp, NumberRange, DataRequired, Email, URL, Op
 from wtforms.fields import DateTimeLocalField
 from flask_wtf.file import FileAllowed
 from urllib.parse import urlparse
+from app.uploads import upload_size
 import re
 
 def file_size_limit(max_size_mb):
     def _file_size_limit(form, field):
         # Check if the field contains a file (FileStorage object)
-        if field.data and hasattr(field.data, "read"):  # Only validate if it's a file object
-            file_size = len(field.data.read())  # Get the file size in bytes
-            field.data.seek(0)  # Reset file pointer after reading
+        if field.data and hasattr(field.data, "stream"):  # Only validate if it's a file object
+            file_size = upload_size(field.data)  # Measured by seeking, the file is not read into memory
             max_size_bytes = max_size_mb * 1024 * 1024  # Convert MB to bytes
             if file_size > max_size_bytes:
                 raise ValidationError(f"File size must not exceed {max_size_mb} MB.")
@@ -0,0 +1,108 @@
+from flask.cli import AppGroup
+from sqlalchemy import select, text
+from app.models import ArtistSubmission, BadgeArtwork, JudgeVote, YouthArtistSubmission, db
+
+import click
+import logging
+
+logger = logging.getLogger(__name__)
+
+# (description, statement, index names any of which satisfies the check)
+HOT_QUERIES = [
+    (
+        "Ballot: a judge's adult ranks",
+        select(JudgeVote.submission_id, JudgeVote.rank)
+        .where(JudgeVote.user_id == 1, JudgeVote.submission_id.isnot(None))
+        .order_by(JudgeVote.rank),
+        ("ix_judge_vote_user_submission_rank",),
+    ),
+    (
+        "Ballot: a judge's youth ranks",
+        select(JudgeVote.youth_submission_id, JudgeVote.rank)
+        .where(JudgeVote.user_id == 1, JudgeVote.youth_submission_id.isnot(None))
+        .order_by(JudgeVote.rank),
+        ("ix_judge_vote_user_youth_submission_rank",),
+    ),
+    (
+        "Ballot moves: ranks within a range",
+        select(JudgeVote.submission_id, JudgeVote.badge_artwork_id, JudgeVote.rank)
+        .where(JudgeVote.user_id == 1, JudgeVote.submission_id.isnot(None), JudgeVote.rank.between(3, 9)),
+        ("ix_judge_vote_user_submission_rank",),
+    ),
+    (
+        "Votes: one judge's vote for an artwork",
+        select(JudgeVote.id).where(JudgeVote.user_id == 1, JudgeVote.badge_artwork_id == 1),
+        ("ix_judge_vote_user_artwork",),
+    ),
+    (
+        "Results: every judge's rank for an artwork",
+        select(JudgeVote.user_id, JudgeVote.rank).where(JudgeVote.badge_artwork_id == 1).order_by(JudgeVote.rank),
+        ("ix_judge_vote_artwork_rank",),
+    ),
+    (
+        "Artwork detail: an adult submission's artworks",
+        select(BadgeArtwork.id, BadgeArtwork.artwork_file).where(BadgeArtwork.submission_id == 1),
+        ("unique_submission_badge", "sqlite_autoindex_badge_artwork"),
+    ),
+    (
+        "Artwork detail: a youth submission's artworks",
+        select(BadgeArtwork.id, BadgeArtwork.artwork_file).where(BadgeArtwork.youth_submission_id == 1),
+        ("ix_badge_artwork_youth_submission_id",),
+    ),
+    (
+        "Archive: artworks for a badge",
+        select(BadgeArtwork.id).where(BadgeArtwork.badge_id == 1),
+        ("ix_badge_artwork_badge_id",),
+    ),
+    (
+        "Export: adult submissions oldest first",
+        select(ArtistSubmission.id).order_by(ArtistSubmission.created_at, ArtistSubmission.id).limit(200),
+        ("ix_artist_submission_created_at",),
+    ),
+    (
+        "Export: youth submissions oldest first",
+        select(YouthArtistSubmission.id).order_by(YouthArtistSubmission.created_at, YouthArtistSubmission.id).limit(200),
+        ("ix_youth_artist_submission_created_at",),
+    ),
+]
+
+
+def explain(connection, statement):
+    """Return the query plan for ``statement`` as one string."""
+    sql = str(statement.compile(dialect=connection.dialect, compile_kwargs={"literal_binds": True}))
+    if connection.dialect.name == "sqlite":
+        rows = connection.execute(text(f"EXPLAIN QUERY PLAN {sql}")).all()
+        return "\n".join(row[-1] for row in rows)
+    rows = connection.execute(text(f"EXPLAIN {sql}")).all()
+    return "\n".join(row[0] for row in rows)
+
+
+def check_query_plans():
+    """Yield (description, uses an expected index, plan) for every hot query."""
+    with db.engine.connect() as connection:
+        with connection.begin() as transaction:
+            if connection.dialect.name == "postgresql":
+                # Small or empty tables make sequential scans cheapest; check that the indexes can serve each query
+                connection.execute(text("SET LOCAL enable_seqscan = off"))
+            for description, statement, index_names in HOT_QUERIES:
+                plan = explain(connection, statement)
+                yield description, any(name in plan for name in index_names), plan
+            transaction.rollback()
+
+
+indexes_cli = AppGroup("indexes", help="Inspect the database indexes.")
+
+
+@indexes_cli.command("check")
+@click.option("--verbose", is_flag=True, help="Print every query plan, not only failing ones.")
+def check_command(verbose):
+    """EXPLAIN the hot ballot, results and export queries and check each uses its index."""
+    failures = 0
+    for description, ok, plan in check_query_plans():
+        click.echo(f"{'ok  ' if ok else 'FAIL'} {description}")
+        if verbose or not ok:
+            click.echo("     " + plan.replace("\n", "\n     "))
+        failures += not ok
+    if failures:
+        raise click.ClickException(f"{failures} of {len(HOT_QUERIES)} queries do not use their index. Run 'flask db upgrade'.")
+    click.echo(f"All {len(HOT_QUERIES)} queries use their indexes.")
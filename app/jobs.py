@@ -0,0 +1,193 @@
+from flask import current_app
+from sqlalchemy import update, or_, and_
+from datetime import datetime, timedelta
+from app.models import Job, db
+
+import os
+import json
+import time
+import click
+import random
+import signal
+import socket
+import logging
+import traceback
+import multiprocessing
+
+logger = logging.getLogger(__name__)
+
+JOB_HANDLERS = {}
+
+CLAIM_BATCH_SIZE = 10  # Candidate jobs fetched per claim attempt
+BACKOFF_BASE_SECONDS = 10
+BACKOFF_MAX_SECONDS = 3600
+
+
+def job_handler(kind):
+    """Register a function as the handler for jobs of the given kind."""
+    def decorator(func):
+        JOB_HANDLERS[kind] = func
+        return func
+    return decorator
+
+
+def enqueue(kind, payload=None, delay=0, max_attempts=None):
+    """
+    Add a job to the current session. It is committed together with the
+    caller's own changes, so work is only queued if the request succeeds.
+    With JOBS_EAGER set the handler runs immediately instead (local development).
+    """
+    if kind not in JOB_HANDLERS:
+        raise ValueError(f"No job handler registered for '{kind}'")
+    payload = payload or {}
+
+    if current_app.config.get("JOBS_EAGER"):
+        JOB_HANDLERS[kind](**payload)
+        return None
+
+    job = Job(
+        kind=kind,
+        payload=json.dumps(payload),
+        run_at=datetime.utcnow() + timedelta(seconds=delay),
+        max_attempts=max_attempts or current_app.config.get("JOBS_MAX_ATTEMPTS", 5),
+    )
+    db.session.add(job)
+    return job
+
+
+def backoff_seconds(attempts):
+    """Exponential backoff with jitter for the given number of failed attempts."""
+    delay = min(BACKOFF_BASE_SECONDS * 2 ** max(attempts - 1, 0), BACKOFF_MAX_SECONDS)
+    return delay * random.uniform(0.8, 1.2)
+
+
+def claim_job(worker_id, visibility_timeout):
+    """
+    Claim the next runnable job for this worker, or return None.
+
+    A job is runnable when it is queued and due, or when it is running but its
+    visibility timeout expired (its worker died). Claims are compare-and-set
+    updates, so concurrent workers on Postgres or SQLite never run the same job
+    twice; Postgres additionally skips rows other workers are claiming.
+    """
+    now = datetime.utcnow()
+    runnable = or_(
+        and_(Job.status == "queued", Job.run_at <= now),
+        and_(Job.status == "running", Job.locked_until < now),
+    )
+    query = db.session.query(Job.id).filter(runnable).order_by(Job.run_at).limit(CLAIM_BATCH_SIZE)
+    if db.engine.dialect.name == "postgresql":
+        query = query.with_for_update(skip_locked=True)
+    candidate_ids = [job_id for (job_id,) in query.all()]
+
+    for job_id in candidate_ids:
+        result = db.session.execute(
+            update(Job)
+            .where(Job.id == job_id, runnable)
+            .values(
+                status="running",
+                attempts=Job.attempts + 1,
+                locked_by=worker_id,
+                locked_until=now + timedelta(seconds=visibility_timeout),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount == 1:
+            db.session.commit()
+            return db.session.get(Job, job_id, populate_existing=True)
+    db.session.commit()
+    return None
+
+
+def _finish(job, worker_id, **values):
+    """Record the outcome of a job, but only if this worker still holds its claim."""
+    result = db.session.execute(
+        update(Job)
+        .where(Job.id == job.id, Job.locked_by == worker_id, Job.status == "running")
+        .values(locked_until=None, **values)
+        .execution_options(synchronize_session=False)
+    )
+    db.session.commit()
+    if result.rowcount == 0:
+        logger.warning(f"Job {job.id} was reclaimed by another worker before {worker_id} finished it.")
+
+
+def run_job(job, worker_id):
+    """Execute a claimed job and record success, a retry with backoff, or failure."""
+    handler = JOB_HANDLERS.get(job.kind)
+    try:
+        if handler is None:
+            raise LookupError(f"No job handler registered for '{job.kind}'")
+        handler(**json.loads(job.payload or "{}"))
+    except Exception as e:
+        db.session.rollback()
+        error = "".join(traceback.format_exception(e))
+        if job.attempts >= job.max_attempts:
+            logger.error(f"Job {job.id} ({job.kind}) failed permanently after {job.attempts} attempts: {e}")
+            _finish(job, worker_id, status="failed", last_error=error, finished_at=datetime.utcnow())
+        else:
+            delay = backoff_seconds(job.attempts)
+            logger.warning(f"Job {job.id} ({job.kind}) failed on attempt {job.attempts}, retrying in {delay:.0f}s: {e}")
+            _finish(job, worker_id, status="queued", last_error=error,
+                    run_at=datetime.utcnow() + timedelta(seconds=delay))
+        return False
+
+    _finish(job, worker_id, status="done", finished_at=datetime.utcnow())
+    logger.debug(f"Job {job.id} ({job.kind}) done.")
+    return True
+
+
+def work(worker_id, poll_interval=1.0, visibility_timeout=300, burst=False, should_stop=lambda: False):
+    """Claim and run jobs until stopped (or, in burst mode, until the queue is empty)."""
+    logger.info(f"Worker {worker_id} started.")
+    while not should_stop():
+        job = claim_job(worker_id, visibility_timeout)
+        if job is None:
+            if burst:
+                break
+            time.sleep(poll_interval)
+            continue
+        run_job(job, worker_id)
+    logger.info(f"Worker {worker_id} stopped.")
+
+
+def _worker_process(index, poll_interval, visibility_timeout, burst):
+    """Entry point of a worker process: build its own app and engine, then work."""
+    from app import create_app
+
+    stopping = []
+    signal.signal(signal.SIGTERM, lambda signum, frame: stopping.append(signum))
+    signal.signal(signal.SIGINT, lambda signum, frame: stopping.append(signum))
+
+    app = create_app()
+    worker_id = f"{socket.gethostname()}:{os.getpid()}:{index}"
+    with app.app_context():
+        work(worker_id, poll_interval, visibility_timeout, burst, should_stop=lambda: bool(stopping))
+
+
+@click.command("worker")
+@click.option("--processes", "-n", default=1, show_default=True, help="Number of worker processes.")
+@click.option("--poll-interval", default=1.0, show_default=True, help="Seconds to sleep when the queue is empty.")
+@click.option("--visibility-timeout", default=300, show_default=True,
+              help="Seconds a claimed job stays hidden from other workers before it is retried.")
+@click.option("--burst", is_flag=True, help="Exit once the queue is empty.")
+def worker_command(processes, poll_interval, visibility_timeout, burst):
+    """Run background job workers."""
+    context = multiprocessing.get_context("spawn")  # Fresh interpreter: no inherited DB connections
+    children = [
+        context.Process(target=_worker_process, args=(index, poll_interval, visibility_timeout, burst))
+        for index in range(processes)
+    ]
+    for child in children:
+        child.start()
+    click.echo(f"Started {processes} worker process(es).")
+
+    def _forward(signum, frame):
+        for child in children:
+            if child.is_alive():
+                os.kill(child.pid, signal.SIGTERM)
+
+    signal.signal(signal.SIGTERM, _forward)
+    signal.signal(signal.SIGINT, _forward)
+    for child in children:
+        child.join()
@@ -3,18 +3,28 @@ from flask_wtf.csrf import generate_csrf, validate_csrf, CSRFError
 from flask_login import login_required, current_user
 from app.auth import judges
 from app.admin import is_submission_open
-from app.models import ArtistSubmission, YouthArtistSubmission, User, JudgeVote, Badge, BadgeArtwork, SubmissionPeriod, db
+from app.models import ArtistSubmission, YouthArtistSubmission, User, JudgeVote, JudgeBallot, Badge, BadgeArtwork, SubmissionPeriod, db
 from app.forms import ArtistSubmissionForm, RankingForm, YouthArtistSubmissionForm, LogoutForm
 from werkzeug.security import generate_password_hash, check_password_hash
 from datetime import datetime, timezone, timedelta
 from zoneinfo import ZoneInfo
 from urllib.parse import urlparse
-from app.utils import custom_url_for as url_for
+from app.utils import custom_url_for as url_for, QueryCounter
+from app.uploads import save_artwork_upload, UploadError
+from app.derivatives import read_image_size, schedule_derivatives, artwork_image
+from app.storage import is_blob_referenced, is_in_flight
+from app.cache import get_submission_window, get_badge_catalog
+from app.tallies import apply_tally_deltas, vote_deltas
+from app.metrics import RANKING_SAVES, SUBMISSIONS_CREATED
+from app.database import read_replica
 from functools import wraps
-from sqlalchemy import or_
+from collections import defaultdict, namedtuple
+from sqlalchemy import or_, func, insert, update, case
+from werkzeug.exceptions import RequestEntityTooLarge
 
 import os
-import uuid
+import hmac
+import hashlib
 import logging
 import traceback
 
@@ -22,6 +32,12 @@ logger = logging.getLogger(__name__)
 
 main_bp = Blueprint('main', __name__)
 
+MAX_ARTWORK_SIZE_MB = 8  # Matches the file_size_limit(8) validators on the submission forms
+VOTE_INSERT_CHUNK_SIZE = 500  # Rows per multi-row INSERT; keeps bound parameters under driver limits
+MAX_BALLOT_MOVES = 100  # Moves accepted in one incremental autosave
+BALLOT_PAGE_SIZE = 50  # Ballot entries per page of /judges/ballot/entries
+MAX_BALLOT_PAGE_SIZE = 200
+
 
 def csrf_exempt_route(f):
     @wraps(f)
@@ -69,6 +85,12 @@ def delete_cached_image():
         logger.warning(f"File not found: {absolute_file_path}")
         return jsonify({'success': False, 'message': 'File does not exist.'}), 404
 
+    # Stored files are shared by identical uploads; never delete one a submission uses or may be saving.
+    # Kept files are removed by `flask artwork gc` once nothing references them.
+    if is_blob_referenced(os.path.basename(absolute_file_path)) or is_in_flight(absolute_file_path):
+        logger.info(f"Kept cached image that is referenced or recently uploaded: {absolute_file_path}")
+        return jsonify({'success': True, 'message': 'File is in use and was kept.'}), 200
+
     try:
         os.remove(absolute_file_path)
         logger.info(f"Deleted cached image: {absolute_file_path}")
@@ -79,8 +101,9 @@ def delete_cached_image():
         return jsonify({'success': False, 'message': 'Failed to delete the file.'}), 500
 
 @main_bp.route("/")
+@read_replica
 def index():
-    submission_period = SubmissionPeriod.query.order_by(SubmissionPeriod.id.desc()).first()
+    submission_period = get_submission_window()
     submission_open = is_submission_open()
     submission_status = "Open" if submission_open else "Closed"
     if submission_period:
@@ -91,7 +114,7 @@ def index():
         submission_start = "N/A"
         submission_deadline = "N/A"
 
-    badges = Badge.query.all()
+    badges = get_badge_catalog().badges
 
     return render_template(
         "index.html",
@@ -115,56 +138,190 @@ def get_rank_suffix(rank):
     return "th"
 
 
+def resolve_ranked_artworks(ranked_ids, form_type):
+    """
+    Map each ranked submission ID to the BadgeArtwork its vote is recorded against,
+    using one IN query. Raises ValueError for malformed, repeated or unknown IDs.
+    """
+    try:
+        submission_ids = [int(sub_id) for sub_id in ranked_ids]
+    except (TypeError, ValueError):
+        raise ValueError(f"Ranked IDs must be integers: {ranked_ids!r}")
+    if len(set(submission_ids)) != len(submission_ids):
+        raise ValueError("Ranked IDs contain duplicates.")
+    if not submission_ids:
+        return []
+
+    column = BadgeArtwork.youth_submission_id if form_type == "youth_ranking_form" else BadgeArtwork.submission_id
+    # A BadgeArtwork row implies its submission exists; the lowest id is the submission's first artwork
+    artwork_ids = dict(
+        db.session.query(column, func.min(BadgeArtwork.id))
+        .filter(column.in_(submission_ids))
+        .group_by(column)
+        .all()
+    )
+    missing = [sub_id for sub_id in submission_ids if sub_id not in artwork_ids]
+    if missing:
+        kind = "YOUTH" if form_type == "youth_ranking_form" else "ADULT"
+        raise ValueError(f"No BadgeArtwork found for {kind} submissions {missing}")
+    return [(sub_id, artwork_ids[sub_id]) for sub_id in submission_ids]
+
+
+class BallotConflict(Exception):
+    """The client's copy of a ballot no longer matches the stored one; it must resend the full order."""
+
+
+def ballot_kind(form_type):
+    return "youth" if form_type == "youth_ranking_form" else "adult"
+
+
+def bump_ballot_version(user_id, kind):
+    """Advance a ballot's version after a full save and return the new value."""
+    ballot = JudgeBallot.query.filter_by(user_id=user_id, kind=kind).first()
+    if ballot is None:
+        ballot = JudgeBallot(user_id=user_id, kind=kind, version=1)
+        db.session.add(ballot)
+    else:
+        ballot.version = JudgeBallot.version + 1
+        ballot.updated_at = datetime.utcnow()
+    db.session.flush()
+    return ballot.version
+
+
 def save_rankings_for_user(user_id, ranked_ids, form_type):
-    rank = 1
+    """
+    Replace the user's votes of one ballot (adult or youth) with the given order
+    in a constant number of queries, updating the artwork tallies in the same
+    transaction. Returns the new ballot version.
+    """
+    youth = form_type == "youth_ranking_form"
+    with QueryCounter(db.engine) as queries:
+        with db.session.begin_nested():
+            # Delete only the votes for the given submission type.
+            if youth:
+                previous_votes = db.session.query(JudgeVote).filter_by(user_id=user_id, submission_id=None)
+            else:  # Assume "ranking_form" for adult submissions.
+                previous_votes = db.session.query(JudgeVote).filter_by(user_id=user_id, youth_submission_id=None)
+            removed = previous_votes.with_entities(JudgeVote.badge_artwork_id, JudgeVote.rank).all()
+            previous_votes.delete()
+
+            rows = [
+                {
+                    "user_id": user_id,
+                    "submission_id": None if youth else sub_id,
+                    "youth_submission_id": sub_id if youth else None,
+                    "badge_artwork_id": artwork_id,
+                    "rank": rank,
+                }
+                for rank, (sub_id, artwork_id) in enumerate(resolve_ranked_artworks(ranked_ids, form_type), start=1)
+            ]
+            for start in range(0, len(rows), VOTE_INSERT_CHUNK_SIZE):
+                db.session.execute(insert(JudgeVote).values(rows[start:start + VOTE_INSERT_CHUNK_SIZE]))
+            apply_tally_deltas(vote_deltas(
+                removed=removed, added=[(row["badge_artwork_id"], row["rank"]) for row in rows]
+            ))
+            version = bump_ballot_version(user_id, ballot_kind(form_type))
+        db.session.commit()
+    RANKING_SAVES.labels(kind=ballot_kind(form_type), mode="full").inc()
+    logger.info(f"Saved {len(rows)} {'youth' if youth else 'adult'} rankings for user {user_id} in {queries.count} queries.")
+    return version
+
+
+def parse_ballot_moves(moves):
+    """Validate a list of {"id", "from", "to"} moves (0-based positions) into (id, from, to) tuples."""
+    if not isinstance(moves, list) or not moves or len(moves) > MAX_BALLOT_MOVES:
+        raise ValueError(f"Expected between 1 and {MAX_BALLOT_MOVES} moves.")
+    parsed = []
+    for move in moves:
+        try:
+            sub_id, old_index, new_index = int(move["id"]), int(move["from"]), int(move["to"])
+        except (TypeError, KeyError, ValueError):
+            raise ValueError(f"Malformed move: {move!r}")
+        if old_index < 0 or new_index < 0:
+            raise ValueError(f"Move positions must not be negative: {move!r}")
+        parsed.append((sub_id, old_index, new_index))
+    return parsed
+
+
+def apply_ballot_moves(user_id, form_type, version, moves):
+    """
+    Apply drag-and-drop moves to a stored ballot, renumbering only the ranks
+    between each move's old and new position, and shift the tallies of the
+    same artworks. The ballot version is advanced
+    with a compare-and-set, so a stale client (another tab, a missed save, a
+    deleted submission) gets a BallotConflict instead of corrupting the order.
+    Returns the new ballot version.
+    """
+    kind = ballot_kind(form_type)
+    column = JudgeVote.youth_submission_id if kind == "youth" else JudgeVote.submission_id
+    in_ballot = (JudgeVote.user_id == user_id, column.isnot(None))
+
     with db.session.begin_nested():
-        # Delete only the votes for the given submission type.
-        if form_type == "youth_ranking_form":
-            db.session.query(JudgeVote).filter_by(user_id=user_id, submission_id=None).delete()
-        else:  # Assume "ranking_form" for adult submissions.
-            db.session.query(JudgeVote).filter_by(user_id=user_id, youth_submission_id=None).delete()
-
-        for sub_id in ranked_ids:
-            # 1) Check if sub_id is an adult submission.
-            adult_sub = ArtistSubmission.query.get(sub_id)
-            if adult_sub is not None:
-                # It's an adult submission.
-                artwork = BadgeArtwork.query.filter_by(submission_id=sub_id).first()
-                if not artwork:
-                    raise ValueError(f"No BadgeArtwork found for ADULT submission {sub_id}")
-                vote = JudgeVote(
-                    user_id=user_id,
-                    submission_id=sub_id,
-                    youth_submission_id=None,
-                    badge_artwork_id=artwork.id,
-                    rank=rank
-                )
-            else:
-                # 2) Otherwise, check if sub_id is a youth submission.
-                youth_sub = YouthArtistSubmission.query.get(sub_id)
-                if youth_sub is not None:
-                    artwork = BadgeArtwork.query.filter_by(youth_submission_id=sub_id).first()
-                    if not artwork:
-                        raise ValueError(f"No BadgeArtwork found for YOUTH submission {sub_id}")
-                    vote = JudgeVote(
-                        user_id=user_id,
-                        submission_id=None,
-                        youth_submission_id=sub_id,
-                        badge_artwork_id=artwork.id,
-                        rank=rank
-                    )
-                else:
-                    # 3) Not found in either table.
-                    raise ValueError(f"Submission ID {sub_id} not found in adult or youth tables!")
-            db.session.add(vote)
-            rank += 1
+        claimed = db.session.execute(
+            update(JudgeBallot)
+            .where(JudgeBallot.user_id == user_id, JudgeBallot.kind == kind, JudgeBallot.version == version)
+            .values(version=JudgeBallot.version + 1, updated_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        )
+        if claimed.rowcount != 1:
+            raise BallotConflict(f"{kind.capitalize()} ballot of user {user_id} is not at version {version}.")
+
+        score_deltas = defaultdict(int)
+        for sub_id, old_index, new_index in moves:
+            old_rank, new_rank = old_index + 1, new_index + 1
+            low, high, shift = (old_rank, new_rank, -1) if new_rank > old_rank else (new_rank, old_rank, 1)
+            in_range = db.session.query(column, JudgeVote.badge_artwork_id, JudgeVote.rank).filter(
+                *in_ballot, JudgeVote.rank.between(low, high)
+            ).all()
+            current_rank = next((rank for (vote_sub_id, _, rank) in in_range if vote_sub_id == sub_id), None)
+            if current_rank != old_rank:
+                raise BallotConflict(f"Submission {sub_id} is not ranked {old_rank}.")
+            # Ranks are dense after a full save; a gap means a vote was removed since
+            if len(in_range) != high - low + 1:
+                raise BallotConflict(f"Ranks {low}-{high} of user {user_id} are not contiguous.")
+            if old_rank == new_rank:
+                continue
+            db.session.execute(
+                update(JudgeVote)
+                .where(*in_ballot, JudgeVote.rank.between(low, high))
+                .values(rank=case((column == sub_id, new_rank), else_=JudgeVote.rank + shift))
+                .execution_options(synchronize_session=False)
+            )
+            for vote_sub_id, artwork_id, _ in in_range:
+                score_deltas[artwork_id] += new_rank - old_rank if vote_sub_id == sub_id else shift
+        apply_tally_deltas({artwork_id: (delta, 0) for artwork_id, delta in score_deltas.items() if delta})
     db.session.commit()
+    RANKING_SAVES.labels(kind=kind, mode="moves").inc()
+    return version + 1
+
+
+@main_bp.route("/judges/ballot/moves", methods=["POST"])
+@login_required
+def judges_ballot_moves():
+    """Incremental autosave: apply moves to the judge's ballot, or ask the client to resend it in full."""
+    data = request.get_json(silent=True) or {}
+    try:
+        version = int(data.get("version", 0))
+        moves = parse_ballot_moves(data.get("moves"))
+    except (TypeError, ValueError) as e:
+        return jsonify({"error": str(e)}), 400
+
+    try:
+        new_version = apply_ballot_moves(current_user.id, data.get("form_name"), version, moves)
+    except BallotConflict as e:
+        db.session.rollback()
+        logger.info(f"Ballot resync requested: {e}")
+        return jsonify({"error": "Ballot is out of date.", "resync": True}), 409
+    except Exception:
+        db.session.rollback()
+        logger.error("An error occurred while applying ballot moves.", exc_info=True)
+        return jsonify({"error": "An error occurred"}), 500
+    return jsonify({"success": True, "version": new_version}), 200
 
 
 @main_bp.route("/judges/ballot", methods=["GET", "POST"])
 @login_required
 def judges_ballot():
-    import random  # Import at the top of the function if not already imported elsewhere
     logger = logging.getLogger(__name__)
     logger.setLevel(logging.DEBUG)
 
@@ -179,8 +336,9 @@ def judges_ballot():
     rank_form = RankingForm()
     user_id = current_user.id
 
-    prepared_artist_submissions = []
-    prepared_youth_submissions = []
+    # Shuffled orders used to be kept in the (cookie) session; drop any left over
+    session.pop("random_artist_order", None)
+    session.pop("random_youth_order", None)
 
     # Handle POST requests (e.g., ranking submissions)
     if request.method == "POST":
@@ -202,10 +360,14 @@ def judges_ballot():
                 logger.debug(f"Parsed ranked IDs: {ranked_ids}")
 
                 # Save rankings to the database for the current user
-                save_rankings_for_user(user_id, ranked_ids, form_name)
+                version = save_rankings_for_user(user_id, ranked_ids, form_name)
 
                 flash("Rankings submitted successfully!", "success")
-                return jsonify({"success": True}), 200
+                return jsonify({"success": True, "version": version}), 200
+            except ValueError as e:
+                db.session.rollback()
+                logger.warning(f"Rejected rankings from user {user_id}: {e}")
+                return jsonify({"error": str(e)}), 400
             except Exception as e:
                 logger.error("An error occurred during the transaction.", exc_info=True)
                 flash("An error occurred while saving rankings. Please try again.", "danger")
@@ -214,113 +376,185 @@ def judges_ballot():
             logger.warning("Form validation failed.")
             flash("Form validation failed. Please try again.", "danger")
 
-    # Retrieve saved votes for artist submissions
-    logger.debug(f"Retrieving saved votes for user_id: {user_id}")
-    saved_votes = db.session.query(JudgeVote).filter_by(user_id=user_id).order_by(JudgeVote.rank).all()
-    logger.debug(f"Saved votes retrieved: {saved_votes}")
-    ranked_submission_ids = [vote.submission_id for vote in saved_votes]
-
-    # Retrieve artist submissions
-    logger.debug("Retrieving artist submissions.")
-    artist_submissions = db.session.query(
-        ArtistSubmission.id,
-        ArtistSubmission.name,
-        ArtistSubmission.email,
-        ArtistSubmission.artist_bio,
-        ArtistSubmission.portfolio_link,
-        ArtistSubmission.statement,
-        BadgeArtwork.artwork_file.label("artwork_file"),
-        Badge.id.label("badge_id"),
-        Badge.name.label("badge_name"),
-    ).join(
-        BadgeArtwork, BadgeArtwork.submission_id == ArtistSubmission.id
-    ).join(
-        Badge, BadgeArtwork.badge_id == Badge.id
-    ).distinct().all()
-    logger.debug(f"Artist submissions retrieved: {len(artist_submissions)}")
-
-    # Prepare artist submissions ordering based on saved votes (if any)
-    if saved_votes:
-        logger.debug("Sorting submissions based on saved votes.")
-        ranked_submissions = [s for s in artist_submissions if s.id in ranked_submission_ids]
-        ranked_submissions.sort(key=lambda s: ranked_submission_ids.index(s.id))
-        unranked_submissions = [s for s in artist_submissions if s.id not in ranked_submission_ids]
-        prepared_artist_submissions = ranked_submissions + unranked_submissions
-    else:
-        logger.debug("No saved votes. Preparing random order for submissions.")
-        if "random_artist_order" not in session:
-            # Initialize random_order with the current artist submission IDs
-            current_ids = [s.id for s in artist_submissions]
-            random_order = current_ids[:]  # make a copy of the list
-            random.shuffle(random_order)
-            session["random_artist_order"] = random_order
-        else:
-            random_order = session["random_artist_order"]
+    # Entries are loaded page by page from judges_ballot_entries
+    return render_template(
+        "judges_ballot.html",
+        rank_form=rank_form,
+        logout_form=logout_form
+    )
+
+
+# Ballot type as sent by the page -> (JudgeBallot kind, BadgeArtwork column, JudgeVote column)
+BALLOT_TYPES = {
+    "artist": ("adult", BadgeArtwork.submission_id, JudgeVote.submission_id),
+    "youth": ("youth", BadgeArtwork.youth_submission_id, JudgeVote.youth_submission_id),
+}
+
+
+def shuffle_sort_key(user_id, ballot_type):
+    """
+    Sort key giving each judge their own fixed random order of unranked submissions.
+    Every submission's position comes from an HMAC of (contest, judge, ballot type,
+    submission ID) under SECRET_KEY, so the order is the same on every request and
+    worker, new submissions slot in without reordering the rest, and judges cannot
+    predict each other's order. Nothing is stored per judge.
+    """
+    window = get_submission_window()
+    contest_key = f"period-{window.id}" if window else "no-period"
+    secret = current_app.config["SECRET_KEY"].encode("utf-8")
+    prefix = f"{contest_key}:{user_id}:{ballot_type}:"
+
+    def sort_key(sub_id):
+        return hmac.new(secret, f"{prefix}{sub_id}".encode("utf-8"), hashlib.sha256).digest()
+    return sort_key
+
+
+# Order of one ballot as computed from ``state``; set_digests[i] fingerprints the set of ids[:i]
+BallotOrder = namedtuple("BallotOrder", ["state", "ids", "set_digests", "version"])
+
+_ballot_orders = {}  # (user_id, ballot_type) -> this worker's latest BallotOrder
+
+
+def ballot_state(user_id, ballot_type):
+    """
+    Everything a ballot's order depends on, read with two small queries: the
+    judge's JudgeBallot row (every save and move bumps it, clearing votes deletes
+    it), the artwork count and highest id (submissions are only added or
+    deleted), and the contest the shuffle is keyed on.
+    """
+    kind, artwork_column, _ = BALLOT_TYPES[ballot_type]
+    ballot = (
+        db.session.query(JudgeBallot.id, JudgeBallot.version, JudgeBallot.updated_at)
+        .filter_by(user_id=user_id, kind=kind)
+        .first()
+    )
+    artworks = (
+        db.session.query(func.count(BadgeArtwork.id), func.max(BadgeArtwork.id))
+        .filter(artwork_column.isnot(None))
+        .one()
+    )
+    window = get_submission_window()
+    return tuple(ballot) if ballot else None, tuple(artworks), window.id if window else None
+
+
+def _id_digest(sub_id):
+    return int.from_bytes(hashlib.blake2b(str(sub_id).encode("utf-8"), digest_size=8).digest(), "big")
 
-        prepared_artist_submissions = sorted(
-            artist_submissions, key=lambda s: random_order.index(s.id) if s.id in random_order else float('inf')
-        )
 
-    # Retrieve youth submissions
-    logger.debug("Retrieving youth submissions.")
-    youth_submissions = db.session.query(
-        YouthArtistSubmission.id,
-        YouthArtistSubmission.name,
-        YouthArtistSubmission.age,
-        YouthArtistSubmission.email,
-        YouthArtistSubmission.about_why_design,
-        YouthArtistSubmission.about_yourself,
-        BadgeArtwork.artwork_file.label("artwork_file"),
-        Badge.id.label("badge_id"),
+def _compute_ballot_order(user_id, ballot_type, state):
+    kind, artwork_column, vote_column = BALLOT_TYPES[ballot_type]
+    submission_ids = [
+        sub_id for (sub_id,) in
+        db.session.query(artwork_column).filter(artwork_column.isnot(None)).distinct().order_by(artwork_column)
+    ]
+    rank_positions = dict(
+        db.session.query(vote_column, JudgeVote.rank)
+        .filter(JudgeVote.user_id == user_id, vote_column.isnot(None))
+        .all()
+    )
+    shuffled = shuffle_sort_key(user_id, ballot_type)
+    ordered_ids = sorted(
+        submission_ids,
+        key=lambda sub_id: (0, rank_positions[sub_id]) if sub_id in rank_positions else (1, shuffled(sub_id))
+    )
+
+    # Order-independent running sums, so a prefix keeps its digest while the judge reorders it
+    set_digests = [0]
+    for sub_id in ordered_ids:
+        set_digests.append((set_digests[-1] + _id_digest(sub_id)) % 2 ** 64)
+
+    ballot = state[0]
+    complete = len(rank_positions) == len(submission_ids) and all(sub_id in rank_positions for sub_id in submission_ids)
+    return BallotOrder(state=state, ids=ordered_ids, set_digests=set_digests,
+                       version=ballot[1] if ballot and complete else 0)
+
+
+def ballot_order(user_id, ballot_type):
+    """
+    Return the BallotOrder of one of the user's ballots: ranked submissions by
+    rank, then the rest in the judge's fixed shuffled order. The order is sorted
+    once per ballot state and reused for every page until a save, a move or a
+    submission change alters the state, so a page costs the state queries and
+    a slice. The version is 0 unless the stored ranks cover exactly the
+    submissions shown.
+    """
+    key = (user_id, ballot_type)
+    state = ballot_state(user_id, ballot_type)
+    order = _ballot_orders.get(key)
+    if order is None or order.state != state:
+        order = _ballot_orders[key] = _compute_ballot_order(user_id, ballot_type, state)
+    return order
+
+
+def ballot_cards(ballot_type, submission_ids):
+    """Card fields for the given submissions, in the order given, with one query."""
+    artwork_column = BALLOT_TYPES[ballot_type][1]
+    model = ArtistSubmission if ballot_type == "artist" else YouthArtistSubmission
+    rows = db.session.query(
+        artwork_column.label("submission_id"),
+        model.name,
+        BadgeArtwork.artwork_file,
+        BadgeArtwork.width,
+        BadgeArtwork.height,
         Badge.name.label("badge_name"),
     ).join(
-        BadgeArtwork, BadgeArtwork.youth_submission_id == YouthArtistSubmission.id
+        model, model.id == artwork_column
     ).join(
         Badge, BadgeArtwork.badge_id == Badge.id
-    ).distinct().all()
-    logger.debug(f"Youth submissions retrieved: {len(youth_submissions)}")
-
-    # Retrieve saved votes for youth submissions and prepare them
-    saved_youth_votes = db.session.query(JudgeVote).filter(
-        JudgeVote.user_id == user_id,
-        JudgeVote.youth_submission_id.isnot(None)
-    ).order_by(JudgeVote.rank).all()
-    ranked_youth_submission_ids = [vote.youth_submission_id for vote in saved_youth_votes]
-
-    if saved_youth_votes:
-        logger.debug("Sorting youth submissions based on saved votes.")
-        ranked_youth_submissions = [s for s in youth_submissions if s.id in ranked_youth_submission_ids]
-        ranked_youth_submissions.sort(key=lambda s: ranked_youth_submission_ids.index(s.id))
-        unranked_youth_submissions = [s for s in youth_submissions if s.id not in ranked_youth_submission_ids]
-        prepared_youth_submissions = ranked_youth_submissions + unranked_youth_submissions
-    else:
-        logger.debug("No saved votes for youth submissions. Preparing random order.")
-        current_youth_ids = [s.id for s in youth_submissions]
-        # Check if stored order exists and matches the current IDs
-        if "random_youth_order" not in session or set(session["random_youth_order"]) != set(current_youth_ids):
-            random_youth_order = current_youth_ids[:]  # initialize with current IDs
-            random.shuffle(random_youth_order)
-            session["random_youth_order"] = random_youth_order
-        else:
-            random_youth_order = session["random_youth_order"]
+    ).filter(artwork_column.in_(submission_ids)).order_by(BadgeArtwork.id).all()
 
-        try:
-            prepared_youth_submissions = sorted(
-                youth_submissions, key=lambda s: random_youth_order.index(s.id)
-            )
-        except ValueError as ve:
-            logger.error("Error sorting youth submissions: %s", ve, exc_info=True)
-            # Fallback: sort by id
-            prepared_youth_submissions = sorted(youth_submissions, key=lambda s: s.id)
+    cards = {}
+    for row in rows:
+        card = cards.setdefault(row.submission_id, {
+            "id": row.submission_id,
+            "type": ballot_type,
+            "name": row.name,
+            "artworks": [],
+        })
+        image = artwork_image(row.artwork_file, row.width, row.height)
+        image["badge_name"] = row.badge_name
+        card["artworks"].append(image)
+    return [cards[sub_id] for sub_id in submission_ids if sub_id in cards]
 
-    # Render the judges ballot template with the prepared submissions
-    return render_template(
-        "judges_ballot.html",
-        artist_submissions=prepared_artist_submissions,
-        youth_submissions=prepared_youth_submissions,
-        rank_form=rank_form,
-        logout_form=logout_form
-    )
+
+def _ballot_cursor(order, offset):
+    """Cursor for the page starting at ``offset``: the offset plus the digest of the set of IDs before it."""
+    return f"{offset}.{order.set_digests[offset]:016x}"
+
+
+@main_bp.route("/judges/ballot/entries", methods=["GET"])
+@login_required
+def judges_ballot_entries():
+    """
+    One page of a judge's ballot as JSON. The cursor names the set of entries
+    the client already holds rather than their order, so it stays valid while
+    the judge reorders loaded entries, and is rejected (409) if a submission
+    was added to or removed from that set in the meantime.
+    """
+    ballot_type = request.args.get("type", "artist")
+    if ballot_type not in BALLOT_TYPES:
+        return jsonify({"error": "Unknown ballot type."}), 400
+    limit = min(max(request.args.get("limit", BALLOT_PAGE_SIZE, type=int), 1), MAX_BALLOT_PAGE_SIZE)
+    cursor = request.args.get("cursor")
+
+    order = ballot_order(current_user.id, ballot_type)
+    start = 0
+    if cursor:
+        try:
+            start = int(cursor.split(".", 1)[0])
+        except ValueError:
+            return jsonify({"error": "Malformed cursor."}), 400
+        if not 0 <= start <= len(order.ids) or _ballot_cursor(order, start) != cursor:
+            return jsonify({"error": "Ballot changed.", "resync": True}), 409
+
+    page_ids = order.ids[start:start + limit]
+    end = start + len(page_ids)
+    return jsonify({
+        "entries": ballot_cards(ballot_type, page_ids),
+        "next_cursor": _ballot_cursor(order, end) if end < len(order.ids) else None,
+        "version": order.version,
+        "total": len(order.ids),
+    })
 
 
 @main_bp.route("/call_for_artists", methods=["GET", "POST"])
@@ -337,7 +571,7 @@ def call_for_artists():
     submission_status = "Open" if submission_open else "Closed"
     logger.debug(f"Submission status: {submission_status}")
 
-    submission_period = SubmissionPeriod.query.order_by(SubmissionPeriod.id.desc()).first()
+    submission_period = get_submission_window()
     if submission_period:
         logger.debug(f"Submission period found: {submission_period}")
         submission_deadline = submission_period.submission_end.strftime("%B %d, %Y at %I:%M %p %Z")
@@ -348,10 +582,11 @@ def call_for_artists():
     form = ArtistSubmissionForm()
     logger.debug("ArtistSubmissionForm initialized.")
 
-    badges = Badge.query.all()
-    logger.debug(f"Retrieved {len(badges)} badges from the database.")
+    badge_catalog = get_badge_catalog()
+    badges = badge_catalog.badges
+    logger.debug(f"Retrieved {len(badges)} badges from the catalog (ETag {badge_catalog.etag}).")
 
-    badge_choices = [(str(badge.id), badge.name) for badge in badges]
+    badge_choices = list(badge_catalog.artist_choices)
     for badge_upload in form.badge_uploads.entries:
         badge_upload.form.badge_id.choices = badge_choices
     logger.debug("Badge choices populated in form.")
@@ -405,11 +640,12 @@ def call_for_artists():
                             is_admin=is_admin
                         )
 
-                # Process the newly uploaded file
+                # Stream the newly uploaded file to disk, enforcing size and type as it is copied
                 if hasattr(artwork_file, "filename"):
-                    file_ext = os.path.splitext(artwork_file.filename)[1].lower()
-                    if file_ext not in ['.jpg', '.jpeg', '.png', '.svg']:
-                        flash("Invalid file extension.", "danger")
+                    try:
+                        unique_filename = save_artwork_upload(artwork_file, max_size_mb=MAX_ARTWORK_SIZE_MB)
+                    except UploadError as e:
+                        flash(str(e), "danger")
                         return render_template(
                             "call_for_artists.html",
                             form=form,
@@ -420,9 +656,7 @@ def call_for_artists():
                             is_admin=is_admin
                         )
 
-                    unique_filename = f"{uuid.uuid4()}{file_ext}"
                     artwork_path = os.path.join(current_app.config["UPLOAD_FOLDER"], unique_filename)
-                    artwork_file.save(artwork_path)
                     logger.debug(f"File saved: {artwork_path}")
                     badge_upload.form.cached_file_path.data = artwork_path  # Update the cached_file_path
 
@@ -464,6 +698,7 @@ def call_for_artists():
             logger.debug(f"Submission added to database: {submission}")
 
             # Save badge artworks
+            new_artwork_files = []
             for badge_upload in form.badge_uploads.entries:
                 badge_id = badge_upload.form.badge_id.data
                 artwork_file = badge_upload.form.artwork_file.data
@@ -482,20 +717,27 @@ def call_for_artists():
                 # Handle artwork file
                 if badge_upload.form.cached_file_path.data:
                     unique_filename = os.path.basename(badge_upload.form.cached_file_path.data)
+                    width, height = read_image_size(badge_upload.form.cached_file_path.data)
                 else:
                     unique_filename = None  # Or handle accordingly
+                    width = height = None
 
                 # Save badge artwork
                 badge_artwork = BadgeArtwork(
                     submission_id=submission.id,
                     badge_id=int(badge_id),
                     instance=new_instance,
-                    artwork_file=unique_filename
+                    artwork_file=unique_filename,
+                    width=width,
+                    height=height
                 )
                 db.session.add(badge_artwork)
+                new_artwork_files.append(unique_filename)
                 logger.debug(f"BadgeArtwork added: {badge_artwork}")
 
+            schedule_derivatives(new_artwork_files)
             db.session.commit()
+            SUBMISSIONS_CREATED.labels(category="adult").inc()
             logger.info("Submission and badge artworks committed to database successfully.")
             flash("Submission received successfully!", "success")
             return redirect(
@@ -537,7 +779,7 @@ def call_for_youth_artists():
     try:
         submission_open = is_submission_open()
         is_admin = getattr(current_user, 'is_admin', False)
-        submission_period = SubmissionPeriod.query.order_by(SubmissionPeriod.id.desc()).first()
+        submission_period = get_submission_window()
 
         submission_start = (
             submission_period.submission_start.strftime("%B %d, %Y at %I:%M %p %Z")
@@ -549,9 +791,9 @@ def call_for_youth_artists():
         )
 
         form = YouthArtistSubmissionForm()
-        badges = Badge.query.all()
-        badge_choices = [(0, "Select a Badge")] + [(badge.id, badge.name) for badge in badges]
-        form.badge_id.choices = badge_choices
+        badge_catalog = get_badge_catalog()
+        badges = badge_catalog.badges
+        form.badge_id.choices = list(badge_catalog.youth_choices)
 
         if request.method == "POST":
             if not submission_open and not is_admin:
@@ -628,9 +870,10 @@ def call_for_youth_artists():
                     is_admin=is_admin,
                 )
 
-            file_ext = os.path.splitext(artwork_file.filename)[1]
-            if file_ext.lower() not in ['.jpg', '.jpeg', '.png', '.svg']:
-                flash("Invalid file format. Only JPG, JPEG, PNG, or SVG files are allowed.", "danger")
+            try:
+                unique_filename = save_artwork_upload(artwork_file, max_size_mb=MAX_ARTWORK_SIZE_MB)
+            except UploadError as e:
+                flash(str(e), "danger")
                 return render_template(
                     "call_for_youth_artists.html",
                     form=form,
@@ -641,10 +884,6 @@ def call_for_youth_artists():
                     is_admin=is_admin,
                 )
 
-            unique_filename = f"{uuid.uuid4()}{file_ext}"
-            artwork_path = os.path.join(current_app.config["UPLOAD_FOLDER"], unique_filename)
-            artwork_file.save(artwork_path)
-
             submission = YouthArtistSubmission(
                 name=form.name.data,
                 age=form.age.data,
@@ -658,13 +897,18 @@ def call_for_youth_artists():
             db.session.add(submission)
             db.session.flush()
 
+            width, height = read_image_size(os.path.join(current_app.config["UPLOAD_FOLDER"], unique_filename))
             badge_artwork = BadgeArtwork(
                 youth_submission_id=submission.id,
                 badge_id=int(badge_id),
-                artwork_file=unique_filename
+                artwork_file=unique_filename,
+                width=width,
+                height=height
             )
             db.session.add(badge_artwork)
+            schedule_derivatives([unique_filename])
             db.session.commit()
+            SUBMISSIONS_CREATED.labels(category="youth").inc()
 
             flash("Submission received successfully!", "success")
             return redirect(url_for("main.submission_success", submission_id=submission.id, type="youth_artist"))
@@ -679,6 +923,8 @@ def call_for_youth_artists():
             is_admin=is_admin,
             submission_period=submission_period
         )
+    except RequestEntityTooLarge:
+        raise  # Handled by the app-level 413 handler
     except Exception as e:
         db.session.rollback()
         logger.error(f"Error during youth artist submission: {e}", exc_info=True)
@@ -718,13 +964,17 @@ def judges_submission_success():
 
 
 @main_bp.route("/api/badges", methods=["GET"])
+@read_replica
 def api_badges():
-    badges = Badge.query.all()
+    badge_catalog = get_badge_catalog()
 
-    return jsonify([
-        {"id": badge.id, "name": badge.name, "description": badge.description}
-        for badge in badges
-    ])
+    # Clients revalidate with If-None-Match and get a 304 while the catalog is unchanged
+    if badge_catalog.etag in request.if_none_match:
+        response = make_response("", 304)
+    else:
+        response = jsonify(list(badge_catalog.badges))
+    response.set_etag(badge_catalog.etag)
+    return response
 
 
 
@@ -0,0 +1,86 @@
+from flask import Response, abort, current_app, g, request
+from flask_login import current_user
+from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge, Histogram, REGISTRY, generate_latest, multiprocess
+from app.cache_policy import set_cache_policy
+
+import os
+import hmac
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Seconds; covers fast JSON autosaves up to slow exports
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+UNMATCHED_ENDPOINT = "unmatched"  # Label for requests that matched no route, so 404 paths cannot explode the label set
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds", "Request latency by endpoint.",
+    ["endpoint", "method"], buckets=LATENCY_BUCKETS,
+)
+REQUESTS = Counter("http_requests_total", "Requests by endpoint and status code.", ["endpoint", "method", "status"])
+IN_PROGRESS = Gauge(
+    "http_requests_in_progress", "Requests currently being handled.",
+    ["endpoint", "method"], multiprocess_mode="livesum",
+)
+
+SUBMISSIONS_CREATED = Counter("submissions_created_total", "Artist submissions saved.", ["category"])
+UPLOAD_BYTES = Counter("artwork_upload_bytes_total", "Bytes of artwork uploads accepted.")
+RANKING_SAVES = Counter("ranking_saves_total", "Ballot saves by ballot kind and save mode.", ["kind", "mode"])
+LOGINS = Counter("logins_total", "Judge login attempts.", ["result"])
+
+
+def collector_registry():
+    """The registry to expose: every worker's samples under gunicorn, this process's otherwise."""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return registry
+    return REGISTRY
+
+
+def _labels():
+    return {"endpoint": request.endpoint or UNMATCHED_ENDPOINT, "method": request.method}
+
+
+def _start_request():
+    g.metrics_labels = _labels()
+    g.metrics_started = time.perf_counter()
+    IN_PROGRESS.labels(**g.metrics_labels).inc()
+
+
+def _record_response(response):
+    labels = g.get("metrics_labels")
+    if labels is not None:
+        REQUEST_LATENCY.labels(**labels).observe(time.perf_counter() - g.metrics_started)
+        REQUESTS.labels(status=str(response.status_code), **labels).inc()
+    return response
+
+
+def _finish_request(exc):
+    labels = g.pop("metrics_labels", None)
+    if labels is not None:
+        IN_PROGRESS.labels(**labels).dec()
+
+
+def metrics_view():
+    """Prometheus text format; for admins, or scrapers sending the configured bearer token."""
+    token = current_app.config.get("METRICS_TOKEN")
+    authorization = request.headers.get("Authorization", "")
+    if not (token and hmac.compare_digest(authorization.encode(), f"Bearer {token}".encode())):
+        if not (current_user.is_authenticated and current_user.is_admin):
+            abort(403)
+    set_cache_policy("no-store")
+    return Response(generate_latest(collector_registry()), mimetype=CONTENT_TYPE_LATEST)
+
+
+def init_metrics(app, section=None):
+    """Record per-endpoint request metrics and serve them at /metrics unless [metrics] ENABLED is false."""
+    section = section or {}
+    if not section.get("ENABLED", True):
+        return
+    app.config["METRICS_TOKEN"] = section.get("TOKEN") or None
+    app.before_request(_start_request)
+    app.after_request(_record_response)
+    app.teardown_request(_finish_request)
+    app.add_url_rule("/metrics", "metrics", metrics_view)
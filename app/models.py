@@ -4,8 +4,9 @@ from flask_login import UserMixin
 from datetime import datetime
 from flask import url_for, current_app
 from sqlalchemy.orm import relationship, backref
+from app.database import RoutingSession
 
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={"class_": RoutingSession})  # Routes @read_replica views to the replica bind
 
 # Badge model to represent badges available for submissions
 class Badge(db.Model):
@@ -33,6 +34,7 @@ class ArtistSubmission(db.Model):
     future_engagement = db.Column(db.Text, nullable=True)  # Interest in future engagement
     consent_to_data = db.Column(db.Boolean, nullable=False, default=False)  # Consent to data usage
     opt_in_featured_artwork = db.Column(db.Boolean, nullable=False, default=False)  # Opt-in for featuring artwork
+    __table_args__ = (db.Index('ix_artist_submission_created_at', 'created_at', 'id'),)  # Export order
     badge_artworks = db.relationship('BadgeArtwork', backref='submission', cascade='all, delete-orphan')
     judge_votes = db.relationship('JudgeVote', backref='artist_submission', cascade='all, delete-orphan')
 
@@ -52,6 +54,7 @@ class YouthArtistSubmission(db.Model):
     opt_in_featured_artwork = db.Column(db.Boolean, nullable=False, default=False)  # Opt-in for featuring artwork
     parent_consent = db.Column(db.Boolean, nullable=False, default=False)  # Parent/Guardian consent
 
+    __table_args__ = (db.Index('ix_youth_artist_submission_created_at', 'created_at', 'id'),)  # Export order
     badge_artworks = db.relationship('BadgeArtwork', backref='youth_submission', cascade='all, delete-orphan')
 
     def __repr__(self):
@@ -66,15 +69,34 @@ class BadgeArtwork(db.Model):
     badge_id = db.Column(db.Integer, db.ForeignKey('badge.id', ondelete='CASCADE'), nullable=False)
     instance = db.Column(db.Integer, nullable=False, default=0)
     artwork_file = db.Column(db.String(255), nullable=False)  # File path for the artwork
-    __table_args__ = (db.UniqueConstraint('submission_id', 'badge_id', name='unique_submission_badge'),)
+    width = db.Column(db.Integer, nullable=True)  # Pixel size of the original, None for SVGs
+    height = db.Column(db.Integer, nullable=True)
+    __table_args__ = (
+        db.UniqueConstraint('submission_id', 'badge_id', name='unique_submission_badge'),  # Also serves submission_id lookups
+        db.Index('ix_badge_artwork_youth_submission_id', 'youth_submission_id'),
+        db.Index('ix_badge_artwork_badge_id', 'badge_id'),
+    )
     
     # One-to-many relationship with JudgeVote
     judge_votes = db.relationship('JudgeVote', backref='badge_artwork', cascade='all, delete-orphan')
+    # Maintained score for the results page (see app.tallies)
+    tally = db.relationship('ArtworkTally', uselist=False, cascade='all, delete-orphan')
 
     def __repr__(self):
         badge_name = self.badge.name if self.badge else "None"
         return f"<BadgeArtwork Badge={badge_name}, File={self.artwork_file}>"
 
+# Stored artwork file, shared by every BadgeArtwork whose upload had the same content
+class ArtworkBlob(db.Model):
+    sha256 = db.Column(db.String(64), primary_key=True)  # Hex digest of the file content
+    filename = db.Column(db.String(255), nullable=False, unique=True)  # <sha256><ext> inside UPLOAD_FOLDER
+    size = db.Column(db.Integer, nullable=True)  # File size in bytes
+    ref_count = db.Column(db.Integer, nullable=False, default=0)  # Number of BadgeArtwork rows using the file
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<ArtworkBlob {self.filename} refs={self.ref_count}>"
+
 # User model for user authentication and voting
 class User(db.Model, UserMixin):
     id = db.Column(db.Integer, primary_key=True)
@@ -105,6 +127,15 @@ class JudgeVote(db.Model):
     youth_submission_id = db.Column(db.Integer, db.ForeignKey('youth_artist_submission.id'), nullable=True)
     badge_artwork_id = db.Column(db.Integer, db.ForeignKey('badge_artwork.id'), nullable=False)
     rank = db.Column(db.Integer, nullable=False)
+    __table_args__ = (
+        # One vote per judge and artwork; also serves lookups by judge
+        db.Index('ix_judge_vote_user_artwork', 'user_id', 'badge_artwork_id', unique=True),
+        # A judge's adult or youth ballot in rank order (ballot reads, saves and moves)
+        db.Index('ix_judge_vote_user_submission_rank', 'user_id', 'submission_id', 'rank'),
+        db.Index('ix_judge_vote_user_youth_submission_rank', 'user_id', 'youth_submission_id', 'rank'),
+        # Every judge's rank for an artwork (results, tallies)
+        db.Index('ix_judge_vote_artwork_rank', 'badge_artwork_id', 'rank'),
+    )
 
     def __repr__(self):
         if self.submission_id:
@@ -112,6 +143,30 @@ class JudgeVote(db.Model):
         return f"<JudgeVote youth_submission_id={self.youth_submission_id}>"
 
 
+# Running totals of the votes for one BadgeArtwork, updated with every ballot save (see app.tallies)
+class ArtworkTally(db.Model):
+    badge_artwork_id = db.Column(db.Integer, db.ForeignKey('badge_artwork.id', ondelete='CASCADE'), primary_key=True)
+    score = db.Column(db.Integer, nullable=False, default=0)  # Sum of ranks; lower is better
+    vote_count = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<ArtworkTally badge_artwork_id={self.badge_artwork_id}, score={self.score}, votes={self.vote_count}>"
+
+
+# Version of a judge's adult or youth ballot, bumped on every save so clients can send incremental moves
+class JudgeBallot(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id', ondelete='CASCADE'), nullable=False)
+    kind = db.Column(db.String(10), nullable=False)  # "adult" or "youth"
+    version = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    __table_args__ = (db.UniqueConstraint('user_id', 'kind', name='unique_user_ballot'),)
+
+    def __repr__(self):
+        return f"<JudgeBallot user_id={self.user_id}, kind={self.kind}, version={self.version}>"
+
+
 # Submission period model to control submission timings
 class SubmissionPeriod(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -120,3 +175,23 @@ class SubmissionPeriod(db.Model):
 
     def __repr__(self):
         return f"<SubmissionPeriod start={self.submission_start}, end={self.submission_end}>"
+
+
+# Background job stored in the database and executed by `flask worker` processes
+class Job(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(100), nullable=False)  # Name of the registered job handler
+    payload = db.Column(db.Text, nullable=False, default="{}")  # JSON-encoded handler arguments
+    status = db.Column(db.String(20), nullable=False, default="queued")  # queued, running, done or failed
+    attempts = db.Column(db.Integer, nullable=False, default=0)  # Number of times the job was claimed
+    max_attempts = db.Column(db.Integer, nullable=False, default=5)
+    run_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)  # Earliest time the job may run
+    locked_until = db.Column(db.DateTime, nullable=True)  # Visibility timeout of the current claim
+    locked_by = db.Column(db.String(100), nullable=True)  # Worker holding the claim
+    last_error = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    finished_at = db.Column(db.DateTime, nullable=True)
+    __table_args__ = (db.Index('ix_job_status_run_at', 'status', 'run_at'),)
+
+    def __repr__(self):
+        return f"<Job {self.id} {self.kind} status={self.status} attempts={self.attempts}>"
@@ -0,0 +1,166 @@
+from flask import current_app, g, request
+from flask_login import current_user
+from itsdangerous import BadSignature, URLSafeTimedSerializer
+from collections import Counter, namedtuple
+from datetime import datetime, timezone
+
+import os
+import re
+import sys
+import time
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = "X-Profile-Token"  # Signed token from make_profile_token
+PROFILE_QUERY_FLAG = "_profile"  # ?_profile=1, honoured for logged-in admins only
+CAPTURE_HEADER = "X-Profile-Capture"  # Name of the stored capture, added to profiled responses
+TOKEN_SALT = "request-profiler"
+
+DEFAULT_INTERVAL_MS = 2
+DEFAULT_MAX_CAPTURES = 50
+DEFAULT_TOKEN_MAX_AGE = 3600
+
+# <UTC timestamp>_<endpoint>_<duration>ms_<samples>.folded
+CAPTURE_NAME = re.compile(r"^(\d{8}T\d{6}\d{6})_([\w.]+)_(\d+)ms_(\d+)\.folded$")
+
+Capture = namedtuple("Capture", ["name", "created_at", "endpoint", "duration_ms", "samples", "size"])
+
+
+class StackSampler(threading.Thread):
+    """Samples one thread's Python stack at a fixed interval into collapsed-stack counts."""
+
+    def __init__(self, thread_id, interval):
+        super().__init__(name="request-profiler", daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stopped = threading.Event()
+
+    def run(self):
+        while not self._stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self.stacks[collapse_stack(frame)] += 1
+
+    def stop(self):
+        self._stopped.set()
+        self.join()
+        return self.stacks
+
+
+def collapse_stack(frame):
+    """Root-first "func (file:line);..." for a frame, the collapsed format speedscope and flamegraph.pl read."""
+    frames = []
+    while frame is not None:
+        code = frame.f_code
+        frames.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+        frame = frame.f_back
+    return ";".join(reversed(frames))
+
+
+def _serializer():
+    return URLSafeTimedSerializer(current_app.config["SECRET_KEY"], salt=TOKEN_SALT)
+
+
+def make_profile_token():
+    """A token that profiles any request carrying it in the X-Profile-Token header until it expires."""
+    return _serializer().dumps("profile")
+
+
+def profile_requested():
+    token = request.headers.get(PROFILE_HEADER)
+    if token:
+        try:
+            _serializer().loads(token, max_age=current_app.config["PROFILER_TOKEN_MAX_AGE"])
+            return True
+        except BadSignature:
+            logger.warning(f"Rejected profile token on {request.path}.")
+            return False
+    if request.args.get(PROFILE_QUERY_FLAG):
+        return current_user.is_authenticated and current_user.is_admin
+    return False
+
+
+def list_captures(profile_dir=None):
+    """Stored captures, newest first."""
+    profile_dir = profile_dir or current_app.config["PROFILER_DIR"]
+    captures = []
+    if not os.path.isdir(profile_dir):
+        return captures
+    for name in os.listdir(profile_dir):
+        match = CAPTURE_NAME.match(name)
+        if not match:
+            continue
+        stamp, endpoint, duration_ms, samples = match.groups()
+        captures.append(Capture(
+            name=name,
+            created_at=datetime.strptime(stamp, "%Y%m%dT%H%M%S%f").replace(tzinfo=timezone.utc),
+            endpoint=endpoint,
+            duration_ms=int(duration_ms),
+            samples=int(samples),
+            size=os.path.getsize(os.path.join(profile_dir, name)),
+        ))
+    return sorted(captures, key=lambda capture: capture.name, reverse=True)
+
+
+def store_capture(stacks, endpoint, duration_ms):
+    """Write a capture and drop the oldest ones beyond PROFILER_MAX_CAPTURES (a ring buffer on disk)."""
+    profile_dir = current_app.config["PROFILER_DIR"]
+    os.makedirs(profile_dir, exist_ok=True)
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%f")
+    name = f"{stamp}_{endpoint}_{duration_ms}ms_{sum(stacks.values())}.folded"
+    with open(os.path.join(profile_dir, name), "w") as f:
+        for stack, count in stacks.most_common():
+            f.write(f"{stack} {count}\n")
+
+    for capture in list_captures(profile_dir)[current_app.config["PROFILER_MAX_CAPTURES"]:]:
+        try:
+            os.remove(os.path.join(profile_dir, capture.name))
+        except FileNotFoundError:
+            pass  # Removed by another worker
+    return name
+
+
+def _start_profile():
+    if not profile_requested():
+        return
+    sampler = StackSampler(threading.get_ident(), current_app.config["PROFILER_INTERVAL_MS"] / 1000)
+    g.profiler = (sampler, time.perf_counter())
+    sampler.start()
+
+
+def _stop_profile(response):
+    """Profiles cover the view up to the returned response; streamed bodies are not sampled."""
+    profile = g.pop("profiler", None)
+    if profile is None:
+        return response
+    sampler, started = profile
+    stacks = sampler.stop()
+    duration_ms = int((time.perf_counter() - started) * 1000)
+    endpoint = request.endpoint or "unmatched"
+    name = store_capture(stacks, endpoint, duration_ms)
+    response.headers[CAPTURE_HEADER] = name
+    logger.info(f"Profiled {endpoint} ({duration_ms} ms, {sum(stacks.values())} samples) into {name}.")
+    return response
+
+
+def _abandon_profile(exc):
+    profile = g.pop("profiler", None)
+    if profile is not None:
+        profile[0].stop()
+
+
+def init_profiler(app, section=None):
+    """Let admins profile single requests; captures are kept under [profiler] DIR."""
+    section = section or {}
+    if not section.get("ENABLED", True):
+        return
+    app.config["PROFILER_DIR"] = section.get("DIR", os.path.join(app.instance_path, "profiles"))
+    app.config["PROFILER_INTERVAL_MS"] = section.get("INTERVAL_MS", DEFAULT_INTERVAL_MS)
+    app.config["PROFILER_MAX_CAPTURES"] = section.get("MAX_CAPTURES", DEFAULT_MAX_CAPTURES)
+    app.config["PROFILER_TOKEN_MAX_AGE"] = section.get("TOKEN_MAX_AGE", DEFAULT_TOKEN_MAX_AGE)
+    app.before_request(_start_profile)
+    app.after_request(_stop_profile)
+    app.teardown_request(_abandon_profile)
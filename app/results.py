@@ -0,0 +1,116 @@
+from sqlalchemy import case, exists, func, or_, select
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from app.models import ArtistSubmission, ArtworkTally, Badge, BadgeArtwork, JudgeVote, User, YouthArtistSubmission, db
+
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def _judge_votes_subquery(dialect):
+    """
+    Every judge's rank per artwork, aggregated to one JSON array per artwork
+    (json_agg on PostgreSQL, json_group_array on SQLite). Returns None on other
+    databases, which then read the votes with a separate query.
+    """
+    if dialect == "postgresql":
+        entry = func.json_build_object("judge_name", User.name, "rank", JudgeVote.rank)
+        votes = func.json_agg(aggregate_order_by(entry, JudgeVote.rank))
+    elif dialect == "sqlite":
+        votes = func.json_group_array(func.json_object("judge_name", User.name, "rank", JudgeVote.rank))
+    else:
+        return None
+    return (
+        select(JudgeVote.badge_artwork_id, votes.label("votes"))
+        .join(User, User.id == JudgeVote.user_id)
+        .group_by(JudgeVote.badge_artwork_id)
+        .subquery()
+    )
+
+
+def _fallback_judge_votes():
+    judge_votes_by_artwork = {}
+    judge_votes = db.session.query(
+        JudgeVote.badge_artwork_id,
+        User.name.label("judge_name"),
+        JudgeVote.rank
+    ).join(
+        User, User.id == JudgeVote.user_id
+    ).order_by(JudgeVote.badge_artwork_id, JudgeVote.rank)
+    for vote in judge_votes:
+        judge_votes_by_artwork.setdefault(vote.badge_artwork_id, []).append({
+            "judge_name": vote.judge_name,
+            "rank": vote.rank
+        })
+    return judge_votes_by_artwork
+
+
+def load_results():
+    """
+    Read the results page in one round-trip: per-artwork totals (from the
+    maintained tallies), placement within the adult or youth category (a rank()
+    window, so tied scores share a place), and each judge's rank as a JSON array.
+
+    Returns (results, youth_results, judge_votes_by_artwork), best first.
+    """
+    dialect = db.session.get_bind().dialect.name
+    votes = _judge_votes_subquery(dialect)
+
+    category = case((BadgeArtwork.youth_submission_id.isnot(None), "youth"), else_="adult")
+    total_score = func.coalesce(ArtworkTally.score, 0)
+    columns = [
+        BadgeArtwork.id.label("badge_artwork_id"),
+        BadgeArtwork.artwork_file.label("artwork_file"),
+        category.label("category"),
+        ArtistSubmission.id.label("artist_id"),
+        YouthArtistSubmission.id.label("youth_submission_id"),
+        func.coalesce(ArtistSubmission.name, YouthArtistSubmission.name).label("artist_name"),
+        YouthArtistSubmission.age.label("age"),
+        Badge.name.label("badge_name"),
+        total_score.label("total_score"),
+        func.rank().over(partition_by=category, order_by=total_score).label("placement"),
+    ]
+    if votes is not None:
+        columns.append(votes.c.votes)
+
+    query = db.session.query(*columns).select_from(BadgeArtwork).join(
+        Badge, Badge.id == BadgeArtwork.badge_id
+    ).outerjoin(
+        ArtistSubmission, ArtistSubmission.id == BadgeArtwork.submission_id
+    ).outerjoin(
+        YouthArtistSubmission, YouthArtistSubmission.id == BadgeArtwork.youth_submission_id
+    ).outerjoin(
+        ArtworkTally, ArtworkTally.badge_artwork_id == BadgeArtwork.id
+    ).filter(
+        or_(ArtistSubmission.id.isnot(None), YouthArtistSubmission.id.isnot(None))
+    )
+    if votes is not None:
+        query = query.outerjoin(votes, votes.c.badge_artwork_id == BadgeArtwork.id)
+    rows = query.order_by(category, total_score, BadgeArtwork.id).all()
+
+    # One pass to split the categories and decode the vote arrays
+    results, youth_results = [], []
+    judge_votes_by_artwork = {} if votes is not None else _fallback_judge_votes()
+    for row in rows:
+        entry = row._asdict()
+        if votes is not None:
+            judge_votes = entry.pop("votes") or []
+            if isinstance(judge_votes, str):  # SQLite returns the array as text
+                judge_votes = json.loads(judge_votes)
+            if dialect != "postgresql":  # json_group_array has no ORDER BY
+                judge_votes.sort(key=lambda vote: vote["rank"])
+            judge_votes_by_artwork[entry["badge_artwork_id"]] = judge_votes
+        (youth_results if entry["category"] == "youth" else results).append(entry)
+
+    logger.debug(f"Loaded {len(results)} adult and {len(youth_results)} youth results.")
+    return results, youth_results, judge_votes_by_artwork
+
+
+def load_judges_status():
+    """Names of the users who have and have not voted, from one query."""
+    voted = exists().where(JudgeVote.user_id == User.id)
+    judges_status = {"voted": [], "not_voted": []}
+    for name, has_voted in db.session.query(User.name, voted.label("voted")).order_by(User.id):
+        judges_status["voted" if has_voted else "not_voted"].append(name)
+    return judges_status
@@ -0,0 +1,346 @@
+from flask import current_app
+from datetime import datetime, timedelta, timezone
+from itertools import islice
+from sqlalchemy import delete, func, insert, select, text
+from werkzeug.security import generate_password_hash
+from app.models import (
+    ArtistSubmission, ArtworkBlob, ArtworkTally, Badge, BadgeArtwork, JudgeBallot, JudgeVote,
+    SubmissionPeriod, User, YouthArtistSubmission, db,
+)
+from app.cache import invalidate_users
+from app.tallies import rebuild_tallies
+from app.uploads import blob_filename
+
+import io
+import os
+import csv
+import time
+import click
+import random
+import struct
+import hashlib
+import logging
+import zlib
+
+logger = logging.getLogger(__name__)
+
+INSERT_CHUNK_SIZE = 5000
+COPY_CHUNK_SIZE = 100000
+DEFAULT_JUDGE_PASSWORD = "contest-judge"
+ADMIN_NAME = "admin"
+
+WORDS = (
+    "color", "line", "shape", "community", "river", "forest", "valley", "light", "paint", "ink",
+    "paper", "pattern", "story", "neighbors", "trail", "bridge", "garden", "harvest", "rain", "mountain",
+    "bicycle", "library", "market", "festival", "history", "future", "design", "texture", "contrast", "symbol",
+    "county", "coast", "ocean", "stone", "clay", "print", "mural", "sketch", "studio", "workshop",
+    "teacher", "family", "friends", "season", "winter", "summer", "growth", "home", "journey", "badge",
+)
+
+# Form limits (forms.py) the generated text stays within
+BIO_LENGTH = (300, 2500)
+YOUTH_ANSWER_LENGTH = (20, 500)
+
+
+def placeholder_png(width=64, height=48, rgb=(120, 160, 90)):
+    """A small valid solid-color PNG."""
+    raw = b"".join(b"\x00" + bytes(rgb) * width for _ in range(height))
+
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) + chunk(b"IDAT", zlib.compress(raw)) + chunk(b"IEND", b"")
+
+
+def prose_generator(rng, corpus_length=8000):
+    """
+    A ``prose(min_length, max_length)`` function returning filler sentences of a
+    length within the bounds, cut from one shared corpus so thousands of bios are cheap.
+    """
+    sentences, length = [], 0
+    while length < corpus_length + BIO_LENGTH[1]:
+        sentence = " ".join(rng.choices(WORDS, k=rng.randint(6, 14))).capitalize() + "."
+        sentences.append(sentence)
+        length += len(sentence) + 1
+    corpus = " ".join(sentences)
+    starts, offset = [], 0
+    for sentence in sentences:
+        if offset > corpus_length:
+            break
+        starts.append(offset)
+        offset += len(sentence) + 1
+
+    def prose(min_length, max_length):
+        start = rng.choice(starts)
+        text = corpus[start:start + rng.randint(min_length, max_length)]
+        cut = text.rfind(" ")
+        if cut >= min_length:  # End on a whole word when the length allows it
+            text = text[:cut].rstrip(".") + "."
+        return text
+
+    return prose
+
+
+def _bulk_insert(model, rows):
+    """Insert ``rows`` (any iterable of dicts) with one executemany per chunk."""
+    rows = iter(rows)
+    total = 0
+    while True:
+        chunk = list(islice(rows, INSERT_CHUNK_SIZE))
+        if not chunk:
+            return total
+        db.session.execute(insert(model.__table__), chunk)
+        total += len(chunk)
+
+
+def _copy_rows(model, columns, rows):
+    """
+    Load tuples into ``model``'s table without SQLAlchemy's per-row parameter
+    handling: COPY FROM STDIN on PostgreSQL, a plain DBAPI executemany elsewhere.
+    """
+    table = model.__table__.name
+    connection = db.session.connection()
+    cursor = connection.connection.cursor()
+    rows = iter(rows)
+    total = 0
+    try:
+        while True:
+            chunk = list(islice(rows, COPY_CHUNK_SIZE))
+            if not chunk:
+                return total
+            if connection.dialect.name == "postgresql":
+                buffer = io.StringIO()
+                csv.writer(buffer).writerows(chunk)  # None becomes an unquoted empty field, which COPY reads as NULL
+                buffer.seek(0)
+                cursor.copy_expert(f'COPY "{table}" ({", ".join(columns)}) FROM STDIN WITH (FORMAT csv)', buffer)
+            else:
+                placeholder = "?" if connection.dialect.paramstyle == "qmark" else "%s"
+                cursor.executemany(
+                    f'INSERT INTO "{table}" ({", ".join(columns)}) VALUES ({", ".join([placeholder] * len(columns))})',
+                    chunk,
+                )
+            total += len(chunk)
+    finally:
+        cursor.close()
+
+
+def _next_id(model):
+    return (db.session.scalar(select(func.max(model.id))) or 0) + 1
+
+
+def _reset_sequences(models):
+    """Rows were inserted with explicit ids; move PostgreSQL's id sequences past them."""
+    if db.session.get_bind().dialect.name != "postgresql":
+        return
+    for model in models:
+        table = model.__table__.name
+        db.session.execute(text(
+            f"SELECT setval(pg_get_serial_sequence('\"{table}\"', 'id'), COALESCE(MAX(id), 0) + 1, false) FROM \"{table}\""
+        ))
+
+
+def clear_contest():
+    """Delete all contest data: votes, artworks, submissions, badges and non-admin users."""
+    for model in (JudgeVote, JudgeBallot, ArtworkTally, BadgeArtwork, ArtworkBlob, ArtistSubmission,
+                  YouthArtistSubmission, Badge):
+        db.session.execute(delete(model))
+    db.session.execute(delete(User).where(User.is_admin.isnot(True)))
+
+
+def has_contest_data():
+    """True when a table seed_contest fills under fixed unique names (judges, badges, submissions) has rows."""
+    return any(
+        query.first() is not None
+        for query in (
+            db.session.query(User.id).filter(User.is_admin.isnot(True)),
+            db.session.query(Badge.id),
+            db.session.query(ArtistSubmission.id),
+            db.session.query(YouthArtistSubmission.id),
+        )
+    )
+
+
+def write_placeholders(count, rng):
+    """Write ``count`` distinct placeholder PNGs under their content-addressed names; returns (filename, size, sha256)."""
+    upload_folder = current_app.config["UPLOAD_FOLDER"]
+    os.makedirs(upload_folder, exist_ok=True)
+    placeholders = []
+    for _ in range(count):
+        data = placeholder_png(rgb=(rng.randrange(256), rng.randrange(256), rng.randrange(256)))
+        sha256 = hashlib.sha256(data).hexdigest()
+        filename = blob_filename(sha256, "png")
+        if any(existing == filename for existing, _, _ in placeholders):
+            continue
+        with open(os.path.join(upload_folder, filename), "wb") as f:
+            f.write(data)
+        placeholders.append((filename, len(data), sha256))
+    return placeholders
+
+
+def seed_contest(judges, submissions, youth_submissions, badges, artworks_per_submission=3, complete=1.0,
+                 images=12, seed=0, judge_password=DEFAULT_JUDGE_PASSWORD, admin_password=None):
+    """
+    Bulk-load a synthetic contest into a database without contest data.
+
+    ``submissions`` adult submissions get 1 to ``artworks_per_submission`` artworks
+    each and ``youth_submissions`` youth submissions one; every artwork points at
+    one of ``images`` shared placeholder files. Judges are named judge1, judge2, ...
+    A ``complete`` share of them ranks every submission of both ballots, the rest
+    a random part of each. The same ``seed`` always yields the same contest.
+    Returns the generated judge names and submission ids.
+    """
+    if badges < artworks_per_submission:
+        raise ValueError("Need at least as many badges as artworks per submission.")
+    rng = random.Random(seed)
+    prose = prose_generator(rng)
+    created = datetime.utcnow() - timedelta(days=1)
+
+    if admin_password is not None:
+        admin = User.query.filter_by(name=ADMIN_NAME).first() or User(name=ADMIN_NAME)
+        admin.password_hash = generate_password_hash(admin_password)
+        admin.is_admin = True
+        db.session.add(admin)
+        db.session.flush()
+    if SubmissionPeriod.query.count() == 0:
+        now = datetime.now(timezone.utc)
+        db.session.add(SubmissionPeriod(submission_start=now - timedelta(days=7), submission_end=now + timedelta(days=7)))
+
+    first_judge = _next_id(User)
+    judge_ids = list(range(first_judge, first_judge + judges))
+    password_hash = generate_password_hash(judge_password)  # Hashed once; every judge shares it
+    _bulk_insert(User, (
+        {"id": judge_id, "name": f"judge{number}", "password_hash": password_hash, "is_admin": False}
+        for number, judge_id in enumerate(judge_ids, start=1)
+    ))
+
+    first_badge = _next_id(Badge)
+    badge_ids = list(range(first_badge, first_badge + badges))
+    _bulk_insert(Badge, (
+        {"id": badge_id, "name": f"Badge {number}", "description": prose(40, 200)}
+        for number, badge_id in enumerate(badge_ids, start=1)
+    ))
+
+    first_submission = _next_id(ArtistSubmission)
+    submission_ids = list(range(first_submission, first_submission + submissions))
+    _bulk_insert(ArtistSubmission, (
+        {
+            "id": sub_id, "created_at": created + timedelta(seconds=number), "name": f"Artist {number}",
+            "email": f"artist{number}@example.com",
+            "phone_number": f"541555{rng.randrange(10000):04d}" if rng.random() < 0.5 else None,
+            "artist_bio": prose(*BIO_LENGTH), "statement": prose(*BIO_LENGTH),
+            "portfolio_link": f"https://example.com/artist{number}" if rng.random() < 0.3 else None,
+            "consent_to_data": True, "opt_in_featured_artwork": rng.random() < 0.5,
+        }
+        for number, sub_id in enumerate(submission_ids, start=1)
+    ))
+
+    first_youth = _next_id(YouthArtistSubmission)
+    youth_ids = list(range(first_youth, first_youth + youth_submissions))
+    _bulk_insert(YouthArtistSubmission, (
+        {
+            "id": sub_id, "created_at": created + timedelta(seconds=number), "name": f"Youth {number}",
+            "age": rng.randint(13, 18), "parent_contact_info": f"parent{number}@example.com",
+            "email": f"youth{number}@example.com",
+            "about_why_design": prose(*YOUTH_ANSWER_LENGTH), "about_yourself": prose(*YOUTH_ANSWER_LENGTH),
+            "opt_in_featured_artwork": rng.random() < 0.5, "parent_consent": True,
+        }
+        for number, sub_id in enumerate(youth_ids, start=1)
+    ))
+
+    placeholders = write_placeholders(images, rng)
+    ref_counts = dict.fromkeys((filename for filename, _, _ in placeholders), 0)
+    artwork_rows, first_artwork = [], {"adult": {}, "youth": {}}
+    artwork_id = _next_id(BadgeArtwork)
+    for kind, owner_ids in (("adult", submission_ids), ("youth", youth_ids)):
+        for sub_id in owner_ids:
+            count = rng.randint(1, artworks_per_submission) if kind == "adult" else 1
+            for instance, badge_id in enumerate(rng.sample(badge_ids, count), start=1):
+                filename = rng.choice(placeholders)[0]
+                ref_counts[filename] += 1
+                artwork_rows.append({
+                    "id": artwork_id, "badge_id": badge_id, "artwork_file": filename, "width": 64, "height": 48,
+                    "submission_id": sub_id if kind == "adult" else None,
+                    "youth_submission_id": sub_id if kind == "youth" else None,
+                    "instance": instance if kind == "adult" else 0,
+                })
+                first_artwork[kind].setdefault(sub_id, artwork_id)
+                artwork_id += 1
+    _bulk_insert(BadgeArtwork, artwork_rows)
+    _bulk_insert(ArtworkBlob, (
+        {"sha256": sha256, "filename": filename, "size": size, "ref_count": ref_counts[filename]}
+        for filename, size, sha256 in placeholders
+    ))
+
+    # Judges draw complete or partial ballots up front so the vote stream below stays lazy
+    ballots = []
+    for judge_id in judge_ids:
+        is_complete = rng.random() < complete
+        for kind, owner_ids in (("adult", submission_ids), ("youth", youth_ids)):
+            order = list(owner_ids)
+            rng.shuffle(order)
+            if not is_complete:
+                order = order[:rng.randrange(len(order))] if order else order
+            if order:
+                ballots.append((judge_id, kind, order))
+
+    def votes():
+        for judge_id, kind, order in ballots:
+            artworks = first_artwork[kind]
+            if kind == "adult":
+                for rank, sub_id in enumerate(order, start=1):
+                    yield judge_id, sub_id, None, artworks[sub_id], rank
+            else:
+                for rank, sub_id in enumerate(order, start=1):
+                    yield judge_id, None, sub_id, artworks[sub_id], rank
+
+    vote_count = _copy_rows(
+        JudgeVote, ("user_id", "submission_id", "youth_submission_id", "badge_artwork_id", "rank"), votes(),
+    )
+    _bulk_insert(JudgeBallot, ({"user_id": judge_id, "kind": kind, "version": 1} for judge_id, kind, _ in ballots))
+    _reset_sequences([User, Badge, ArtistSubmission, YouthArtistSubmission, BadgeArtwork, JudgeVote, JudgeBallot])
+    rebuild_tallies()
+    db.session.commit()
+    invalidate_users()
+    return {
+        "judge_names": [f"judge{number}" for number in range(1, judges + 1)],
+        "submission_ids": submission_ids,
+        "youth_submission_ids": youth_ids,
+        "artworks": len(artwork_rows),
+        "votes": vote_count,
+    }
+
+
+@click.command("seed-contest")
+@click.option("--judges", default=20, show_default=True)
+@click.option("--submissions", default=1000, show_default=True, help="Adult submissions.")
+@click.option("--youth-submissions", default=200, show_default=True)
+@click.option("--badges", default=30, show_default=True)
+@click.option("--artworks-per-submission", default=3, show_default=True, help="Most artworks of one adult submission.")
+@click.option("--complete", default=1.0, show_default=True, type=click.FloatRange(0, 1),
+              help="Share of judges with complete ballots; the rest rank a random part of the submissions.")
+@click.option("--images", default=12, show_default=True, help="Distinct placeholder artwork files.")
+@click.option("--seed", default=0, show_default=True, help="Random seed; the same seed generates the same contest.")
+@click.option("--judge-password", default=DEFAULT_JUDGE_PASSWORD, show_default=True)
+@click.option("--admin-password", default=None, help="Also create or reset the 'admin' user with this password.")
+@click.option("--reset", is_flag=True, help="Delete existing contest data (all but admin users) first.")
+def seed_contest_command(judges, submissions, youth_submissions, badges, artworks_per_submission, complete,
+                         images, seed, judge_password, admin_password, reset):
+    """Bulk-generate a synthetic contest for load and benchmark testing."""
+    if reset:
+        clear_contest()
+    elif has_contest_data():
+        raise click.ClickException("The database already has judges or contest data; pass --reset to replace it.")
+    started = time.perf_counter()
+    try:
+        generated = seed_contest(
+            judges, submissions, youth_submissions, badges, artworks_per_submission=artworks_per_submission,
+            complete=complete, images=images, seed=seed, judge_password=judge_password, admin_password=admin_password,
+        )
+    except ValueError as e:
+        db.session.rollback()
+        raise click.ClickException(str(e))
+    click.echo(
+        f"Seeded {judges} judges, {badges} badges, {submissions} adult and {youth_submissions} youth submissions, "
+        f"{generated['artworks']} artworks and {generated['votes']} votes in {time.perf_counter() - started:.1f}s."
+    )
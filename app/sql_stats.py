@@ -0,0 +1,136 @@
+from flask import current_app, g, has_app_context, request
+from sqlalchemy import event
+from collections import Counter
+
+import re
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REPEAT_THRESHOLD = 5  # Same statement this many times in one request is reported as a likely N+1
+
+_PARAMS = re.compile(r"%\(\w+\)s|:\w+\b|\$\d+")
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST = re.compile(r"\(\?(?:, \?)+\)")
+_REPEATED_ROWS = re.compile(r"(\(\?\))(?:, \(\?\))+")
+
+
+class QueryBudgetExceeded(Exception):
+    """Raised (instead of logged) when a request runs more queries than its budget in strict mode."""
+
+
+def fingerprint(statement):
+    """Normalize a SQL statement so executions that differ only in values compare equal."""
+    normalized = " ".join(statement.split())
+    normalized = _PARAMS.sub("?", normalized)
+    normalized = _LITERALS.sub("?", normalized)
+    normalized = _PLACEHOLDER_LIST.sub("(?)", normalized)
+    return _REPEATED_ROWS.sub(r"\1", normalized)
+
+
+class RequestSqlStats:
+    """Query count, DB time and per-fingerprint counts for one request."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.fingerprints = Counter()
+
+    def record(self, statement, duration):
+        self.count += 1
+        self.duration += duration
+        self.fingerprints[fingerprint(statement)] += 1
+
+    def repeated(self, threshold):
+        return [(statement, count) for statement, count in self.fingerprints.most_common() if count >= threshold]
+
+
+class SqlInstrumentation:
+    """Engine listeners plus request hooks that report each request's SQL as Server-Timing and log lines."""
+
+    def __init__(self, budget=0, budgets=None, repeat_threshold=DEFAULT_REPEAT_THRESHOLD, strict=None):
+        self.budget = budget  # Default query budget per request; 0 disables it
+        self.budgets = dict(budgets or {})  # Endpoint -> budget
+        self.repeat_threshold = repeat_threshold
+        self.strict = strict  # None: strict only when app.testing
+
+    @classmethod
+    def from_config(cls, section):
+        return cls(
+            budget=section.get("BUDGET", 0),
+            budgets=section.get("budgets", {}),
+            repeat_threshold=section.get("REPEAT_THRESHOLD", DEFAULT_REPEAT_THRESHOLD),
+            strict=section.get("STRICT"),
+        )
+
+    def budget_for(self, endpoint):
+        return self.budgets.get(endpoint, self.budget)
+
+    @staticmethod
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        # Kept on the execution context, which is discarded with the statement even if it fails
+        context._sql_stats_started = time.perf_counter()
+
+    @staticmethod
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, "_sql_stats_started", None)
+        stats = g.get("sql_stats") if has_app_context() else None
+        if stats is not None and started is not None:
+            stats.record(statement, time.perf_counter() - started)
+
+    def listen(self, engine):
+        event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+
+    def start_request(self):
+        g.sql_stats = RequestSqlStats()
+
+    def finish_request(self, response):
+        """
+        Report the request's queries. Streamed bodies run their queries after this
+        hook, so only the queries made before the response was returned are counted.
+        """
+        stats = g.pop("sql_stats", None)
+        if stats is None:
+            return response
+        endpoint = request.endpoint or "-"
+        db_ms = stats.duration * 1000
+
+        timing = f'db;dur={db_ms:.2f};desc="{stats.count} queries"'
+        existing = response.headers.get("Server-Timing")
+        response.headers["Server-Timing"] = f"{existing}, {timing}" if existing else timing
+
+        repeated = stats.repeated(self.repeat_threshold)
+        logger.info(
+            f"sql endpoint={endpoint} method={request.method} status={response.status_code} "
+            f"queries={stats.count} db_ms={db_ms:.1f} repeated={len(repeated)}"
+        )
+        for statement, count in repeated:
+            logger.warning(f"Possible N+1 in {endpoint}: {count}x {statement[:300]}")
+
+        budget = self.budget_for(endpoint)
+        if budget and stats.count > budget:
+            message = f"{endpoint} ran {stats.count} queries, over its budget of {budget}."
+            strict = current_app.testing if self.strict is None else self.strict
+            if strict:
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
+        return response
+
+
+def init_sql_instrumentation(app, section=None):
+    """Attach the instrumentation when config.toml [sql_instrumentation] ENABLED is set."""
+    section = section or {}
+    if not section.get("ENABLED", False):
+        return None
+    from app.models import db
+
+    instrumentation = SqlInstrumentation.from_config(section)
+    with app.app_context():
+        for engine in db.engines.values():  # The primary and the read replica, when configured
+            instrumentation.listen(engine)
+    app.before_request(instrumentation.start_request)
+    app.after_request(instrumentation.finish_request)
+    app.extensions["sql_instrumentation"] = instrumentation
+    return instrumentation
@@ -195,15 +195,15 @@ function closeArtworkModal() {
     document.body.style.overflow = '';
 }
 
-document.addEventListener("DOMContentLoaded", function () {
-    const artworkThumbnails = document.querySelectorAll(".artwork-thumbnail");
-    artworkThumbnails.forEach((thumbnail) => {
-        thumbnail.addEventListener("click", function (event) {
-            const imageUrl = event.target.dataset.artworkUrl;
-            const name = event.target.dataset.name;
-            const submissionId = event.target.dataset.id;
-            const submissionType = event.target.dataset.type; // 'artist' or 'youth'
-            openArtworkModal(imageUrl, name, submissionId, submissionType);
-        });
-    });
+// Delegated, so thumbnails added after page load (paged ballot entries) open the modal too.
+document.addEventListener("click", function (event) {
+    const thumbnail = event.target.closest(".artwork-thumbnail");
+    if (!thumbnail) {
+        return;
+    }
+    const imageUrl = thumbnail.dataset.artworkUrl;
+    const name = thumbnail.dataset.name;
+    const submissionId = thumbnail.dataset.id;
+    const submissionType = thumbnail.dataset.type; // 'artist' or 'youth'
+    openArtworkModal(imageUrl, name, submissionId, submissionType);
 });
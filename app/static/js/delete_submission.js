@@ -91,27 +91,19 @@ function deleteYouthSubmission(submissionId) {
     });
 }
 
-// Attach event listeners once the DOM is fully loaded.
-document.addEventListener("DOMContentLoaded", function() {
-    // Attach listeners for delete buttons for artist submissions.
-    const deleteButtons = document.querySelectorAll(".delete-button");
-    deleteButtons.forEach(button => {
-        button.addEventListener("click", function(event) {
-            event.preventDefault(); // Prevent the default form submission.
-            const submissionId = event.target.closest(".rank-item").dataset.id;
-            deleteSubmission(submissionId);
-        });
-    });
-
-    // Attach listeners for youth delete buttons.
-    const youthDeleteButtons = document.querySelectorAll(".youth-delete-container .delete-btn");
-    youthDeleteButtons.forEach(button => {
-        button.addEventListener("click", function(event) {
-            event.preventDefault(); // Prevent any default action.
-            const submissionId = event.target.closest(".rank-item").dataset.id;
-            deleteYouthSubmission(submissionId);
-        });
-    });
+// Delegated, so delete buttons on ballot entries loaded after the page work too.
+document.addEventListener("click", function(event) {
+    const button = event.target.closest(".delete-button .delete-btn, .youth-delete-container .delete-btn");
+    if (!button) {
+        return;
+    }
+    event.preventDefault(); // Prevent any default action.
+    const submissionId = button.closest(".rank-item").dataset.id;
+    if (button.closest(".youth-delete-container")) {
+        deleteYouthSubmission(submissionId);
+    } else {
+        deleteSubmission(submissionId);
+    }
 });
 
 document.addEventListener("DOMContentLoaded", function () {
@@ -31,31 +31,83 @@ document.addEventListener("DOMContentLoaded", function () {
 function initSortable(formEl, listEl, rankInputEl) {
     const csrfToken = document.querySelector("input[name='csrf_token']")?.value || "";
 
+    // Client copy of the ballot: moves are sent against `version`; version 0 means
+    // the server does not hold this order yet and the next save must be a full one.
+    const ballot = {
+        version: 0,
+        ids: [],
+        pending: [],
+        needsResync: false,
+        inFlight: false,
+        // Paging state for /judges/ballot/entries
+        cursor: null,
+        complete: false,
+        loading: null,
+        listEl: listEl,
+        rankInputEl: rankInputEl,
+    };
+
     // Create Sortable instance
     Sortable.create(listEl, {
         animation: 150,
-        onEnd: function () {
+        onEnd: function (evt) {
+            const before = ballot.ids;
             updateRankings(listEl, rankInputEl);
-            autoSaveRankings(formEl, rankInputEl, csrfToken);
+            const after = rankedIdsOf(rankInputEl);
+            ballot.ids = after;
+
+            const movedId = evt.item.getAttribute("data-id");
+            const move = { id: movedId, from: before.indexOf(movedId), to: after.indexOf(movedId) };
+            if (move.from === move.to && before.join(",") === after.join(",")) {
+                return;
+            }
+            if (isSingleMove(before, after, move)) {
+                ballot.pending.push(move);
+            } else {
+                ballot.needsResync = true;
+            }
+            flushBallot(formEl, rankInputEl, ballot, csrfToken);
         },
     });
 
-    // Initial labeling
-    updateRankings(listEl, rankInputEl);
+    // Load further pages as the end of the list scrolls into view
+    const sentinel = formEl.querySelector(".ballot-sentinel");
+    const observer = new IntersectionObserver((observed) => {
+        if (observed.some((entry) => entry.isIntersecting) && !ballot.complete) {
+            loadBallotPage(formEl, ballot).then(() => {
+                // Keep going while the sentinel is still visible (short pages, tall screens)
+                observer.unobserve(sentinel);
+                if (!ballot.complete) {
+                    observer.observe(sentinel);
+                }
+            });
+        }
+    });
+    loadBallotPage(formEl, ballot).then(() => {
+        if (sentinel && !ballot.complete) {
+            observer.observe(sentinel);
+        }
+    });
 
     // Final form submission
     formEl.addEventListener("submit", function (event) {
         event.preventDefault();
-        const formData = new FormData(formEl);
-        console.debug("Submitting final rankings form:", Array.from(formData.entries()));
-        fetch(formEl.action, {
-            method: "POST",
-            body: new URLSearchParams(formData),
+        // The full order is only known once every page is loaded
+        loadAllBallotPages(formEl, ballot).then(() => {
+            const formData = new FormData(formEl);
+            console.debug("Submitting final rankings form:", Array.from(formData.entries()));
+            return fetch(formEl.action, {
+                method: "POST",
+                body: new URLSearchParams(formData),
+            });
         })
             .then((response) => {
                 if (response.redirected) {
                     window.location.href = response.url;
                 } else if (response.ok) {
+                    response.json().then((data) => {
+                        ballot.version = data.version || ballot.version;
+                    }).catch(() => {});
                     console.info("Rankings submitted successfully!");
                     alert("Rankings submitted successfully!");
                 } else {
@@ -70,6 +122,232 @@ function initSortable(formEl, listEl, rankInputEl) {
     });
 }
 
+/**
+ * Fetch the next page of ballot entries and append them to the list.
+ * Concurrent calls share one request.
+ * @returns {Promise<void>}
+ */
+function loadBallotPage(formEl, ballot) {
+    if (ballot.complete) {
+        return Promise.resolve();
+    }
+    if (ballot.loading) {
+        return ballot.loading;
+    }
+    const url = new URL(formEl.dataset.entriesUrl, window.location.href);
+    if (ballot.cursor !== null) {
+        url.searchParams.set("cursor", ballot.cursor);
+    }
+    const isFirstPage = ballot.cursor === null;
+
+    ballot.loading = fetch(url)
+        .then((response) => {
+            if (response.status === 409) {
+                // Submissions were added or removed since the first page; start over
+                window.location.reload();
+                throw new Error("Ballot changed while loading.");
+            }
+            if (!response.ok) {
+                throw new Error(`Loading ballot entries failed with status ${response.status}`);
+            }
+            return response.json();
+        })
+        .then((page) => {
+            const canDelete = formEl.dataset.canDelete === "true";
+            const fragment = document.createDocumentFragment();
+            page.entries.forEach((entry) => fragment.appendChild(buildRankItem(entry, canDelete)));
+            ballot.listEl.appendChild(fragment);
+
+            // Appending never moves loaded entries, so pending moves stay valid
+            updateRankings(ballot.listEl, ballot.rankInputEl);
+            ballot.ids = rankedIdsOf(ballot.rankInputEl);
+            if (isFirstPage) {
+                ballot.version = page.version;
+                ballot.needsResync = page.version === 0;
+            }
+            ballot.cursor = page.next_cursor;
+            ballot.complete = page.next_cursor === null;
+
+            const sentinel = formEl.querySelector(".ballot-sentinel");
+            if (sentinel && ballot.complete) {
+                sentinel.textContent = page.total ? "" : "No submissions yet.";
+            }
+        })
+        .catch((error) => {
+            console.error("Error loading ballot entries:", error);
+        })
+        .finally(() => {
+            ballot.loading = null;
+        });
+    return ballot.loading;
+}
+
+/**
+ * Load every remaining page (needed before the full order can be saved).
+ * @returns {Promise<void>}
+ */
+function loadAllBallotPages(formEl, ballot) {
+    if (ballot.complete) {
+        return Promise.resolve();
+    }
+    const cursorBefore = ballot.cursor;
+    return loadBallotPage(formEl, ballot).then(() => {
+        if (ballot.cursor === cursorBefore && !ballot.complete) {
+            throw new Error("Ballot entries could not be loaded.");
+        }
+        return loadAllBallotPages(formEl, ballot);
+    });
+}
+
+/**
+ * Build the .rank-item card for one ballot entry.
+ * @param {{id: number, type: string, name: string, artworks: Object[]}} entry
+ * @param {boolean} canDelete
+ * @returns {HTMLElement}
+ */
+function buildRankItem(entry, canDelete) {
+    const item = document.createElement("div");
+    item.className = "rank-item";
+    item.dataset.id = entry.id;
+
+    const position = document.createElement("span");
+    position.className = "rank-position";
+    item.appendChild(position);
+
+    entry.artworks.forEach((image) => {
+        const img = document.createElement("img");
+        img.src = image.src;
+        if (image.srcset) {
+            img.srcset = image.srcset;
+            img.sizes = "(max-width: 576px) 50vw, 200px";
+        }
+        if (image.width) {
+            img.width = image.width;
+            img.height = image.height;
+        }
+        img.loading = "lazy";
+        img.decoding = "async";
+        img.alt = `Artwork for ${entry.name} (${image.badge_name})`;
+        img.className = "artwork-thumbnail";
+        img.dataset.artworkUrl = image.modal;
+        img.dataset.name = entry.name;
+        img.dataset.id = entry.id;
+        img.dataset.type = entry.type;
+        item.appendChild(img);
+    });
+
+    if (canDelete) {
+        const container = document.createElement("div");
+        container.className = entry.type === "youth" ? "youth-delete-container" : "delete-button";
+        const button = document.createElement("button");
+        button.type = "button";
+        button.className = "btn btn-danger btn-sm delete-btn";
+        button.dataset.id = entry.id;
+        button.textContent = "Delete";
+        container.appendChild(button);
+        item.appendChild(container);
+    }
+    return item;
+}
+
+/**
+ * Read the ordered submission IDs from the hidden rank input.
+ * @param {HTMLInputElement} rankInputEl
+ * @returns {string[]}
+ */
+function rankedIdsOf(rankInputEl) {
+    return rankInputEl.value ? rankInputEl.value.split(",") : [];
+}
+
+/**
+ * True if `after` is exactly `before` with `move.id` moved from `move.from` to `move.to`.
+ * Anything else (duplicates, items removed from the page) needs a full save.
+ */
+function isSingleMove(before, after, move) {
+    if (move.from < 0 || move.to < 0 || before.length !== after.length) {
+        return false;
+    }
+    const expected = before.slice();
+    expected.splice(move.from, 1);
+    expected.splice(move.to, 0, move.id);
+    return expected.join(",") === after.join(",");
+}
+
+/**
+ * Send queued ballot changes, one request at a time: a full save when the server
+ * copy is unknown or out of date, otherwise the pending moves.
+ */
+function flushBallot(formEl, rankInputEl, ballot, csrfToken) {
+    if (ballot.inFlight || (!ballot.needsResync && !ballot.pending.length)) {
+        return;
+    }
+    ballot.inFlight = true;
+
+    let request;
+    if (ballot.needsResync) {
+        // The full order supersedes every queued move; it needs every page first
+        ballot.needsResync = false;
+        ballot.pending = [];
+        request = loadAllBallotPages(formEl, ballot)
+            .then(() => autoSaveRankings(formEl, rankInputEl, csrfToken))
+            .catch((error) => {
+                console.error("Could not load the full ballot for saving:", error);
+                return {};
+            });
+    } else {
+        const moves = ballot.pending;
+        ballot.pending = [];
+        request = sendBallotMoves(formEl, ballot.version, moves, csrfToken);
+    }
+
+    request.then((result) => {
+        ballot.inFlight = false;
+        if (result.version) {
+            ballot.version = result.version;
+        } else if (result.resync) {
+            console.info("Ballot out of date; resending full rankings.");
+            ballot.needsResync = true;
+        } else {
+            // Failed save: the server copy is unknown, so resync on the next change
+            ballot.needsResync = true;
+            ballot.pending = [];
+            return;
+        }
+        flushBallot(formEl, rankInputEl, ballot, csrfToken);
+    });
+}
+
+/**
+ * Post move operations to the incremental autosave endpoint.
+ * @returns {Promise<{version?: number, resync?: boolean}>}
+ */
+function sendBallotMoves(formEl, version, moves, csrfToken) {
+    const formName = formEl.querySelector("input[name='form_name']")?.value || "";
+    return fetch(formEl.dataset.movesUrl, {
+        method: "POST",
+        headers: {
+            "Content-Type": "application/json",
+            "X-CSRFToken": csrfToken,
+        },
+        body: JSON.stringify({ form_name: formName, version: version, moves: moves }),
+    })
+        .then((response) => {
+            if (response.status === 409) {
+                return { resync: true };
+            }
+            if (!response.ok) {
+                console.warn("Move auto-save failed with status:", response.status);
+                return {};
+            }
+            console.debug("Ranking moves auto-saved:", moves);
+            return response.json();
+        })
+        .catch((error) => {
+            console.error("Error during move auto-save:", error);
+            return {};
+        });
+}
+
 /**
  * Update the rank labels and hidden rank input field.
  * @param {HTMLElement} listEl - The container with .rank-item elements.
@@ -78,7 +356,7 @@ function initSortable(formEl, listEl, rankInputEl) {
 function updateRankings(listEl, rankInputEl) {
     const rankItems = Array.from(listEl.querySelectorAll(".rank-item"));
     if (!rankItems.length) {
-        console.warn("No .rank-item found in listEl.");
+        console.debug("No .rank-item found in listEl.");
         rankInputEl.value = "";
         return;
     }
@@ -113,15 +391,16 @@ function updateRankings(listEl, rankInputEl) {
 }
 
 /**
- * Auto-save rankings to the server (POST).
+ * Auto-save the full rankings to the server (POST).
  * @param {HTMLFormElement} formEl
  * @param {HTMLInputElement} rankInputEl
  * @param {string} csrfToken
+ * @returns {Promise<{version?: number}>}
  */
 function autoSaveRankings(formEl, rankInputEl, csrfToken) {
     if (!rankInputEl.value) {
         console.debug("No rank input to save.");
-        return;
+        return Promise.resolve({});
     }
     const formName = formEl.querySelector("input[name='form_name']")?.value || "";
 
@@ -132,7 +411,7 @@ function autoSaveRankings(formEl, rankInputEl, csrfToken) {
         csrf_token: csrfToken,
     });
 
-    fetch(formEl.action, {
+    return fetch(formEl.action, {
         method: "POST",
         headers: {
             "Content-Type": "application/x-www-form-urlencoded",
@@ -142,12 +421,14 @@ function autoSaveRankings(formEl, rankInputEl, csrfToken) {
         .then((response) => {
             if (!response.ok) {
                 console.warn("Auto-save failed with status:", response.status);
-            } else {
-                console.debug("Rankings auto-saved successfully.");
+                return {};
             }
+            console.debug("Rankings auto-saved successfully.");
+            return response.json();
         })
         .catch((error) => {
             console.error("Error during auto-save:", error);
+            return {};
         });
 }
 
@@ -0,0 +1,217 @@
+from flask import current_app
+from flask.cli import AppGroup
+from sqlalchemy import event, func, update, insert, case
+from sqlalchemy.dialects import postgresql, sqlite
+from datetime import datetime, timedelta
+from app.models import ArtworkBlob, BadgeArtwork, db
+from app.uploads import ALLOWED_ARTWORK_EXTENSIONS, EXTENSION_KINDS, blob_filename, hash_file, sniff_artwork_kind, SNIFF_SIZE
+from app.derivatives import RENDITIONS, rendition_filename
+
+import os
+import click
+import logging
+
+logger = logging.getLogger(__name__)
+
+blob_table = ArtworkBlob.__table__
+
+# Unreferenced files and blob rows younger than this may belong to a submission that is still being saved
+IN_FLIGHT_HOURS = 24
+
+
+def _sha256_of(filename):
+    return os.path.splitext(filename)[0]
+
+
+def _change_ref_count(connection, filename, delta):
+    """Adjust a blob's reference count inside the flush that changed BadgeArtwork."""
+    if not filename:
+        return
+    if delta > 0 and connection.dialect.name in ("postgresql", "sqlite"):
+        dialect_insert = postgresql.insert if connection.dialect.name == "postgresql" else sqlite.insert
+        path = os.path.join(current_app.config["UPLOAD_FOLDER"], filename)
+        statement = dialect_insert(blob_table).values(
+            sha256=_sha256_of(filename),
+            filename=filename,
+            size=os.path.getsize(path) if os.path.exists(path) else None,
+            ref_count=delta,
+            created_at=datetime.utcnow(),
+        )
+        connection.execute(statement.on_conflict_do_update(
+            index_elements=[blob_table.c.sha256],
+            set_={"ref_count": blob_table.c.ref_count + delta},
+        ))
+        return
+
+    new_count = blob_table.c.ref_count + delta
+    result = connection.execute(
+        update(blob_table)
+        .where(blob_table.c.filename == filename)
+        .values(ref_count=case((new_count < 0, 0), else_=new_count))
+    )
+    if result.rowcount == 0 and delta > 0:
+        connection.execute(insert(blob_table).values(
+            sha256=_sha256_of(filename), filename=filename, ref_count=delta, created_at=datetime.utcnow()
+        ))
+
+
+@event.listens_for(BadgeArtwork, "after_insert")
+def _badge_artwork_inserted(mapper, connection, target):
+    _change_ref_count(connection, target.artwork_file, 1)
+
+
+@event.listens_for(BadgeArtwork, "after_delete")
+def _badge_artwork_deleted(mapper, connection, target):
+    _change_ref_count(connection, target.artwork_file, -1)
+
+
+@event.listens_for(BadgeArtwork, "after_update")
+def _badge_artwork_updated(mapper, connection, target):
+    history = db.inspect(target).attrs.artwork_file.history
+    if history.has_changes():
+        for old_filename in history.deleted:
+            _change_ref_count(connection, old_filename, -1)
+        for new_filename in history.added:
+            _change_ref_count(connection, new_filename, 1)
+
+
+def is_blob_referenced(filename):
+    """True if any BadgeArtwork row uses the stored file, counted or not (files from before blob tracking)."""
+    blob = ArtworkBlob.query.filter_by(filename=filename).first()
+    if blob and blob.ref_count > 0:
+        return True
+    return db.session.query(BadgeArtwork.id).filter_by(artwork_file=filename).first() is not None
+
+
+def is_in_flight(path, hours=IN_FLIGHT_HOURS):
+    """
+    True if the file was written or reused by an upload within ``hours``: its
+    BadgeArtwork row may not be committed yet, so the file must not be deleted.
+    """
+    cutoff = datetime.utcnow() - timedelta(hours=hours)
+    if datetime.utcfromtimestamp(os.stat(path).st_mtime) > cutoff:
+        return True
+    blob = ArtworkBlob.query.filter_by(filename=os.path.basename(path)).first()
+    return bool(blob and blob.created_at and blob.created_at > cutoff)
+
+
+def recount_blobs():
+    """Rebuild ArtworkBlob rows and reference counts from the BadgeArtwork table."""
+    upload_folder = current_app.config["UPLOAD_FOLDER"]
+    counts = dict(
+        db.session.query(BadgeArtwork.artwork_file, func.count(BadgeArtwork.id))
+        .group_by(BadgeArtwork.artwork_file)
+        .all()
+    )
+    blobs = {blob.filename: blob for blob in ArtworkBlob.query.all()}
+    for filename, blob in blobs.items():
+        blob.ref_count = counts.pop(filename, 0)
+    for filename, ref_count in counts.items():
+        if not filename:
+            continue
+        path = os.path.join(upload_folder, filename)
+        db.session.add(ArtworkBlob(
+            sha256=_sha256_of(filename),
+            filename=filename,
+            size=os.path.getsize(path) if os.path.exists(path) else None,
+            ref_count=ref_count,
+        ))
+    db.session.commit()
+
+
+def _remove_artwork_files(upload_folder, filename):
+    for path in [os.path.join(upload_folder, filename)] + [
+        os.path.join(upload_folder, rendition_filename(filename, rendition)) for rendition in RENDITIONS
+    ]:
+        if os.path.exists(path):
+            os.remove(path)
+
+
+artwork_cli = AppGroup("artwork", help="Maintain content-addressed artwork storage.")
+
+
+@artwork_cli.command("recount")
+def recount_command():
+    """Recompute blob reference counts from BadgeArtwork rows."""
+    recount_blobs()
+    click.echo(f"{ArtworkBlob.query.count()} blobs recounted.")
+
+
+@artwork_cli.command("gc")
+@click.option("--min-age-hours", default=IN_FLIGHT_HOURS, show_default=True,
+              help="Only remove unreferenced files older than this, so uploads of in-progress submissions survive.")
+@click.option("--dry-run", is_flag=True, help="List what would be removed without deleting anything.")
+def gc_command(min_age_hours, dry_run):
+    """Delete stored artwork files that no BadgeArtwork references."""
+    upload_folder = current_app.config["UPLOAD_FOLDER"]
+    cutoff = datetime.utcnow() - timedelta(hours=min_age_hours)
+    # Files named by BadgeArtwork rows are kept even if they predate blob tracking
+    referenced = {blob.filename for blob in ArtworkBlob.query.filter(ArtworkBlob.ref_count > 0)}
+    referenced.update(filename for (filename,) in db.session.query(BadgeArtwork.artwork_file).distinct())
+    # Blob rows written by a recent save whose file still carries an old mtime
+    referenced.update(blob.filename for blob in ArtworkBlob.query.filter(ArtworkBlob.created_at > cutoff))
+    removed = 0
+    for entry in os.scandir(upload_folder):
+        if not entry.is_file() or entry.name in referenced:
+            continue
+        if datetime.utcfromtimestamp(entry.stat().st_mtime) > cutoff:
+            continue
+        if entry.name.endswith(".part") or os.path.splitext(entry.name)[1].lower() in ALLOWED_ARTWORK_EXTENSIONS:
+            click.echo(f"{'Would remove' if dry_run else 'Removing'} {entry.name}")
+            if not dry_run:
+                _remove_artwork_files(upload_folder, entry.name)
+                ArtworkBlob.query.filter_by(filename=entry.name).delete()
+            removed += 1
+    if not dry_run:
+        db.session.commit()
+    click.echo(f"{removed} unreferenced files {'found' if dry_run else 'removed'}.")
+
+
+@artwork_cli.command("dedupe")
+@click.option("--dry-run", is_flag=True, help="Report the renames and duplicates without changing anything.")
+def dedupe_command(dry_run):
+    """
+    Migrate UPLOAD_FOLDER to content-addressed names: hash every stored file,
+    rename it to <sha256><ext>, drop byte-identical duplicates, point
+    BadgeArtwork rows at the new names and rebuild reference counts.
+    """
+    upload_folder = current_app.config["UPLOAD_FOLDER"]
+    renames = {}
+    duplicates = 0
+    for entry in sorted(os.scandir(upload_folder), key=lambda e: e.name):
+        ext = os.path.splitext(entry.name)[1].lower()
+        if not entry.is_file() or ext not in ALLOWED_ARTWORK_EXTENSIONS:
+            continue
+        with open(entry.path, "rb") as f:
+            kind = sniff_artwork_kind(f.read(SNIFF_SIZE)) or EXTENSION_KINDS[ext]
+        target = blob_filename(hash_file(entry.path), kind)
+        if target == entry.name:
+            continue
+        target_path = os.path.join(upload_folder, target)
+        is_duplicate = os.path.exists(target_path) or target in renames.values()
+        renames[entry.name] = target
+        if is_duplicate:
+            duplicates += 1
+            if not dry_run:
+                _remove_artwork_files(upload_folder, entry.name)
+        elif not dry_run:
+            os.replace(entry.path, target_path)
+            # Renditions are keyed by the file stem, so move them along with the original
+            for rendition in RENDITIONS:
+                old_rendition = os.path.join(upload_folder, rendition_filename(entry.name, rendition))
+                if os.path.exists(old_rendition):
+                    os.replace(old_rendition, os.path.join(upload_folder, rendition_filename(target, rendition)))
+
+    click.echo(f"{len(renames)} files renamed, {duplicates} duplicates {'found' if dry_run else 'removed'}.")
+    if dry_run or not renames:
+        return
+
+    # Bulk statements bypass the ref-count listeners; counts are rebuilt below
+    for old_name, new_name in renames.items():
+        db.session.execute(
+            update(BadgeArtwork).where(BadgeArtwork.artwork_file == old_name).values(artwork_file=new_name)
+        )
+    ArtworkBlob.query.filter(ArtworkBlob.filename.in_(list(renames))).delete(synchronize_session=False)
+    db.session.commit()
+    recount_blobs()
+    click.echo(f"BadgeArtwork rows updated; {ArtworkBlob.query.count()} blobs tracked.")
@@ -0,0 +1,103 @@
+from flask.cli import AppGroup
+from sqlalchemy import update, insert, delete, select, func, literal
+from sqlalchemy.dialects import postgresql, sqlite
+from collections import defaultdict
+from datetime import datetime
+from app.models import ArtworkTally, JudgeVote, db
+
+import click
+import logging
+
+logger = logging.getLogger(__name__)
+
+tally_table = ArtworkTally.__table__
+
+TALLY_UPSERT_CHUNK_SIZE = 500
+
+
+def vote_deltas(removed=(), added=()):
+    """
+    Net (score, vote_count) change per BadgeArtwork when the ``removed`` votes
+    are replaced by the ``added`` ones; both are (badge_artwork_id, rank) pairs.
+    """
+    deltas = defaultdict(lambda: [0, 0])
+    for artwork_id, rank in removed:
+        deltas[artwork_id][0] -= rank
+        deltas[artwork_id][1] -= 1
+    for artwork_id, rank in added:
+        deltas[artwork_id][0] += rank
+        deltas[artwork_id][1] += 1
+    return {artwork_id: tuple(delta) for artwork_id, delta in deltas.items() if delta != [0, 0]}
+
+
+def apply_tally_deltas(deltas):
+    """
+    Add score/vote_count deltas to the tallies in the current transaction.
+    Increments are done in SQL, so concurrent saves by different judges on the
+    same artworks do not overwrite each other.
+    """
+    if not deltas:
+        return
+    now = datetime.utcnow()
+    rows = [
+        {"badge_artwork_id": artwork_id, "score": score, "vote_count": count, "updated_at": now}
+        for artwork_id, (score, count) in sorted(deltas.items())
+    ]
+    dialect = db.session.get_bind().dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        dialect_insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        for start in range(0, len(rows), TALLY_UPSERT_CHUNK_SIZE):
+            statement = dialect_insert(tally_table).values(rows[start:start + TALLY_UPSERT_CHUNK_SIZE])
+            db.session.execute(statement.on_conflict_do_update(
+                index_elements=[tally_table.c.badge_artwork_id],
+                set_={
+                    "score": tally_table.c.score + statement.excluded.score,
+                    "vote_count": tally_table.c.vote_count + statement.excluded.vote_count,
+                    "updated_at": statement.excluded.updated_at,
+                },
+            ))
+        return
+
+    for row in rows:
+        result = db.session.execute(
+            update(tally_table)
+            .where(tally_table.c.badge_artwork_id == row["badge_artwork_id"])
+            .values(
+                score=tally_table.c.score + row["score"],
+                vote_count=tally_table.c.vote_count + row["vote_count"],
+                updated_at=now,
+            )
+        )
+        if result.rowcount == 0:
+            db.session.execute(insert(tally_table).values(row))
+
+
+def remove_votes_from_tallies(*criteria):
+    """Subtract the votes matching ``criteria`` from the tallies; call before deleting them."""
+    removed = db.session.query(JudgeVote.badge_artwork_id, JudgeVote.rank).filter(*criteria).all()
+    apply_tally_deltas(vote_deltas(removed=removed))
+
+
+def rebuild_tallies():
+    """Recompute every tally from the JudgeVote table."""
+    db.session.execute(delete(tally_table))
+    db.session.execute(insert(tally_table).from_select(
+        ["badge_artwork_id", "score", "vote_count", "updated_at"],
+        select(
+            JudgeVote.badge_artwork_id,
+            func.sum(JudgeVote.rank),
+            func.count(JudgeVote.id),
+            literal(datetime.utcnow(), db.DateTime),
+        ).group_by(JudgeVote.badge_artwork_id),
+    ))
+    db.session.commit()
+
+
+tallies_cli = AppGroup("tallies", help="Maintain the score tallies behind the results page.")
+
+
+@tallies_cli.command("rebuild")
+def rebuild_command():
+    """Recompute all tallies from the recorded votes."""
+    rebuild_tallies()
+    click.echo(f"{ArtworkTally.query.count()} artwork tallies rebuilt.")
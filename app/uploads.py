@@ -0,0 +1,124 @@
+from flask import current_app
+from app.metrics import UPLOAD_BYTES
+
+import os
+import uuid
+import hashlib
+import logging
+
+logger = logging.getLogger(__name__)
+
+ALLOWED_ARTWORK_EXTENSIONS = {".jpg", ".jpeg", ".png", ".svg"}
+UPLOAD_CHUNK_SIZE = 64 * 1024  # Bytes copied from the request stream per read
+SNIFF_SIZE = 512  # Leading bytes inspected to detect the real file type
+
+# Extension -> content family it must contain
+EXTENSION_KINDS = {
+    ".jpg": "jpeg",
+    ".jpeg": "jpeg",
+    ".png": "png",
+    ".svg": "svg",
+}
+
+# Content family -> extension used for the stored blob, so equal content always maps to one name
+STORED_EXTENSIONS = {
+    "jpeg": ".jpg",
+    "png": ".png",
+    "svg": ".svg",
+}
+
+
+class UploadError(Exception):
+    """Raised when an upload is rejected while it is being streamed to disk."""
+
+
+def sniff_artwork_kind(head):
+    """Return 'png', 'jpeg' or 'svg' for the leading bytes of a file, or None."""
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "png"
+    if head.startswith(b"\xff\xd8\xff"):
+        return "jpeg"
+    text = head.lstrip(b"\xef\xbb\xbf").lstrip().lower()
+    if text.startswith((b"<?xml", b"<svg", b"<!--", b"<!doctype svg")) and b"<svg" in head.lower():
+        return "svg"
+    return None
+
+
+def upload_size(file_storage):
+    """Return the size of an uploaded file without reading it into memory."""
+    stream = file_storage.stream
+    position = stream.tell()
+    stream.seek(0, os.SEEK_END)
+    size = stream.tell()
+    stream.seek(position)
+    return size
+
+
+def blob_filename(sha256_hex, kind):
+    """Content-addressed filename of a stored artwork."""
+    return f"{sha256_hex}{STORED_EXTENSIONS[kind]}"
+
+
+def save_artwork_upload(file_storage, max_size_mb=8, upload_folder=None):
+    """
+    Stream an uploaded artwork to the upload folder in fixed-size chunks.
+
+    The file type is sniffed from the first chunk and checked against the
+    extension, the copy is aborted as soon as it exceeds ``max_size_mb``, and
+    the SHA-256 of the content is computed on the way. Data is written to a
+    temporary ``.part`` file that is renamed to ``<sha256><ext>`` once the
+    whole upload has been accepted; if that blob is already stored the copy is
+    dropped and the existing file is reused. Returns the stored filename.
+    """
+    upload_folder = upload_folder or current_app.config["UPLOAD_FOLDER"]
+    file_ext = os.path.splitext(file_storage.filename or "")[1].lower()
+    if file_ext not in ALLOWED_ARTWORK_EXTENSIONS:
+        raise UploadError("Invalid file format. Only JPG, JPEG, PNG, or SVG files are allowed.")
+
+    max_size_bytes = max_size_mb * 1024 * 1024
+    kind = EXTENSION_KINDS[file_ext]
+    temp_path = os.path.join(upload_folder, f".{uuid.uuid4()}.part")
+
+    stream = file_storage.stream
+    stream.seek(0)
+    digest = hashlib.sha256()
+    written = 0
+    try:
+        with open(temp_path, "wb") as out:
+            head = stream.read(SNIFF_SIZE)
+            if sniff_artwork_kind(head) != kind:
+                raise UploadError("The uploaded file does not match its extension. Only JPG, PNG, or SVG images are allowed.")
+            chunk = head
+            while chunk:
+                written += len(chunk)
+                if written > max_size_bytes:
+                    raise UploadError(f"File size must not exceed {max_size_mb} MB.")
+                digest.update(chunk)
+                out.write(chunk)
+                chunk = stream.read(UPLOAD_CHUNK_SIZE)
+
+        stored_filename = blob_filename(digest.hexdigest(), kind)
+        final_path = os.path.join(upload_folder, stored_filename)
+        if os.path.exists(final_path):
+            os.remove(temp_path)
+            os.utime(final_path)  # Reused by an uncommitted submission; keeps gc and delete_cached_image off it
+            logger.debug(f"Upload matches existing blob {stored_filename}; duplicate discarded.")
+        else:
+            os.replace(temp_path, final_path)
+            logger.debug(f"Streamed {written} bytes to {final_path}")
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+    UPLOAD_BYTES.inc(written)
+    return stored_filename
+
+
+def hash_file(path):
+    """SHA-256 hex digest of a file on disk, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(UPLOAD_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
@@ -1,8 +1,16 @@
 from flask import url_for as flask_url_for, current_app
+from sqlalchemy import event
+from contextvars import ContextVar
+
+import threading
 
 def custom_url_for(endpoint, **values):
-    """Custom url_for that prepends APPLICATION_ROOT."""
+    """Custom url_for that prepends APPLICATION_ROOT and fingerprints static files."""
     application_root = current_app.config.get("APPLICATION_ROOT", "")
+    if endpoint == "static" and "filename" in values:
+        manifest = current_app.extensions.get("asset_manifest")
+        if manifest is not None:
+            values["filename"] = manifest.fingerprinted.get(values["filename"], values["filename"])
     original_url = flask_url_for(endpoint, **values)
 
     # Only prepend APPLICATION_ROOT if it's not already in the URL
@@ -10,3 +18,38 @@ def custom_url_for(endpoint, **values):
         return f"{application_root}{original_url}"
 
     return original_url
+
+
+# QueryCounters open in the current thread (or task), innermost last
+_active_query_counters = ContextVar("active_query_counters", default=())
+_listener_lock = threading.Lock()
+
+
+def _count_statement(conn, cursor, statement, parameters, context, executemany):
+    for counter in _active_query_counters.get():
+        if conn.engine is counter.engine:
+            counter.count += 1
+
+
+class QueryCounter:
+    """
+    Counts the SQL statements the current thread executes on an engine inside a
+    ``with`` block. One listener per engine is registered on first use and
+    never removed, so concurrent requests neither see each other's statements
+    nor change the engine's listeners while it is in use.
+    """
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.count = 0
+        with _listener_lock:
+            if not event.contains(engine, "before_cursor_execute", _count_statement):
+                event.listen(engine, "before_cursor_execute", _count_statement)
+
+    def __enter__(self):
+        self._token = _active_query_counters.set(_active_query_counters.get() + (self,))
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        _active_query_counters.reset(self._token)
+        return False
@@ -0,0 +1,287 @@
+"""
+Scale benchmarks for the ballot, ranking save, results, export and submission paths.
+
+Seeds a throwaway database, drives each path through the Flask test client and
+records wall time, query count and peak Python memory per scenario:
+
+    python -m benchmarks.run --preset small --compare benchmarks/baseline.json
+    python -m benchmarks.run --preset small --compare local-baseline.json --check-timings
+    python -m benchmarks.run --preset deadline --database-url postgresql://.../bench --output deadline.json
+
+Run it from the repository root (config.toml is read from the working directory).
+The database given with --database-url is dropped and recreated.
+"""
+from collections import namedtuple
+from datetime import datetime, timezone
+from sqlalchemy import create_engine
+from app import create_app
+from app.models import db
+from app.utils import QueryCounter
+from app.seed import ADMIN_NAME, placeholder_png, seed_contest
+
+import io
+import os
+import re
+import sys
+import json
+import time
+import random
+import logging
+import argparse
+import platform
+import tempfile
+import statistics
+import tracemalloc
+
+PRESETS = {
+    "small": dict(judges=5, submissions=200, artworks_per_submission=3, youth_submissions=50, badges=20),
+    "medium": dict(judges=20, submissions=1000, artworks_per_submission=3, youth_submissions=200, badges=30),
+    "deadline": dict(judges=50, submissions=5000, artworks_per_submission=3, youth_submissions=1000, badges=40),
+}
+
+JUDGE_PASSWORD = "benchmark-password"
+
+# Allowed slowdown (wall time, peak memory) before a scenario counts as a regression with --check-timings;
+# query counts must never grow
+DEFAULT_TOLERANCE = 0.5
+
+CSRF_INPUT = re.compile(r'name="csrf_token" type="hidden" value="([^"]+)"')
+
+# client: which logged-in client runs it; request(state, iteration) -> (method, url, kwargs); expect: status code
+Scenario = namedtuple("Scenario", ["name", "client", "request", "expect"])
+
+
+def _save_rankings(state, iteration):
+    order = list(state["submission_ids"])
+    random.Random(iteration).shuffle(order)
+    data = {"form_name": "ranking_form", "rank": ",".join(map(str, order)), "csrf_token": state["csrf"]["judge"]}
+    return "POST", "/judges/ballot", {"data": data}
+
+
+def _artwork_detail(state, iteration):
+    sub_id = state["submission_ids"][iteration * 7919 % len(state["submission_ids"])]
+    return "GET", f"/api/artwork-detail/artist/{sub_id}", {}
+
+
+def _artist_submission(state, iteration):
+    state["email_counter"] += 1
+    data = {
+        "name": "Benchmark Artist", "email": f"bench{state['email_counter']}@example.com",
+        "artist_bio": "b" * 300, "statement": "s" * 300, "consent_to_data": "y",
+        "badge_uploads-0-badge_id": "1",
+        "badge_uploads-0-artwork_file": (io.BytesIO(state["png"]), "artwork.png"),
+        "csrf_token": state["csrf"]["anonymous"],
+    }
+    return "POST", "/call_for_artists", {"data": data, "content_type": "multipart/form-data"}
+
+
+def _youth_submission(state, iteration):
+    state["email_counter"] += 1
+    data = {
+        "name": "Benchmark Youth", "age": "15", "parent_contact_info": "parent@example.com",
+        "email": f"benchyouth{state['email_counter']}@example.com",
+        "about_why_design": "w" * 50, "about_yourself": "y" * 50, "badge_id": "1", "parent_consent": "y",
+        "artwork_file": (io.BytesIO(state["png"]), "artwork.png"),
+        "csrf_token": state["csrf"]["anonymous"],
+    }
+    return "POST", "/call_for_youth_artists", {"data": data, "content_type": "multipart/form-data"}
+
+
+SCENARIOS = [
+    Scenario("judges_ballot", "judge", lambda state, i: ("GET", "/judges/ballot", {}), 200),
+    Scenario("ballot_entries", "judge", lambda state, i: ("GET", "/judges/ballot/entries?type=artist", {}), 200),
+    Scenario("save_rankings", "judge", _save_rankings, 200),
+    Scenario("judges_results", "admin", lambda state, i: ("GET", "/judges/results", {}), 200),
+    Scenario("api_artwork_detail", "admin", _artwork_detail, 200),
+    Scenario("download_html", "admin", lambda state, i: ("GET", "/admin/download-html", {}), 200),
+    Scenario("call_for_artists", "anonymous", _artist_submission, 302),
+    Scenario("call_for_youth_artists", "anonymous", _youth_submission, 302),
+]
+
+
+def build_app(database_url, upload_folder):
+    app = create_app({
+        "SQLALCHEMY_DATABASE_URI": database_url,
+        "UPLOAD_FOLDER": upload_folder,
+        "JOBS_EAGER": False,
+    })
+    return app
+
+
+def csrf_token(client, url):
+    """Read the CSRF token from a rendered form, as a browser would."""
+    match = CSRF_INPUT.search(client.get(url).get_data(as_text=True))
+    if not match:
+        raise RuntimeError(f"No CSRF token found on {url}.")
+    return match.group(1)
+
+
+def login(app, name, password):
+    client = app.test_client()
+    token = csrf_token(client, "/login")
+    response = client.post("/login", data={"name": name, "password": password, "csrf_token": token})
+    if response.status_code != 302:
+        raise RuntimeError(f"Could not log in as {name}.")
+    return client, token
+
+
+def run_once(client, scenario, state, iteration):
+    """Issue one request and read the whole (possibly streamed) body."""
+    method, url, kwargs = scenario.request(state, iteration)
+    response = client.open(url, method=method, buffered=False, **kwargs)
+    for _ in response.response:
+        pass
+    response.close()
+    if response.status_code != scenario.expect:
+        raise RuntimeError(f"{scenario.name}: {method} {url} returned {response.status_code}, expected {scenario.expect}.")
+
+
+def measure(app, clients, scenario, state, repeat):
+    client = clients[scenario.client]
+    # Warm-up run under tracemalloc (which slows it down) for the memory peak
+    tracemalloc.start()
+    run_once(client, scenario, state, 0)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    timings, queries = [], 0
+    for iteration in range(1, repeat + 1):
+        with app.app_context():
+            engine = db.engine
+        with QueryCounter(engine) as counter:
+            started = time.perf_counter()
+            run_once(client, scenario, state, iteration)
+            timings.append((time.perf_counter() - started) * 1000)
+        queries = max(queries, counter.count)
+    return {
+        "wall_ms_median": round(statistics.median(timings), 2),
+        "wall_ms_min": round(min(timings), 2),
+        "queries": queries,
+        "peak_kib": round(peak / 1024, 1),
+        "repeat": repeat,
+    }
+
+
+def reset_schema(database_url):
+    """Drop and recreate every table before create_app connects to the database."""
+    engine = create_engine(database_url)
+    db.metadata.drop_all(engine)
+    db.metadata.create_all(engine)
+    engine.dispose()
+
+
+def run(preset, sizes, database_url, repeat, scenarios):
+    upload_folder = tempfile.mkdtemp(prefix="bench-uploads-")
+    reset_schema(database_url)
+    app = build_app(database_url, upload_folder)
+    with app.app_context():
+        started = time.perf_counter()
+        ids = seed_contest(**sizes, judge_password=JUDGE_PASSWORD, admin_password=JUDGE_PASSWORD)
+        seed_seconds = time.perf_counter() - started
+        dialect = db.engine.dialect.name
+
+    clients, tokens = {}, {}
+    clients["admin"], tokens["admin"] = login(app, ADMIN_NAME, JUDGE_PASSWORD)
+    clients["judge"], tokens["judge"] = login(app, ids["judge_names"][0], JUDGE_PASSWORD)
+    clients["anonymous"] = app.test_client()
+    tokens["anonymous"] = csrf_token(clients["anonymous"], "/call_for_artists")
+    state = {**ids, "csrf": tokens, "email_counter": 0, "png": placeholder_png()}
+    results = {}
+    for scenario in SCENARIOS:
+        if scenarios and scenario.name not in scenarios:
+            continue
+        results[scenario.name] = measure(app, clients, scenario, state, repeat)
+        print(f"{scenario.name:<24} {results[scenario.name]['wall_ms_median']:>10.1f} ms "
+              f"{results[scenario.name]['queries']:>6} queries {results[scenario.name]['peak_kib']:>10.1f} KiB")
+
+    return {
+        "meta": {
+            "preset": preset,
+            "sizes": sizes,
+            "database": dialect,
+            "seed_seconds": round(seed_seconds, 2),
+            "machine": machine(),
+            "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        },
+        "results": results,
+    }
+
+
+def machine():
+    """What wall times and memory peaks depend on; timings only compare between equal values."""
+    return {
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "cpus": os.cpu_count(),
+        "python": platform.python_version(),
+    }
+
+
+def compare(report, baseline, tolerance, check_timings=False):
+    """
+    Return the regressions of ``report`` against ``baseline`` as readable lines.
+    Query counts are always compared; wall time and memory only with
+    ``check_timings``, and only against a baseline recorded on the same machine.
+    """
+    for key in ("sizes", "database"):
+        if baseline["meta"][key] != report["meta"][key]:
+            return [f"Baseline {key} {baseline['meta'][key]} does not match this run's {report['meta'][key]}."]
+    if check_timings and baseline["meta"].get("machine") != report["meta"]["machine"]:
+        return [f"Baseline timings were recorded on {baseline['meta'].get('machine')}, not this machine "
+                f"({report['meta']['machine']}); record a local baseline to compare timings."]
+    regressions = []
+    for name, result in report["results"].items():
+        expected = baseline["results"].get(name)
+        if expected is None:
+            continue
+        if result["queries"] > expected["queries"]:
+            regressions.append(f"{name}: {result['queries']} queries, baseline {expected['queries']}")
+        if not check_timings:
+            continue
+        for key, unit in (("wall_ms_median", "ms"), ("peak_kib", "KiB")):
+            if result[key] > expected[key] * (1 + tolerance):
+                regressions.append(f"{name}: {result[key]} {unit}, baseline {expected[key]} {unit} (+{tolerance:.0%} allowed)")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="small")
+    for size in PRESETS["small"]:
+        parser.add_argument(f"--{size.replace('_', '-')}", type=int, help=f"Override the preset's {size}.")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for the generated ballots.")
+    parser.add_argument("--database-url", help="Database to drop, seed and benchmark (default: a temporary SQLite file).")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per scenario.")
+    parser.add_argument("--scenario", action="append", help="Only run this scenario (repeatable).")
+    parser.add_argument("--output", default="benchmark-results.json", help="Where to write the results.")
+    parser.add_argument("--compare", metavar="BASELINE", help="Fail if a scenario regressed against this results file.")
+    parser.add_argument("--check-timings", action="store_true",
+                        help="Also fail on slower wall times or higher memory peaks (baseline must come from this machine).")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="Allowed slowdown with --check-timings.")
+    args = parser.parse_args(argv)
+
+    logging.disable(logging.INFO)  # Request logging would dominate the timings
+    sizes = dict(PRESETS[args.preset], seed=args.seed)
+    for size in PRESETS["small"]:
+        if getattr(args, size) is not None:
+            sizes[size] = getattr(args, size)
+    database_url = args.database_url or f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='bench-db-'), 'bench.db')}"
+
+    report = run(args.preset, sizes, database_url, args.repeat, args.scenario)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.output}.")
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(report, json.load(f), args.tolerance, args.check_timings)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            return 1
+        print(f"No regressions against {args.compare}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,21 @@
+# Gunicorn settings; picked up automatically when gunicorn is started from this directory.
+import os
+import shutil
+import tempfile
+
+# Workers write their Prometheus samples here so /metrics can aggregate every process.
+# Must be set before the app (and prometheus_client) is imported.
+os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", os.path.join(tempfile.gettempdir(), "badge_contest_metrics"))
+
+
+def on_starting(server):
+    # Samples left by a previous run would be counted again
+    metrics_dir = os.environ["PROMETHEUS_MULTIPROC_DIR"]
+    shutil.rmtree(metrics_dir, ignore_errors=True)
+    os.makedirs(metrics_dir, exist_ok=True)
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid)
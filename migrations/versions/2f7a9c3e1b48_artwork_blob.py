@@ -0,0 +1,38 @@
+"""Content-addressed artwork blobs
+
+Revision ID: 2f7a9c3e1b48
+Revises: 5c8e1d3b7a24
+Create Date: 2026-10-18 10:09:31.502846
+
+One row per stored artwork file with the number of BadgeArtwork rows using
+it. Existing uploads get their rows from `flask artwork dedupe`.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '2f7a9c3e1b48'
+down_revision = '5c8e1d3b7a24'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if sa.inspect(op.get_bind()).has_table('artwork_blob'):
+        return  # Created outside this migration history
+    op.create_table(
+        'artwork_blob',
+        sa.Column('sha256', sa.String(length=64), nullable=False),
+        sa.Column('filename', sa.String(length=255), nullable=False),
+        sa.Column('size', sa.Integer(), nullable=True),
+        sa.Column('ref_count', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('sha256'),
+        sa.UniqueConstraint('filename'),
+    )
+
+
+def downgrade():
+    op.drop_table('artwork_blob')
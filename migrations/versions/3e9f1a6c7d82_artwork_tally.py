@@ -0,0 +1,37 @@
+"""Per-artwork score tallies
+
+Revision ID: 3e9f1a6c7d82
+Revises: 8b4c2d7e5f16
+Create Date: 2026-10-18 10:14:18.950127
+
+The table starts empty; fill it from the existing votes with
+`flask tallies rebuild`.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3e9f1a6c7d82'
+down_revision = '8b4c2d7e5f16'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if sa.inspect(op.get_bind()).has_table('artwork_tally'):
+        return  # Created outside this migration history
+    op.create_table(
+        'artwork_tally',
+        sa.Column('badge_artwork_id', sa.Integer(), nullable=False),
+        sa.Column('score', sa.Integer(), nullable=False),
+        sa.Column('vote_count', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['badge_artwork_id'], ['badge_artwork.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('badge_artwork_id'),
+    )
+
+
+def downgrade():
+    op.drop_table('artwork_tally')
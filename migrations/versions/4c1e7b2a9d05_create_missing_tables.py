@@ -0,0 +1,128 @@
+"""Original contest schema
+
+Revision ID: 4c1e7b2a9d05
+Revises:
+Create Date: 2026-10-18 10:05:12.418203
+
+Earlier schemas were created without a migration history in this repository,
+so each table of the original schema is only created when it does not exist
+yet; existing tables are left for the following revisions to alter.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4c1e7b2a9d05'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+TABLES = ['badge', 'artist_submission', 'youth_artist_submission', 'badge_artwork', 'user', 'judge_vote',
+          'submission_period']
+
+
+def _missing(table):
+    return not sa.inspect(op.get_bind()).has_table(table)
+
+
+def upgrade():
+    if _missing('badge'):
+        op.create_table(
+            'badge',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('name', sa.String(length=100), nullable=False),
+            sa.Column('description', sa.Text(), nullable=False),
+            sa.PrimaryKeyConstraint('id'),
+            sa.UniqueConstraint('name'),
+        )
+    if _missing('artist_submission'):
+        op.create_table(
+            'artist_submission',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+            sa.Column('name', sa.String(length=100), nullable=False),
+            sa.Column('email', sa.String(length=120), nullable=False),
+            sa.Column('phone_number', sa.String(length=15), nullable=True),
+            sa.Column('artist_bio', sa.Text(), nullable=False),
+            sa.Column('portfolio_link', sa.String(length=255), nullable=True),
+            sa.Column('statement', sa.Text(), nullable=False),
+            sa.Column('demographic_identity', sa.Text(), nullable=True),
+            sa.Column('lane_county_connection', sa.Text(), nullable=True),
+            sa.Column('hear_about_contest', sa.Text(), nullable=True),
+            sa.Column('future_engagement', sa.Text(), nullable=True),
+            sa.Column('consent_to_data', sa.Boolean(), nullable=False),
+            sa.Column('opt_in_featured_artwork', sa.Boolean(), nullable=False),
+            sa.PrimaryKeyConstraint('id'),
+            sa.UniqueConstraint('email'),
+        )
+    if _missing('youth_artist_submission'):
+        op.create_table(
+            'youth_artist_submission',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+            sa.Column('name', sa.String(length=100), nullable=False),
+            sa.Column('age', sa.Integer(), nullable=False),
+            sa.Column('parent_contact_info', sa.Text(), nullable=False),
+            sa.Column('email', sa.String(length=120), nullable=False),
+            sa.Column('about_why_design', sa.Text(), nullable=False),
+            sa.Column('about_yourself', sa.Text(), nullable=False),
+            sa.Column('opt_in_featured_artwork', sa.Boolean(), nullable=False),
+            sa.Column('parent_consent', sa.Boolean(), nullable=False),
+            sa.PrimaryKeyConstraint('id'),
+            sa.UniqueConstraint('email'),
+        )
+    if _missing('badge_artwork'):
+        op.create_table(
+            'badge_artwork',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('submission_id', sa.Integer(), nullable=True),
+            sa.Column('youth_submission_id', sa.Integer(), nullable=True),
+            sa.Column('badge_id', sa.Integer(), nullable=False),
+            sa.Column('instance', sa.Integer(), nullable=False),
+            sa.Column('artwork_file', sa.String(length=255), nullable=False),
+            sa.ForeignKeyConstraint(['submission_id'], ['artist_submission.id'], ondelete='CASCADE'),
+            sa.ForeignKeyConstraint(['youth_submission_id'], ['youth_artist_submission.id'], ondelete='CASCADE'),
+            sa.ForeignKeyConstraint(['badge_id'], ['badge.id'], ondelete='CASCADE'),
+            sa.PrimaryKeyConstraint('id'),
+            sa.UniqueConstraint('submission_id', 'badge_id', name='unique_submission_badge'),
+        )
+    if _missing('user'):
+        op.create_table(
+            'user',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('name', sa.String(length=50), nullable=False),
+            sa.Column('password_hash', sa.String(length=255), nullable=False),
+            sa.Column('is_admin', sa.Boolean(), nullable=True),
+            sa.PrimaryKeyConstraint('id'),
+            sa.UniqueConstraint('name'),
+        )
+    if _missing('judge_vote'):
+        op.create_table(
+            'judge_vote',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('user_id', sa.Integer(), nullable=False),
+            sa.Column('submission_id', sa.Integer(), nullable=True),
+            sa.Column('youth_submission_id', sa.Integer(), nullable=True),
+            sa.Column('badge_artwork_id', sa.Integer(), nullable=False),
+            sa.Column('rank', sa.Integer(), nullable=False),
+            sa.ForeignKeyConstraint(['user_id'], ['user.id']),
+            sa.ForeignKeyConstraint(['submission_id'], ['artist_submission.id']),
+            sa.ForeignKeyConstraint(['youth_submission_id'], ['youth_artist_submission.id']),
+            sa.ForeignKeyConstraint(['badge_artwork_id'], ['badge_artwork.id']),
+            sa.PrimaryKeyConstraint('id'),
+        )
+    if _missing('submission_period'):
+        op.create_table(
+            'submission_period',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('submission_start', sa.DateTime(timezone=True), nullable=False),
+            sa.Column('submission_end', sa.DateTime(timezone=True), nullable=False),
+            sa.PrimaryKeyConstraint('id'),
+        )
+
+
+def downgrade():
+    for table in reversed(TABLES):
+        op.drop_table(table)
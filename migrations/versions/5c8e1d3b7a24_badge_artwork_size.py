@@ -0,0 +1,41 @@
+"""Pixel size of badge artworks
+
+Revision ID: 5c8e1d3b7a24
+Revises: 4c1e7b2a9d05
+Create Date: 2026-10-18 10:07:55.136402
+
+Existing artworks get NULL sizes; `flask derivatives backfill` reads them
+from the stored files and generates the missing renditions.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5c8e1d3b7a24'
+down_revision = '4c1e7b2a9d05'
+branch_labels = None
+depends_on = None
+
+COLUMNS = ['width', 'height']
+
+
+def _existing_columns():
+    return {column['name'] for column in sa.inspect(op.get_bind()).get_columns('badge_artwork')}
+
+
+def upgrade():
+    existing = _existing_columns()
+    with op.batch_alter_table('badge_artwork') as batch_op:
+        for name in COLUMNS:
+            if name not in existing:
+                batch_op.add_column(sa.Column(name, sa.Integer(), nullable=True))
+
+
+def downgrade():
+    existing = _existing_columns()
+    with op.batch_alter_table('badge_artwork') as batch_op:
+        for name in reversed(COLUMNS):
+            if name in existing:
+                batch_op.drop_column(name)
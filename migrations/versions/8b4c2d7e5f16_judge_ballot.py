@@ -0,0 +1,36 @@
+"""Judge ballot versions
+
+Revision ID: 8b4c2d7e5f16
+Revises: 6d1b8e4f2a93
+Create Date: 2026-10-18 10:12:40.318655
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8b4c2d7e5f16'
+down_revision = '6d1b8e4f2a93'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if sa.inspect(op.get_bind()).has_table('judge_ballot'):
+        return  # Created outside this migration history
+    op.create_table(
+        'judge_ballot',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('kind', sa.String(length=10), nullable=False),
+        sa.Column('version', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['user.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('user_id', 'kind', name='unique_user_ballot'),
+    )
+
+
+def downgrade():
+    op.drop_table('judge_ballot')
@@ -0,0 +1,62 @@
+"""Judging and submission indexes
+
+Revision ID: 9a3d5f8e2b17
+Revises: 3e9f1a6c7d82
+Create Date: 2026-10-18 10:21:47.093518
+
+Indexes for the ballot, results, artwork detail and export queries, and one
+vote per (judge, artwork). Each index is only created when missing, so the
+revision also applies cleanly to databases whose tables were created from
+the models.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import logging
+
+
+# revision identifiers, used by Alembic.
+revision = '9a3d5f8e2b17'
+down_revision = '3e9f1a6c7d82'
+branch_labels = None
+depends_on = None
+
+logger = logging.getLogger('alembic.runtime.migration')
+
+# (index name, table, columns, unique)
+INDEXES = [
+    ('ix_judge_vote_user_artwork', 'judge_vote', ['user_id', 'badge_artwork_id'], True),
+    ('ix_judge_vote_user_submission_rank', 'judge_vote', ['user_id', 'submission_id', 'rank'], False),
+    ('ix_judge_vote_user_youth_submission_rank', 'judge_vote', ['user_id', 'youth_submission_id', 'rank'], False),
+    ('ix_judge_vote_artwork_rank', 'judge_vote', ['badge_artwork_id', 'rank'], False),
+    ('ix_badge_artwork_youth_submission_id', 'badge_artwork', ['youth_submission_id'], False),
+    ('ix_badge_artwork_badge_id', 'badge_artwork', ['badge_id'], False),
+    ('ix_artist_submission_created_at', 'artist_submission', ['created_at', 'id'], False),
+    ('ix_youth_artist_submission_created_at', 'youth_artist_submission', ['created_at', 'id'], False),
+]
+
+
+def _existing_indexes(table):
+    inspector = sa.inspect(op.get_bind())
+    return {index['name'] for index in inspector.get_indexes(table)}
+
+
+def upgrade():
+    if 'ix_judge_vote_user_artwork' not in _existing_indexes('judge_vote'):
+        # Duplicate votes would block the unique index; keep each judge's first vote per artwork
+        result = op.get_bind().execute(sa.text(
+            'DELETE FROM judge_vote WHERE id NOT IN '
+            '(SELECT MIN(id) FROM judge_vote GROUP BY user_id, badge_artwork_id)'
+        ))
+        if result.rowcount:
+            logger.warning(f"Removed {result.rowcount} duplicate judge votes; run 'flask tallies rebuild'.")
+
+    for name, table, columns, unique in INDEXES:
+        if name not in _existing_indexes(table):
+            op.create_index(name, table, columns, unique=unique)
+
+
+def downgrade():
+    for name, table, columns, unique in reversed(INDEXES):
+        if name in _existing_indexes(table):
+            op.drop_index(name, table_name=table)